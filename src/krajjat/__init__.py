@@ -13,9 +13,11 @@ from .classes.joint import Joint
 from .classes.sequence import Sequence
 from .classes.trial import Trial
 from .classes.subject import Subject
+from .classes.segmented_dataframe import SegmentedDataframe
 from .classes.experiment import Experiment
 from .classes.graph_element import Graph, GraphPlot
 from .classes.graphic_classes import GraphicJoint, GraphicPose, GraphicSequence
+from .classes.labelled_array import LabelledArray
 from .classes.analysis_parameters import AnalysisParameters
 from .classes.results import Results
 from . import tool_functions
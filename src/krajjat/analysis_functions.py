@@ -3,27 +3,35 @@
 
 import pandas as pd
 import numpy as np
-from scipy import signal, stats
+from scipy import signal, spatial, special, stats
+from scipy import fft as sp_fft
 from tqdm import tqdm
 from datetime import datetime as dt
-from numbers import Number
 import itertools
 from joblib import Parallel, delayed, effective_n_jobs
 import dataclasses
+import tempfile
+import zipfile
 
-from krajjat import Sequence, Trial, Subject
+from krajjat import Sequence, Trial, Subject, Audio
 from krajjat.classes.exceptions import ModuleNotFoundException
 from krajjat.classes.experiment import Experiment
 from krajjat.classes.graph_element import Graph, GraphPlot
+from krajjat.classes.labelled_array import LabelledArray
 from krajjat.classes.results import Results
+from krajjat.classes.segmented_dataframe import SegmentedDataframe
 from krajjat.classes.analysis_parameters import AnalysisParameters
 from krajjat.plot_functions import plot_silhouette, plot_body_graphs, _plot_components
 from krajjat.tool_functions import read_pandas_dataframe, find_closest_value_index, set_nested_dict, \
-    has_nested_key
+    get_cache_key
 
 import os
 os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "hide"
 
+# Maximum number of values in a block of surrogates evaluated at once by the batched permutation engine
+_BATCH_PERMS_MAX_ELEMENTS = 2 ** 23
+
+
 def _common_analysis(**kwargs):
     """Common function to perform a multimodal analysis of the motion capture and audio signals. This function can
     perform power spectrum, correlation and coherence analyses, at the subject level or the trial level, before
@@ -49,49 +57,65 @@ def _common_analysis(**kwargs):
             • ``p_values`` contains the p-values of the analysis, if ``return_type`` was set on ``z-scores``.
             • ``plot_dictionary`` contains the plot dictionary that can be directly passed to ``plot_silhouette`` or
               ``plot_body_graphs``.
+
+        The results are :class:`LabelledArray` instances, that can be indexed as nested dictionaries
+        (``averages[target_measure][measure][series_value][label][lag]``), and contain all the values in a single
+        array (``averages.values``), with one axis per dimension.
     """
     time_start = dt.now()
 
     params = AnalysisParameters(**kwargs)
 
-    # Load pingouin for correlation
-    pg = None
+    # Check the optional modules before starting: they are imported by the tasks (see _compute_label_analysis)
     if params.analysis == "correlation" and params.method == "pingouin":
         try:
-            import pingouin as pg
+            import pingouin
         except ImportError:
             raise ModuleNotFoundException("pingouin", "calculate the correlation")
 
-    if params.analysis == "mutual information":
+    if params.analysis == "mutual information" and params.method == "sklearn":
         try:
-            from sklearn.feature_selection import mutual_info_regression as mi
-            sc = None
-            if params.mi_scale == "standard":
-                from sklearn.preprocessing import StandardScaler
-                sc = StandardScaler()
-            elif params.mi_scale == "minmax":
-                from sklearn.preprocessing import MinMaxScaler
-                sc = MinMaxScaler()
+            import sklearn
         except ImportError:
             raise ModuleNotFoundException("sklearn", "perform a mutual information regression")
 
-    # Get the full dataframe
-    dataframe = _prepare_dataframe(params)
+    # Get the full dataframe. A SegmentedDataframe is kept as-is: the values of each individual are read from its
+    # segments (see _get_segment_arrays), without creating the long dataframe
+    dataframe = _prepare_dataframe(params, keep_segments=True)
     params._prepare_values(dataframe)
     params._validate_lags(dataframe)
-
-    # Create the dictionaries that will contain the values
-    plot_dictionary = {}
-    analysis_values = {}
-    randperm_values = {}
+    if isinstance(dataframe, SegmentedDataframe):
+        segmented_dataframe = dataframe
+        dataframe = dataframe.segments
+    else:
+        segmented_dataframe = None
+
+    # The power spectra, the coherences and the native mutual information are calculated for all the labels of an
+    # individual in a single task
+    individual_tasks = (params.analysis in ("power spectrum", "coherence") or
+                        (params.analysis == "mutual information" and params.method == "ksg"))
+
+    # Create the arrays that will contain the values of each individual, and their permutations
+    dimensions = ["target", "measure", "series", "individual", "label", "lag"]
+    coordinates = [params.target_measures, params.measures, params.series_values, params.individuals,
+                   list(params.labels_mocap) + params.labels_audio, params.lags]
+    analysis_values = LabelledArray(dimensions, coordinates)
+    randperm_values = LabelledArray(dimensions, coordinates)
     frequencies = None
 
     if params.verbosity > 0:
         print(f"\nComputing the {params.analysis}...")
 
-    if params.compute_permutations and params.n_jobs != 1 and params.verbosity > 0:
+    if params.n_jobs != 1 and params.verbosity > 0:
         actual_jobs = effective_n_jobs(params.n_jobs)
-        print(f"Running permutations on {actual_jobs} parallel jobs.")
+        print(f"Running the analysis on {actual_jobs} parallel jobs.")
+
+    # When the tasks run in worker processes, the signals of each individual are written once to a memory-mapped
+    # file: the workers then receive references to the file instead of copies of the arrays
+    if effective_n_jobs(params.n_jobs) > 1 and params.parallel_prefer != "threads":
+        shared_folder = tempfile.TemporaryDirectory(prefix="krajjat_", ignore_cleanup_errors=True)
+    else:
+        shared_folder = None
 
     # Precompute tqdm iterations
     progress_bar = tqdm(total=_count_tqdm_iterations(params, 1), desc=params.analysis.capitalize(), ncols=80,
@@ -121,7 +145,6 @@ def _common_analysis(**kwargs):
 
             # Filter the rows having the proper measures
             df_measure = dataframe[(dataframe["measure"] == measure)]
-            keys_measure = df_measure[["subject", "trial", "timestamp"]].drop_duplicates()
 
             # Get the labels depending on the current modality of the measure
             if params.measure_to_modality[measure] == "audio":
@@ -132,6 +155,10 @@ def _common_analysis(**kwargs):
             # If the analysis is not power spectrum, we need a target
             if params.analysis != "power spectrum":
                 df_target = dataframe[(dataframe["measure"] == target_measure[1]) & (dataframe["label"] == target_measure[0])]
+
+            # The timestamps of the segments are matched for each individual (see _get_segment_arrays)
+            if params.analysis != "power spectrum" and segmented_dataframe is None:
+                keys_measure = df_measure[["subject", "trial", "timestamp"]].drop_duplicates()
                 keys_target = df_target[["subject", "trial", "timestamp"]].drop_duplicates()
 
                 rows_before = len(df_measure.index) + len(df_target.index)
@@ -158,9 +185,10 @@ def _common_analysis(**kwargs):
                     if params.analysis != "power spectrum":
                         df_measure_target = df_target.loc[df_target[params.series] == series_value]
 
+                analysis_tasks = []
                 all_perm_tasks = []
 
-                # Real computation across all individuals
+                # Prepare the tasks for all individuals
                 for individual in params.individuals:
 
                     # If the average is set on the same as series, we skip the individuals that are not the series value
@@ -187,10 +215,15 @@ def _common_analysis(**kwargs):
                                 df_target_ind = df_measure_target[df_measure_target[params.average] == individual]
 
                     # Pre-extract all label arrays once — eliminates repeated DataFrame filters in the hot loop
-                    label_arrays = {
-                        lbl: df_measure_ind.loc[df_measure_ind["label"] == lbl, "value"].to_numpy()
-                        for lbl in labels_modality
-                    }
+                    if segmented_dataframe is not None:
+                        label_arrays, segment_target_values = _get_segment_arrays(
+                            segmented_dataframe, df_measure_ind, labels_modality,
+                            df_target_ind if params.analysis != "power spectrum" else None)
+                    else:
+                        label_arrays = {
+                            lbl: df_measure_ind.loc[df_measure_ind["label"] == lbl, "value"].to_numpy()
+                            for lbl in labels_modality
+                        }
 
                     # Mappings for the label permutations (computed once per individual, not per label)
                     if params.compute_permutations and params.permutation_method == "label":
@@ -204,144 +237,199 @@ def _common_analysis(**kwargs):
                     # Hoist target_values extraction outside the label loop —
                     # target_values does not depend on label, only on individual/lag
                     if params.analysis != "power spectrum":
-                        target_values = df_target_ind["value"].to_numpy()
+                        if segmented_dataframe is not None:
+                            target_values = segment_target_values
+                        else:
+                            target_values = df_target_ind["value"].to_numpy()
                         if target_values.size == 0:
                             raise Exception("The target values are empty. Please ensure that the target measure "
                                             "is valid, and that all subjects have an entry for the each series.")
                     else:
                         target_values = None
 
-                    for label in labels_modality:
-                        if params.verbosity > 1:
-                            print("\t\t\t\t\t" + label)
-
-                        measure_values = label_arrays[label]
-
-                        if params.analysis != "power spectrum":
-                            if target_values.size != measure_values.size:
-                                raise ValueError(f"The length of the measure values {measure_values.size} is not "
-                                                 f"equal to the length of the target values {target_values.size}. "
-                                                 f"Please check the dataframe.")
-
-                        for lag in params.lags:
+                    if shared_folder is not None:
+                        label_arrays, target_values = _share_individual_arrays(label_arrays, target_values,
+                                                                               shared_folder.name)
 
-                            if params.verbosity > 1:
-                                print("\t\t\t\t\t\tLag: " + str(lag) + " s")
-
-                            # Trim the arrays for the given lag
-                            sample = int(np.round(lag * params.sampling_rate))
-                            n = measure_values.size
-
-                            if sample > 0:
-                                measure_values_lag = measure_values[:n - sample]
-                            elif sample == 0:
-                                measure_values_lag = measure_values
-                            else:
-                                measure_values_lag = measure_values[-sample:]
-
-                            if target_values is not None:
-                                if sample > 0:
-                                    target_values_lag = target_values[sample:]
-                                elif sample == 0:
-                                    target_values_lag = target_values
-                                else:
-                                    target_values_lag = target_values[:n + sample]
-                            else:
-                                target_values_lag = None
-
-                            # Compute the results for the real data
-                            if params.analysis == "power spectrum":
-                                frequencies, results = _compute_power_spectrum(params.method, measure_values_lag,
-                                                                               frequencies, params.sampling_rate)
-                            elif params.analysis == "correlation":
-                                results = _compute_correlation(pg, params.method, measure_values_lag, target_values_lag)
-                            elif params.analysis == "coherence":
-                                frequencies, results = _compute_coherence(measure_values_lag, target_values_lag,
-                                                                          frequencies, params.sampling_rate,
-                                                                          params.nperseg)
-                            elif params.analysis == "mutual information":
-                                results = _compute_mutual_information(mi, sc, measure_values_lag, target_values_lag,
-                                                                      params.random_seed, params.n_neighbors,
-                                                                      params.mi_scale, params.mi_direction)
-                            else:
-                                raise Exception("Invalid value for the parameter analysis. Choose either 'power "
-                                                "spectrum', 'correlation', 'coherence' or 'mutual information'.")
+                    if params.analysis != "power spectrum":
+                        for label in labels_modality:
+                            if target_values.size != label_arrays[label].size:
+                                raise ValueError(f"The length of the measure values {label_arrays[label].size} is "
+                                                 f"not equal to the length of the target values "
+                                                 f"{target_values.size}. Please check the dataframe.")
 
-                            # noinspection PyUnboundLocalVariable
-                            set_nested_dict(analysis_values,
-                                            [target_measure, measure, series_value, individual, label, lag],
-                                            results)
+                    if individual_tasks:
+                        analysis_tasks.append({"individual": individual, "labels": list(labels_modality),
+                                               "label_arrays": label_arrays, "target_values": target_values})
 
-                            progress_bar.update(1)
+                    else:
+                        for label in labels_modality:
+                            analysis_tasks.append({"individual": individual, "label": label,
+                                                   "measure_values": label_arrays[label],
+                                                   "target_values": target_values})
 
-                    # Compute the results of the permutations
+                    # Prepare the permutations
                     if params.compute_permutations:
                         for label in labels_modality:
-                            # Build precomputed_perms_by_lag for label permutations
+                            # For label permutations, the workers build the permuted arrays from the label names
                             if params.permutation_method == "label":
-                                precomputed_perms_by_lag = {}
-                                for lag in params.lags:
-                                    sample = int(np.round(lag * params.sampling_rate))
-                                    n = label_arrays[label].size
-                                    perms_this_lag = []
-                                    for p in range(params.number_of_randperms):
-                                        perm = label_arrays[labels_mappings[p][label]]
-                                        if sample > 0:
-                                            perm = perm[:n - sample]
-                                        elif sample < 0:
-                                            perm = perm[-sample:]
-                                        perms_this_lag.append(perm)
-                                    precomputed_perms_by_lag[lag] = perms_this_lag
+                                perm_labels = [labels_mappings[p][label] for p in range(*params._get_shard_range())]
                             else:
-                                precomputed_perms_by_lag = None
+                                perm_labels = None
 
                             all_perm_tasks.append({"individual": individual, "label": label,
                                                    "measure_values": label_arrays[label],
                                                    "target_values": target_values,
-                                                   "precomputed_perms_by_lag": precomputed_perms_by_lag})
+                                                   "label_arrays": label_arrays if perm_labels is not None else None,
+                                                   "perm_labels": perm_labels})
+
+                # The real analysis and the permutations of all the individuals and labels are run on the same pool
+                nperseg = params.nperseg if hasattr(params, "nperseg") else None
+                if params.analysis == "power spectrum":
+                    jobs = [delayed(_compute_individual_power_spectra)(
+                                label_arrays=task["label_arrays"],
+                                lags=params.lags,
+                                sampling_rate=params.sampling_rate,
+                                method=params.method,
+                            )
+                            for task in analysis_tasks]
+                elif params.analysis == "coherence":
+                    jobs = [delayed(_compute_individual_coherences)(
+                                label_arrays=task["label_arrays"],
+                                target_values=task["target_values"],
+                                lags=params.lags,
+                                sampling_rate=params.sampling_rate,
+                                nperseg=nperseg,
+                            )
+                            for task in analysis_tasks]
+                elif individual_tasks:
+                    jobs = [delayed(_compute_individual_mutual_information)(
+                                label_arrays=task["label_arrays"],
+                                target_values=task["target_values"],
+                                lags=params.lags,
+                                sampling_rate=params.sampling_rate,
+                                random_state=params.random_seed,
+                                n_neighbors=params.n_neighbors,
+                                mi_scale=params.mi_scale,
+                                mi_direction=params.mi_direction,
+                            )
+                            for task in analysis_tasks]
+                else:
+                    jobs = [delayed(_compute_label_analysis)(
+                                measure_values=task["measure_values"],
+                                target_values=task["target_values"],
+                                lags=params.lags,
+                                sampling_rate=params.sampling_rate,
+                                analysis=params.analysis,
+                                method=params.method,
+                                nperseg=nperseg,
+                                random_seed=params.random_seed,
+                                n_neighbors=params.n_neighbors,
+                                mi_scale=params.mi_scale,
+                                mi_direction=params.mi_direction,
+                            )
+                            for task in analysis_tasks]
 
                 if params.compute_permutations and all_perm_tasks:
                     progress_bar.total += len(all_perm_tasks)
                     progress_bar.refresh()
                     n_tasks = len(all_perm_tasks)
                     task_seeds = params.rng.integers(0, 2**31, size=n_tasks)
-                    perm_results_all = []
-
-                    for result in Parallel(n_jobs=params.n_jobs, prefer=params.parallel_prefer, return_as="generator")(
-                        delayed(_compute_label_perms)(
-                            parent_seed=task_seeds[i],
-                            number_of_randperms=params.number_of_randperms,
-                            measure_values=task["measure_values"],
-                            target_values=task["target_values"],
-                            lags=params.lags,
-                            sampling_rate=params.sampling_rate,
-                            permutation_method=params.permutation_method,
-                            analysis=params.analysis,
-                            method=params.method,
-                            nperseg=params.nperseg if hasattr(params, "nperseg") else None,
-                            frequencies=frequencies,
-                            precomputed_perms_by_lag=task["precomputed_perms_by_lag"],
-                            random_seed=params.random_seed,
-                            n_neighbors=params.n_neighbors,
-                            mi_scale=params.mi_scale,
-                            mi_direction=params.mi_direction,
-                        )
-                        for i, task in enumerate(all_perm_tasks)
-                    ):
-                        perm_results_all.append(result)
-                        progress_bar.update(1)
 
-                    for task, results_by_lag in zip(all_perm_tasks, perm_results_all):
-                        individual = task["individual"]
-                        label = task["label"]
-                        for lag, perm_list in results_by_lag.items():
-                            for perm_values in perm_list:
-                                set_nested_dict(randperm_values,
-                                                [target_measure, measure, series_value, individual, label, lag],
-                                                perm_values, True)
+                    # The permutations already saved in the checkpoint folder are loaded instead of being computed
+                    if params.checkpoint_folder is not None:
+                        for i, task in enumerate(all_perm_tasks):
+                            task["checkpoint_key"] = _get_checkpoint_key(params, task, task_seeds[i], nperseg,
+                                                                         target_measure, measure, series_value)
+                            task["checkpoint"] = _load_checkpoint(params.checkpoint_folder, task["checkpoint_key"],
+                                                                  params.lags)
+                        if params.verbosity > 1:
+                            n_loaded = sum(task["checkpoint"] is not None for task in all_perm_tasks)
+                            print(f"\t\t\t\tLoaded {n_loaded}/{n_tasks} permutation blocks from the checkpoint "
+                                  f"folder.")
+
+                    jobs += [delayed(_compute_label_perms)(
+                                parent_seed=task_seeds[i],
+                                number_of_randperms=params.number_of_randperms,
+                                perm_range=params._get_shard_range(),
+                                measure_values=task["measure_values"],
+                                target_values=task["target_values"],
+                                lags=params.lags,
+                                sampling_rate=params.sampling_rate,
+                                permutation_method=params.permutation_method,
+                                analysis=params.analysis,
+                                method=params.method,
+                                nperseg=nperseg,
+                                frequencies=frequencies,
+                                precomputed_perms_by_lag=None,
+                                random_seed=params.random_seed,
+                                n_neighbors=params.n_neighbors,
+                                mi_scale=params.mi_scale,
+                                mi_direction=params.mi_direction,
+                                permutation_engine=params.permutation_engine,
+                                label_arrays=task["label_arrays"],
+                                perm_labels=task["perm_labels"],
+                            )
+                            for i, task in enumerate(all_perm_tasks) if task.get("checkpoint") is None]
+
+                results_all = Parallel(n_jobs=params.n_jobs, prefer=params.parallel_prefer,
+                                       return_as="generator")(jobs)
+
+                # The results come back in the order of the jobs: real analyses first, then permutations
+                for task in analysis_tasks:
+                    task_frequencies, results_by_label = next(results_all)
+                    if not individual_tasks:
+                        results_by_label = {task["label"]: results_by_label}
+
+                    # Same frequencies as the sequential calculation: the last ones for the power spectrum, the
+                    # first ones for the coherence
+                    if params.analysis == "power spectrum" or (params.analysis == "coherence" and frequencies is None):
+                        frequencies = task_frequencies
+
+                    for label, results_by_lag in results_by_label.items():
+                        if params.verbosity > 1:
+                            print(f"\t\t\t\t{task['individual']} · {label}")
+
+                        for lag, results in results_by_lag.items():
+                            analysis_values.set_value([target_measure, measure, series_value, task["individual"],
+                                                       label, lag], results)
+                        progress_bar.update(len(params.lags))
 
+                for task in all_perm_tasks:
+                    if task.get("checkpoint") is not None:
+                        results_by_lag = task["checkpoint"]
+                    else:
+                        results_by_lag = next(results_all)
+                        if params.checkpoint_folder is not None:
+                            _save_checkpoint(params.checkpoint_folder, task["checkpoint_key"], results_by_lag)
+                    progress_bar.update(1)
+
+                    for lag, perm_list in results_by_lag.items():
+                        if len(perm_list) > 0:
+                            randperm_values.set_value([target_measure, measure, series_value, task["individual"],
+                                                       task["label"], lag], np.asarray(perm_list))
     progress_bar.close()
 
+    if shared_folder is not None:
+        shared_folder.cleanup()
+
+    # A shard returns its raw values: the averages and z-scores are calculated once all the shards are merged
+    if params.shard is not None:
+        analysis_parameters = dataclasses.asdict(params)
+        analysis_parameters["shard_parameters"] = params._get_state()
+        analysis_results = {"frequencies": frequencies, "analysis_values": analysis_values,
+                            "randperm_values": randperm_values}
+        return Results(analysis_parameters, analysis_results, {}, dt.now(), dt.now() - time_start)
+
+    return _summarize_analysis(params, analysis_values, randperm_values, frequencies, time_start)
+
+
+def _summarize_analysis(params, analysis_values, randperm_values, frequencies, time_start):
+    """Calculates the averages, the standard deviations and, if permutations were computed, the z-scores and p-values
+    of the values returned by the analysis, before plotting the results and returning them in a Results instance.
+    This second part of _common_analysis is also called by Results.merge to finish the analysis of shards."""
+    plot_dictionary = {}
+
     params._get_specific_frequencies(frequencies)
     params._generate_silhouette_titles(frequencies)
 
@@ -351,14 +439,18 @@ def _common_analysis(**kwargs):
         elif params.result_type == "average":
             print("\nCalculating the averages...")
 
-    averages = {}
-    stds = {}
-    z_scores = {}
-    p_values = {}
-    averages_perm = {}
-    stds_perm = {}
+    dimensions = ["target", "measure", "series", "label", "lag"]
+    coordinates = [params.target_measures, params.measures, params.series_values,
+                   list(params.labels_mocap) + params.labels_audio, params.lags]
+    averages = LabelledArray(dimensions, coordinates)
+    stds = LabelledArray(dimensions, coordinates)
+    z_scores = LabelledArray(dimensions, coordinates)
+    p_values = LabelledArray(dimensions, coordinates)
+    averages_perm = LabelledArray(dimensions, coordinates)
+    stds_perm = LabelledArray(dimensions, coordinates)
     max_value = 0
     background_fits = {}  # For power spectrum
+    background_keys, background_powers, background_lower_freqs = [], [], []
 
     tqdm_title = "Z-scores computation" if params.result_type == "z-scores" else "Averages computation"
     progress_bar = tqdm(total=_count_tqdm_iterations(params, 2), desc=tqdm_title, ncols=80,
@@ -395,93 +487,78 @@ def _common_analysis(**kwargs):
                 else:
                     labels_modality = params.labels_mocap
 
-                for label in labels_modality:
+                # Values of all the individuals, labels and lags of the series: (individuals, labels, lags[, values])
+                # The individuals without values (e.g. when averaging on the series) are NaN and ignored by nanmean
+                block = analysis_values.get_indices([target_measure, measure, series_value])
+                label_indices = [analysis_values.get_index("label", label) for label in labels_modality]
+                vals = analysis_values.values[block][:, label_indices]
+                avg_block = np.nanmean(vals, axis=0)
+                std_block = np.nanstd(vals, axis=0)
+
+                if params.compute_permutations:
+                    # Average of each permutation across individuals: (labels, lags, permutations[, values])
+                    perms_block = np.nanmean(randperm_values.values[block][:, label_indices], axis=0)
+
+                    # The permutations with non-finite values are discarded for the spectral analyses
+                    if params.analysis in ["correlation", "mutual information"]:
+                        valid = np.ones(perms_block.shape[:3], dtype=bool)
+                    else:
+                        valid = np.all(np.isfinite(perms_block), axis=tuple(range(3, perms_block.ndim)))
+                        perms_block = np.where(valid.reshape(valid.shape + (1,) * (perms_block.ndim - 3)),
+                                               perms_block, np.nan)
+                    number_valid = np.sum(valid, axis=2).reshape(avg_block.shape[:2] + (1,) * (avg_block.ndim - 2))
+
+                    avg_perms_block = np.nanmean(perms_block, axis=2)
+                    sd_perms_block = np.nanstd(perms_block, axis=2)
+
+                    if params.result_type == "z-scores":
+                        sd_perms_safe = np.where(sd_perms_block == 0, np.inf, sd_perms_block)
+                        z_block = (avg_block - avg_perms_block) / sd_perms_safe
+                        exceedances = (np.abs(perms_block - np.expand_dims(avg_perms_block, 2)) >=
+                                       np.expand_dims(np.abs(avg_block - avg_perms_block), 2))
+                        p_block = (np.sum(exceedances, axis=2) + 1) / (number_valid + 1)
+                        z_block = np.where(number_valid == 0, np.nan, z_block)
+                        p_block = np.where(number_valid == 0, np.nan, p_block)
+
+                # The lower frequency bound of the background fits is shared by all the labels of a lag
+                if params.fit_background and params.analysis == "power spectrum":
+                    lower_freqs = [_resolve_lower_freq(frequencies, analysis_values, params, target_measure, measure,
+                                                       series_value, labels_modality, lag) for lag in params.lags]
+
+                for i_label, label in enumerate(labels_modality):
                     if params.verbosity > 1:
                         print("\t\t\t\t" + label)
 
-                    for lag in params.lags:
+                    for i_lag, lag in enumerate(params.lags):
                         if params.verbosity > 1:
                             print("\t\t\t\t\tLag: " + str(lag) + " s")
 
                         if params.specific_frequency is None and params.analysis not in ["correlation", "mutual information"] and label not in plot_dictionary.keys():
                             plot_dictionary[label] = Graph()
 
-                        if params.average == params.series and params.average is not None:
-                            vals = [analysis_values[target_measure][measure][series_value][series_value][label][lag]]
-                        else:
-                            vals = [analysis_values[target_measure][measure][series_value][ind][label][lag] for ind in params.individuals]
-
-                        expected_length = None
-                        for val in vals:
-                            if expected_length is None:
-                                if isinstance(val, Number):
-                                    expected_length = 1
-                                else:
-                                    expected_length = len(val)
-                            else:
-                                if ((isinstance(val, Number) and expected_length != 1) or
-                                        (not(isinstance(val, Number)) and len(val) != expected_length)):
-                                    raise Exception("At least one element does not have the same length as the others.")
-
-                        avg = np.nanmean(vals, axis=0)
-                        std = np.nanstd(vals, axis=0)
+                        keys = [target_measure, measure, series_value, label, lag]
+                        avg = avg_block[i_label, i_lag]
+                        std = std_block[i_label, i_lag]
 
+                        # The background fits are calculated for all the labels at once, after the loop
                         if params.fit_background and params.analysis == "power spectrum":
-                            resolved_lower_freq = _resolve_lower_freq(frequencies, analysis_values, params,
-                                                  target_measure, measure, series_value, labels_modality, lag)
-
-                            if isinstance(params.signif_alpha, list):
-                                alpha = params.signif_alpha[0]
-                            else:
-                                alpha = params.signif_alpha
-
-                            fit_result = _fit_spectral_background(frequencies, avg, resolved_lower_freq,
-                                                                  alpha, params.signif_tail)
-
-                            set_nested_dict(background_fits, [target_measure, measure, series_value, label, lag],
-                                            fit_result)
+                            background_keys.append(keys)
+                            background_powers.append(avg)
+                            background_lower_freqs.append(lower_freqs[i_lag])
 
                         if params.compute_permutations:
-                            if params.analysis in ["correlation", "mutual information"]:
-                                perms_stack = np.stack(
-                                    [np.asarray(randperm_values[target_measure][measure][series_value][ind][label][lag])
-                                     for ind in params.individuals], axis=0)
-                                perms = np.nanmean(perms_stack, axis=0)
-                            else:
-                                perms_stack = np.stack([np.stack(
-                                    randperm_values[target_measure][measure][series_value][ind][label][lag], axis=0) for
-                                                        ind in params.individuals], axis=0)
-                                perms = np.nanmean(perms_stack, axis=0)
-                                perms = perms[np.all(np.isfinite(perms), axis=1)]
-
-                            avg_perms = np.nanmean(perms, axis=0)
-                            sd_perms = np.nanstd(perms, axis=0)
-
-                            set_nested_dict(averages_perm, [target_measure, measure, series_value, label, lag],
-                                            avg_perms)
-                            set_nested_dict(stds_perm, [target_measure, measure, series_value, label, lag], sd_perms)
+                            avg_perms = avg_perms_block[i_label, i_lag]
+                            sd_perms = sd_perms_block[i_label, i_lag]
+                            averages_perm.set_value(keys, avg_perms)
+                            stds_perm.set_value(keys, sd_perms)
 
                             if params.result_type == "z-scores":
+                                z = z_block[i_label, i_lag]
+                                z_scores.set_value(keys, z)
+                                p_values.set_value(keys, p_block[i_label, i_lag])
 
-                                if perms.size == 0:
-                                    p = np.full_like(avg, np.nan)
-                                    z = np.full_like(avg, np.nan)
-                                else:
-                                    avg_perms_z = np.nanmean(perms, axis=0)
-                                    sd_perms_z = np.nanstd(perms, axis=0)
-                                    sd_perms_safe = np.where(sd_perms_z == 0, np.inf, sd_perms_z)
-                                    z = (avg - avg_perms_z) / sd_perms_safe
-                                    p = (np.sum(np.abs(perms - avg_perms_z) >= np.abs(avg - avg_perms_z), axis=0) + 1) / (
-                                                perms.shape[0] + 1)
-
-                                set_nested_dict(z_scores, [target_measure, measure, series_value, label, lag], z)
-                                set_nested_dict(p_values, [target_measure, measure, series_value, label, lag], p)
-
-                        else:
-                            perms = []
-
-                        set_nested_dict(averages, [target_measure, measure, series_value, label, lag], avg)
-                        set_nested_dict(stds, [target_measure, measure, series_value, label, lag], std)
+                        averages.set_value(keys, avg)
+                        stds.set_value(keys, std)
 
                         if params.plot_type == "silhouette":
                             key = label if params.measure_to_modality[measure] == "mocap" else "Audio"
@@ -492,14 +569,14 @@ def _common_analysis(**kwargs):
                                 for i in range(params.nb_silhouettes_per_series):
                                     if params.specific_frequency is not None:
                                         if params.result_type == "z-scores":
-                                            plot_dictionary[key].append(z_scores[target_measure][measure][series_value][label][lag][params.index_freqs[i]])
+                                            plot_dictionary[key].append(z[params.index_freqs[i]])
                                         else:
-                                            plot_dictionary[key].append(averages[target_measure][measure][series_value][label][lag][params.index_freqs[i]])
+                                            plot_dictionary[key].append(avg[params.index_freqs[i]])
                                     else:
                                         if params.result_type == "z-scores":
-                                            plot_dictionary[key].append(z_scores[target_measure][measure][series_value][label][lag])
+                                            plot_dictionary[key].append(z)
                                         else:
-                                            plot_dictionary[key].append(averages[target_measure][measure][series_value][label][lag])
+                                            plot_dictionary[key].append(avg)
 
                         else:
                             graph_labels = []
@@ -514,20 +591,18 @@ def _common_analysis(**kwargs):
                             graph_label = " ".join(graph_labels)
 
                             if params.result_type == "z-scores":
-                                graph_plot = GraphPlot(frequencies, z_scores[target_measure][measure][series_value][label][lag], line_width=params.line_width,
+                                graph_plot = GraphPlot(frequencies, z, line_width=params.line_width,
                                                        line_style=params.line_style, color=params.color_line_series[target_measure][measure][series_value][lag],
                                                        label=graph_label)
                                 plot_dictionary[label].add_graph_plot(graph_plot)
                             else:
-                                graph_plot = GraphPlot(frequencies, averages[target_measure][measure][series_value][label][lag],
-                                                       stds[target_measure][measure][series_value][label][lag], line_width=params.line_width,
+                                graph_plot = GraphPlot(frequencies, avg, std, line_width=params.line_width,
                                                        line_style=params.line_style, color=params.color_line_series[target_measure][measure][series_value][lag],
                                                        label=graph_label)
                                 plot_dictionary[label].add_graph_plot(graph_plot)
 
                                 if params.compute_permutations:
-                                    graph_plot = GraphPlot(frequencies, averages_perm[target_measure][measure][series_value][label][lag],
-                                                           stds_perm[target_measure][measure][series_value][label][lag], line_width=params.line_width,
+                                    graph_plot = GraphPlot(frequencies, avg_perms, sd_perms, line_width=params.line_width,
                                                            line_style=params.line_style, color=params.color_line_perm[target_measure][measure][series_value][lag],
                                                            label=graph_label + " (avg. perm.)")
                                     plot_dictionary[label].add_graph_plot(graph_plot)
@@ -547,6 +622,23 @@ def _common_analysis(**kwargs):
 
     progress_bar.close()
 
+    # The lines of the background fits of all the labels are fitted at once, then the fits are finished on the pool
+    if len(background_keys) > 0:
+        if params.verbosity > 1:
+            print(f"\tFitting the spectral background of {len(background_keys)} spectra...")
+
+        alpha = params.signif_alpha[0] if isinstance(params.signif_alpha, list) else params.signif_alpha
+        slopes, intercepts = _fit_spectral_background_lines(frequencies, np.stack(background_powers),
+                                                            background_lower_freqs)
+        fit_results = Parallel(n_jobs=params.n_jobs, prefer=params.parallel_prefer)(
+            delayed(_fit_spectral_background)(frequencies, power, lower_freq, alpha, params.signif_tail,
+                                              (slope, intercept))
+            for power, lower_freq, slope, intercept in zip(background_powers, background_lower_freqs, slopes,
+                                                           intercepts))
+
+        for keys, fit_result in zip(background_keys, fit_results):
+            set_nested_dict(background_fits, keys, fit_result)
+
     series_p_values = {}
     series_z_scores = {}
 
@@ -564,10 +656,10 @@ def _common_analysis(**kwargs):
                         inds_series_a = []
                         inds_series_b = []
                         for ind in params.individuals:
-                            if has_nested_key(analysis_values, [target_measure, measure, series_a, ind, label, lag]):
+                            if analysis_values.has_value([target_measure, measure, series_a, ind, label, lag]):
                                 vals_series_a.append(analysis_values[target_measure][measure][series_a][ind][label][lag])
                                 inds_series_a.append(ind)
-                            if has_nested_key(analysis_values, [target_measure, measure, series_b, ind, label, lag]):
+                            if analysis_values.has_value([target_measure, measure, series_b, ind, label, lag]):
                                 vals_series_b.append(analysis_values[target_measure][measure][series_b][ind][label][lag])
                                 inds_series_b.append(ind)
 
@@ -670,9 +762,10 @@ def power_spectrum(experiment_or_dataframe, method="welch", sampling_rate="auto"
                    subjects=None, trials=None, sequence_measure="auto", audio_measure="auto", series=None, average=None,
                    lags=None, result_type="average", fit_background=False, background_lower_freq=None,
                    permutation_method=None, number_of_randperms=0, random_seed=None, n_jobs=1, parallel_prefer=None,
-                   specific_frequency=None, freq_atol=0.1, include_audio=False, signif_style="threshold",
-                   signif_alpha=0.05, signif_tail="1", signif_direction="up", color_line_series=None,
-                   color_line_perm=None, title=None, line_width=1, verbosity=1, **kwargs):
+                   checkpoint_folder=None, shard=None, permutation_engine="loop", specific_frequency=None,
+                   freq_atol=0.1, include_audio=False, signif_style="threshold", signif_alpha=0.05, signif_tail="1",
+                   signif_direction="up", color_line_series=None, color_line_perm=None, title=None, line_width=1,
+                   verbosity=1, **kwargs):
     """Returns the power spectrum values for all the variables (joints and audio) of the given dataframe or experiment.
     The function also plots these power spectrum values.
 
@@ -693,6 +786,9 @@ def power_spectrum(experiment_or_dataframe, method="welch", sampling_rate="auto"
               generally generated from :meth:`Experiment.get_dataframe()`.
             • The path of a file containing a pandas DataFrame, generally generated from
               :class:`Experiment.save_dataframe()`.
+            • A :class:`SegmentedDataframe` instance, generally generated from
+              :meth:`Experiment.get_segmented_dataframe()`. The values of the selected segments are read
+              directly from its arrays, without creating the long dataframe.
             • A list combining any of the above types. In that case, all the dataframes will be merged sequentially.
 
     method: str, optional
@@ -848,14 +944,43 @@ def power_spectrum(experiment_or_dataframe, method="welch", sampling_rate="auto"
         on each execution.
 
     n_jobs: int, optional
-        Max amount of jobs to run in parallel when computing the permutations. Setting this number higher can
-        drastically lower the computation time, but demand more resources. Set on -1 to use the maximum amount of
-        available cores (default: 1).
+        Max amount of jobs to run in parallel. The analysis of each individual and label, and the permutations, are
+        distributed over the same pool of jobs; with ``fit_background``, the background fits of the labels are then
+        distributed over this pool too. Setting this number higher can drastically lower the computation time, but
+        demand more resources. Set on -1 to use the maximum amount of available cores (default: 1).
 
     parallel_prefer: str|None
         Soft hint to choose the default backend for the parallelization. Sets the parameter ``prefer`` from
         `joblib.Parallel<https://joblib.readthedocs.io/en/latest/generated/joblib.Parallel.html>`_.
 
+    checkpoint_folder: str|None, optional
+        If set, the path to a folder where the permutations of each individual and label are saved as soon as they are
+        calculated. When the function is run again with the same data and parameters (including ``random_seed``,
+        which must not be ``None``), the saved permutations are loaded instead of being calculated again: an
+        interrupted analysis thus resumes where it stopped. By default (``None``), no checkpoint is saved.
+
+    shard: tuple(int, int)|None, optional
+        If set, a tuple ``(i, n)`` to only compute the i-th of n shards of the permutations (with ``i`` going from 0 to
+        ``n - 1``), typically to spread a large number of permutations over several machines. ``random_seed`` must be
+        set and identical for all the shards. Each shard computes the analysis of the real data, and the same
+        ``number_of_randperms / n`` permutations of each individual and label as the full analysis would. The
+        returned Results then only contain the raw values of the shard, without plotting them: the shards must be
+        combined with :meth:`Results.merge`, which returns exactly the results of the analysis run at once. By default
+        (``None``), all the permutations are computed.
+
+    permutation_engine: str, optional
+        How the permutations are evaluated:
+
+            • ``"loop"`` (default): the surrogates of each permutation are generated separately.
+            • ``"batch"``: with ``permutation_method="phase"``, the amplitude spectrum of the signal is calculated
+              once, and the surrogates are generated with a single inverse FFT.
+
+        In both cases, the power spectra of the permutations of each label and lag are stacked in a matrix and
+        calculated at once along the time axis, as the power spectra of the labels of each individual.
+
+        .. versionchanged:: 2.0
+            The power spectra of the permutations are always calculated at once.
+
     specific_frequency : float|list(float)|None, optional
         Frequency (or list of frequencies) to extract from the result. If set, silhouette plots are generated.
 
@@ -948,6 +1073,10 @@ def power_spectrum(experiment_or_dataframe, method="welch", sampling_rate="auto"
             • ``p_values`` contains the p-values of the analysis, if ``return_type`` was set on ``z-scores``.
             • ``plot_dictionary`` contains the plot dictionary that can be directly passed to ``plot_silhouette`` or
               ``plot_body_graphs``.
+
+        The results are :class:`LabelledArray` instances, that can be indexed as nested dictionaries
+        (``averages[target_measure][measure][series_value][label][lag]``), and contain all the values in a single
+        array (``averages.values``), with one axis per dimension.
     """
 
     return _common_analysis(experiment_or_dataframe=experiment_or_dataframe, analysis="power spectrum", method=method,
@@ -957,7 +1086,9 @@ def power_spectrum(experiment_or_dataframe, method="welch", sampling_rate="auto"
                             fit_background=fit_background, background_lower_freq=background_lower_freq,
                             permutation_method=permutation_method, number_of_randperms=number_of_randperms,
                             random_seed=random_seed, n_jobs=n_jobs, parallel_prefer=parallel_prefer,
-                            specific_frequency=specific_frequency, freq_atol=freq_atol, include_audio=include_audio,
+                            checkpoint_folder=checkpoint_folder, shard=shard, permutation_engine=permutation_engine,
+                            specific_frequency=specific_frequency,
+                            freq_atol=freq_atol, include_audio=include_audio,
                             signif_style=signif_style,
                             signif_alpha=signif_alpha, signif_tail=signif_tail, signif_direction=signif_direction, color_line_series=color_line_series,
                             color_line_perm=color_line_perm, title=title, line_width=line_width, verbosity=verbosity,
@@ -966,9 +1097,9 @@ def power_spectrum(experiment_or_dataframe, method="welch", sampling_rate="auto"
 def correlation(experiment_or_dataframe, method="pingouin", sampling_rate="auto", groups=None, conditions=None,
                 subjects=None, trials=None, sequence_measure="auto", audio_measure="auto", correlation_with="envelope",
                 series=None, average=None, lags=None, result_type="average", permutation_method=None,
-                number_of_randperms=0, random_seed=None, n_jobs=1, parallel_prefer=None, include_audio=False,
-                signif_style="threshold", signif_alpha=0.05, signif_tail="1", signif_direction="up", verbosity=1,
-                **kwargs):
+                number_of_randperms=0, random_seed=None, n_jobs=1, parallel_prefer=None, checkpoint_folder=None,
+                shard=None, permutation_engine="loop", include_audio=False, signif_style="threshold",
+                signif_alpha=0.05, signif_tail="1", signif_direction="up", verbosity=1, **kwargs):
     """Calculates and plots the correlation between one metric derived from the sequences, and the same metric from a
     given joint, or another metric derived from the corresponding audio clips.
 
@@ -989,6 +1120,9 @@ def correlation(experiment_or_dataframe, method="pingouin", sampling_rate="auto"
               generally generated from :meth:`Experiment.get_dataframe()`.
             • The path of a file containing a pandas DataFrame, generally generated from
               :class:`Experiment.save_dataframe()`.
+            • A :class:`SegmentedDataframe` instance, generally generated from
+              :meth:`Experiment.get_segmented_dataframe()`. The values of the selected segments are read
+              directly from its arrays, without creating the long dataframe.
             • A list combining any of the above types. In that case, all the dataframes will be merged sequentially.
 
     method: str, optional
@@ -996,6 +1130,10 @@ def correlation(experiment_or_dataframe, method="pingouin", sampling_rate="auto"
             • ``"pingouin"`` (default, alternative: ``"pg"``), uses
               `pingouin_corr <https://pingouin-stats.org/build/html/generated/pingouin.corr.html>`_
             • ``"numpy"``, uses a Pearson correlation calculated with numpy.
+            • ``"fft"``, scans all the lags at once: for each label, the correlations for all the values of ``lags``
+              are obtained from a single FFT-based cross-correlation with the target. The results are the same as
+              with ``"numpy"``, apart from floating-point rounding differences. With ``permutation_method="shift"``,
+              the correlations of all the circular shifts are also obtained from a single FFT for each lag.
 
     sampling_rate : int|str|float, optional
         Sampling rate of the signals. By default, this value is set on ``"auto"``: in that case, the sampling rate
@@ -1141,14 +1279,37 @@ def correlation(experiment_or_dataframe, method="pingouin", sampling_rate="auto"
         on each execution.
 
     n_jobs: int, optional
-        Max amount of jobs to run in parallel when computing the permutations. Setting this number higher can
-        drastically lower the computation time, but demand more resources. Set on -1 to use the maximum amount of
-        available cores (default: 1).
+        Max amount of jobs to run in parallel. The analysis of each individual and label, and the permutations, are
+        distributed over the same pool of jobs. Setting this number higher can drastically lower the computation
+        time, but demand more resources. Set on -1 to use the maximum amount of available cores (default: 1).
 
     parallel_prefer: str|None
         Soft hint to choose the default backend for the parallelization. Sets the parameter ``prefer`` from
         `joblib.Parallel<https://joblib.readthedocs.io/en/latest/generated/joblib.Parallel.html>`_.
 
+    checkpoint_folder: str|None, optional
+        If set, the path to a folder where the permutations of each individual and label are saved as soon as they are
+        calculated. When the function is run again with the same data and parameters (including ``random_seed``,
+        which must not be ``None``), the saved permutations are loaded instead of being calculated again: an
+        interrupted analysis thus resumes where it stopped. By default (``None``), no checkpoint is saved.
+
+    shard: tuple(int, int)|None, optional
+        If set, a tuple ``(i, n)`` to only compute the i-th of n shards of the permutations (with ``i`` going from 0 to
+        ``n - 1``), typically to spread a large number of permutations over several machines. ``random_seed`` must be
+        set and identical for all the shards. Each shard computes the analysis of the real data, and the same
+        ``number_of_randperms / n`` permutations of each individual and label as the full analysis would. The
+        returned Results then only contain the raw values of the shard, without plotting them: the shards must be
+        combined with :meth:`Results.merge`, which returns exactly the results of the analysis run at once. By default
+        (``None``), all the permutations are computed.
+
+    permutation_engine: str, optional
+        How the permutations are evaluated:
+
+            • ``"loop"`` (default): the correlation of each permutation is calculated separately.
+            • ``"batch"``: for each label and lag, the permutations are stacked in a matrix, and their Pearson
+              correlations with the target are calculated at once. This is considerably faster for large numbers of
+              permutations, and returns the same values, apart from floating-point rounding differences.
+
     include_audio : bool, optional
         If ``True``, includes audio signals in the set of labels to analyse.
 
@@ -1205,6 +1366,10 @@ def correlation(experiment_or_dataframe, method="pingouin", sampling_rate="auto"
             • ``p_values`` contains the p-values of the correlation, if ``return_type`` was set on ``z-scores``.
             • ``plot_dictionary`` contains the plot dictionary that can be directly passed to ``plot_silhouette`` or
               ``plot_body_graphs``.
+
+        The results are :class:`LabelledArray` instances, that can be indexed as nested dictionaries
+        (``averages[target_measure][measure][series_value][label][lag]``), and contain all the values in a single
+        array (``averages.values``), with one axis per dimension.
     """
 
     return _common_analysis(experiment_or_dataframe=experiment_or_dataframe, analysis="correlation", method=method,
@@ -1214,14 +1379,17 @@ def correlation(experiment_or_dataframe, method="pingouin", sampling_rate="auto"
                             result_type=result_type, permutation_method=permutation_method,
                             number_of_randperms=number_of_randperms,
                             random_seed=random_seed, n_jobs=n_jobs, parallel_prefer=parallel_prefer,
-                            include_audio=include_audio, signif_style=signif_style, signif_alpha=signif_alpha,
-                            signif_tail=signif_tail, signif_direction=signif_direction, verbosity=verbosity, **kwargs)
+                            checkpoint_folder=checkpoint_folder, shard=shard, permutation_engine=permutation_engine,
+                            include_audio=include_audio,
+                            signif_style=signif_style, signif_alpha=signif_alpha, signif_tail=signif_tail,
+                            signif_direction=signif_direction, verbosity=verbosity, **kwargs)
 
 def coherence(experiment_or_dataframe, sampling_rate="auto", groups=None, conditions=None,
               subjects=None, trials=None, sequence_measure="distance", audio_measure="envelope",
               coherence_with="envelope", series=None, average=None, lags=None, result_type="z-scores",
               permutation_method="value", number_of_randperms=1000, n_jobs=1, parallel_prefer=None,
-              specific_frequency=None, freq_atol=1e-8, freq_resolution_hz=0.25, include_audio=False, random_seed=None,
+              checkpoint_folder=None, shard=None, permutation_engine="loop", specific_frequency=None, freq_atol=1e-8,
+              freq_resolution_hz=0.25, include_audio=False, random_seed=None,
               signif_style="threshold", signif_alpha=0.05, signif_tail="1", signif_direction="up",
               color_line_series=None, color_line_perm=None, title=None, line_width=1, verbosity=1, **kwargs):
     """Calculates and plots the coherence between measures.
@@ -1243,6 +1411,9 @@ def coherence(experiment_or_dataframe, sampling_rate="auto", groups=None, condit
               generally generated from :meth:`Experiment.get_dataframe()`.
             • The path of a file containing a pandas DataFrame, generally generated from
               :class:`Experiment.save_dataframe()`.
+            • A :class:`SegmentedDataframe` instance, generally generated from
+              :meth:`Experiment.get_segmented_dataframe()`. The values of the selected segments are read
+              directly from its arrays, without creating the long dataframe.
             • A list combining any of the above types. In that case, all the dataframes will be merged sequentially.
 
     sampling_rate : int|str|float, optional
@@ -1389,14 +1560,48 @@ def coherence(experiment_or_dataframe, sampling_rate="auto", groups=None, condit
         on each execution.
 
     n_jobs: int, optional
-        Max amount of jobs to run in parallel when computing the permutations. Setting this number higher can
-        drastically lower the computation time, but demand more resources. Set on -1 to use the maximum amount of
-        available cores (default: 1).
+        Max amount of jobs to run in parallel. The analysis of each individual and label, and the permutations, are
+        distributed over the same pool of jobs. Setting this number higher can drastically lower the computation
+        time, but demand more resources. Set on -1 to use the maximum amount of available cores (default: 1).
 
     parallel_prefer: str|None
         Soft hint to choose the default backend for the parallelization. Sets the parameter ``prefer`` from
         `joblib.Parallel<https://joblib.readthedocs.io/en/latest/generated/joblib.Parallel.html>`_.
 
+    checkpoint_folder: str|None, optional
+        If set, the path to a folder where the permutations of each individual and label are saved as soon as they are
+        calculated. When the function is run again with the same data and parameters (including ``random_seed``,
+        which must not be ``None``), the saved permutations are loaded instead of being calculated again: an
+        interrupted analysis thus resumes where it stopped. By default (``None``), no checkpoint is saved.
+
+    shard: tuple(int, int)|None, optional
+        If set, a tuple ``(i, n)`` to only compute the i-th of n shards of the permutations (with ``i`` going from 0 to
+        ``n - 1``), typically to spread a large number of permutations over several machines. ``random_seed`` must be
+        set and identical for all the shards. Each shard computes the analysis of the real data, and the same
+        ``number_of_randperms / n`` permutations of each individual and label as the full analysis would. The
+        returned Results then only contain the raw values of the shard, without plotting them: the shards must be
+        combined with :meth:`Results.merge`, which returns exactly the results of the analysis run at once. By default
+        (``None``), all the permutations are computed.
+
+    permutation_engine: str, optional
+        How the permutations are evaluated:
+
+            • ``"loop"`` (default): the surrogates of each permutation are generated separately.
+            • ``"batch"``: with ``permutation_method="phase"``, the amplitude spectrum of the signal is calculated
+              once, and the surrogates are generated with a single inverse FFT.
+
+        In both cases, the windowed segments of the target are Fourier-transformed once per lag, and the coherences
+        of all the labels of an individual, and of all the permutations of each label, are calculated from the
+        spectra of their segments, stacked in a matrix.
+
+        .. versionchanged:: 2.0
+            The coherences of the labels and of the permutations are always calculated at once. The coherence of
+            each ``"shift"``, ``"label"`` or ``"phase"`` permutation is now the one returned by
+            :func:`scipy.signal.coherence` for the surrogate and the target trimmed for the lag. In 1.x, it was
+            divided by the power spectral density of the untrimmed signal of the label, calculated once for all the
+            lags and all the permutations: the values of these permutations therefore differ from 1.x. The values of
+            the ``"value"`` permutations are unchanged.
+
     specific_frequency : float|list(float)|None, optional
         Frequency (or list of frequencies) to extract from the result. If set, silhouette plots are generated. This
         parameter is ignored if ``analysis == "correlation"``.
@@ -1490,6 +1695,10 @@ def coherence(experiment_or_dataframe, sampling_rate="auto", groups=None, condit
             • ``p_values`` contains the p-values of the analysis, if ``return_type`` was set on ``z-scores``.
             • ``plot_dictionary`` contains the plot dictionary that can be directly passed to ``plot_silhouette`` or
               ``plot_body_graphs``.
+
+        The results are :class:`LabelledArray` instances, that can be indexed as nested dictionaries
+        (``averages[target_measure][measure][series_value][label][lag]``), and contain all the values in a single
+        array (``averages.values``), with one axis per dimension.
     """
 
     return _common_analysis(experiment_or_dataframe=experiment_or_dataframe, analysis="coherence",
@@ -1500,18 +1709,20 @@ def coherence(experiment_or_dataframe, sampling_rate="auto", groups=None, condit
                             number_of_randperms=number_of_randperms, specific_frequency=specific_frequency,
                             freq_atol=freq_atol, freq_resolution_hz=freq_resolution_hz,
                             include_audio=include_audio, random_seed=random_seed, n_jobs=n_jobs,
-                            parallel_prefer=parallel_prefer, signif_style=signif_style, signif_alpha=signif_alpha,
-                            signif_tail=signif_tail, signif_direction=signif_direction,
+                            parallel_prefer=parallel_prefer, checkpoint_folder=checkpoint_folder, shard=shard,
+                            permutation_engine=permutation_engine, signif_style=signif_style,
+                            signif_alpha=signif_alpha, signif_tail=signif_tail, signif_direction=signif_direction,
                             color_line_series=color_line_series, color_line_perm=color_line_perm, title=title,
                             line_width=line_width, verbosity=verbosity, **kwargs)
 
 def mutual_information(experiment_or_dataframe, sampling_rate="auto", groups=None, conditions=None, subjects=None,
                        trials=None, sequence_measure="distance", audio_measure="envelope", regression_with="envelope",
                        series=None, average=None, lags=None, result_type="z-scores", permutation_method="value",
-                       number_of_randperms=1000, n_jobs=1, parallel_prefer=None, scale="standard", n_neighbors=3,
-                       direction="target", include_audio=False, random_seed=None, signif_style="threshold",
-                       signif_alpha=0.05, signif_tail="1", signif_direction="up", color_line_series=None,
-                       color_line_perm=None, title=None, line_width=1, verbosity=1, **kwargs):
+                       number_of_randperms=1000, n_jobs=1, parallel_prefer=None, checkpoint_folder=None,
+                       shard=None, scale="standard", n_neighbors=3, direction="target", method="ksg",
+                       include_audio=False, random_seed=None, signif_style="threshold", signif_alpha=0.05,
+                       signif_tail="1", signif_direction="up", color_line_series=None, color_line_perm=None, title=None,
+                       line_width=1, verbosity=1, **kwargs):
     """Calculates and plots the mutual information between measures.
 
     ..versionadded:: 2.0
@@ -1531,6 +1742,9 @@ def mutual_information(experiment_or_dataframe, sampling_rate="auto", groups=Non
               generally generated from :meth:`Experiment.get_dataframe()`.
             • The path of a file containing a pandas DataFrame, generally generated from
               :class:`Experiment.save_dataframe()`.
+            • A :class:`SegmentedDataframe` instance, generally generated from
+              :meth:`Experiment.get_segmented_dataframe()`. The values of the selected segments are read
+              directly from its arrays, without creating the long dataframe.
             • A list combining any of the above types. In that case, all the dataframes will be merged sequentially.
 
     sampling_rate : int|str|float, optional
@@ -1673,17 +1887,32 @@ def mutual_information(experiment_or_dataframe, sampling_rate="auto", groups=Non
         calculated random permutations is then calculated, in order to calculate a z-score.
 
     n_jobs: int, optional
-        Max amount of jobs to run in parallel when computing the permutations. Setting this number higher can
-        drastically lower the computation time, but demand more resources. Set on -1 to use the maximum amount of
-        available cores (default: 1).
+        Max amount of jobs to run in parallel. The analysis of each individual and label, and the permutations, are
+        distributed over the same pool of jobs. Setting this number higher can drastically lower the computation
+        time, but demand more resources. Set on -1 to use the maximum amount of available cores (default: 1).
 
     parallel_prefer: str|None
         Soft hint to choose the default backend for the parallelization. Sets the parameter ``prefer`` from
         `joblib.Parallel<https://joblib.readthedocs.io/en/latest/generated/joblib.Parallel.html>`_.
 
+    checkpoint_folder: str|None, optional
+        If set, the path to a folder where the permutations of each individual and label are saved as soon as they are
+        calculated. When the function is run again with the same data and parameters (including ``random_seed``,
+        which must not be ``None``), the saved permutations are loaded instead of being calculated again: an
+        interrupted analysis thus resumes where it stopped. By default (``None``), no checkpoint is saved.
+
+    shard: tuple(int, int)|None, optional
+        If set, a tuple ``(i, n)`` to only compute the i-th of n shards of the permutations (with ``i`` going from 0 to
+        ``n - 1``), typically to spread a large number of permutations over several machines. ``random_seed`` must be
+        set and identical for all the shards. Each shard computes the analysis of the real data, and the same
+        ``number_of_randperms / n`` permutations of each individual and label as the full analysis would. The
+        returned Results then only contain the raw values of the shard, without plotting them: the shards must be
+        combined with :meth:`Results.merge`, which returns exactly the results of the analysis run at once. By default
+        (``None``), all the permutations are computed.
+
     n_neighbors: int, optional
-        Number of neighbors to use for mutual information estimation. This parameter is directly passed to
-        `sklearn <https://scikit-learn.org/1.5/modules/generated/sklearn.feature_selection.mutual_info_regression.html>`_.
+        Number of neighbors to use for mutual information estimation (see
+        `sklearn <https://scikit-learn.org/1.5/modules/generated/sklearn.feature_selection.mutual_info_regression.html>`_).
 
     scale: str | None, optional
         The scale to apply to the data before estimating the distances, or None. This value can be:
@@ -1697,6 +1926,16 @@ def mutual_information(experiment_or_dataframe, sampling_rate="auto", groups=Non
             • `"predictor"`: all the other variables are considered as targets
             • ``symmetric``: the average of the two previous calculations is returned.
 
+    method: str, optional
+        The estimator of the mutual information. Can be either:
+            • ``"ksg"`` (default): the Kraskov-Stögbauer-Grassberger estimator implemented in the toolbox. It follows
+              the steps of `mutual_info_regression <https://scikit-learn.org/1.5/modules/generated/sklearn.feature_selection.mutual_info_regression.html>`_
+              and returns the same values, apart from floating-point rounding differences, but scales and sorts the
+              target once for all the labels of an individual, and evaluates the permutations of each label and lag
+              in blocks.
+            • ``"sklearn"``: calls `mutual_info_regression <https://scikit-learn.org/1.5/modules/generated/sklearn.feature_selection.mutual_info_regression.html>`_
+              for each label, lag and permutation.
+
     random_seed : int|None, optional
         Fixes the seed for reproducible random permutations. Default: ``None``: the random permutations will change
         on each execution.
@@ -1783,22 +2022,28 @@ def mutual_information(experiment_or_dataframe, sampling_rate="auto", groups=Non
             • ``p_values`` contains the p-values of the analysis, if ``return_type`` was set on ``z-scores``.
             • ``plot_dictionary`` contains the plot dictionary that can be directly passed to ``plot_silhouette`` or
               ``plot_body_graphs``.
+
+        The results are :class:`LabelledArray` instances, that can be indexed as nested dictionaries
+        (``averages[target_measure][measure][series_value][label][lag]``), and contain all the values in a single
+        array (``averages.values``), with one axis per dimension.
     """
     return _common_analysis(experiment_or_dataframe=experiment_or_dataframe, analysis="mutual information",
-                            sampling_rate=sampling_rate, groups=groups, conditions=conditions, subjects=subjects,
-                            trials=trials, sequence_measure=sequence_measure, audio_measure=audio_measure,
+                            method=method, sampling_rate=sampling_rate, groups=groups, conditions=conditions,
+                            subjects=subjects, trials=trials, sequence_measure=sequence_measure,
+                            audio_measure=audio_measure,
                             target_measure=regression_with, series=series, average=average, lags=lags,
                             result_type=result_type, permutation_method=permutation_method,
                             number_of_randperms=number_of_randperms, n_neighbors=n_neighbors, mi_scale=scale,
                             mi_direction=direction, include_audio=include_audio, random_seed=random_seed, n_jobs=n_jobs,
-                            parallel_prefer=parallel_prefer, color_line_series=color_line_series,
-                            color_line_perm=color_line_perm, signif_style=signif_style, signif_alpha=signif_alpha,
-                            signif_tail=signif_tail, signif_direction=signif_direction, title=title,
+                            parallel_prefer=parallel_prefer, checkpoint_folder=checkpoint_folder, shard=shard,
+                            color_line_series=color_line_series, color_line_perm=color_line_perm,
+                            signif_style=signif_style, signif_alpha=signif_alpha, signif_tail=signif_tail,
+                            signif_direction=signif_direction, title=title,
                             line_width=line_width, verbosity=verbosity, **kwargs)
 
 def pca(data, n_components=0.95, groups=None, conditions=None, subjects=None, trials=None, labels="all",
         level="timestamp", sequence_measure="auto", audio_measure="auto", selected_components=None, random_seed=None,
-        nan_behaviour=0.1, verbosity=1, **kwargs):
+        nan_behaviour=0.1, batch_size=None, verbosity=1, **kwargs):
     """Performs a principal component analysis (PCA) on the measures from the experiment, reducing the dimensionality
     of the data. Each joint_label is used as a feature for the PCA, and, if specified, the audio measure too.
     Relies on the PCA function from
@@ -1821,11 +2066,17 @@ def pca(data, n_components=0.95, groups=None, conditions=None, subjects=None, tr
           generally generated from :meth:`Experiment.get_dataframe()`.
         • The path of a file containing a pandas DataFrame, generally generated from
           :class:`Experiment.save_dataframe()`.
+        • A :class:`SegmentedDataframe` instance, generally generated from
+          :meth:`Experiment.get_segmented_dataframe()`. The segments are filtered before being converted to a
+          dataframe.
         • A list combining any of the above types. In that case, all the dataframes will be merged sequentially.
         • A Subject instance, containing the data for a single subject.
         • A Trial instance, containing both Sequence and Audio data.
         • A Sequence instance, containing the data for a single sequence.
 
+        For an Experiment, a Subject, a Trial or a Sequence, the matrix of the PCA (one column per label) is built
+        directly from the arrays of the sequences and audio instances, without creating the dataframe.
+
     n_components: int|float|str|None, optional
         This parameter is passed to `scikit <https://scikit-learn.org/stable/modules/generated/sklearn.decomposition.PCA.html>`_.
         As such, the same rules apply:
@@ -1959,6 +2210,17 @@ def pca(data, n_components=0.95, groups=None, conditions=None, subjects=None, tr
             • ``"zero"``: the NaN values are replaced with 0.
             • ``None``: nothing is done. This will result in an error if NaN values are encountered.
 
+    batch_size: int|None, optional
+        If set, the PCA is computed out-of-core: instead of creating the dataframe of the data, the matrix of each
+        trial is built directly from the arrays of the Sequence and audio instances, and the PCA is fitted by batches
+        of ``batch_size`` timestamps with
+        `IncrementalPCA <https://scikit-learn.org/stable/modules/generated/sklearn.decomposition.IncrementalPCA.html>`_.
+        The memory used then depends on the size of a trial and of a batch, rather than on the size of the whole
+        experiment. This option requires ``level="timestamp"``, ``data`` to be an Experiment, a Subject, a Trial or a
+        Sequence, a single ``sequence_measure``, and ``n_components`` to be an integer, a float or ``None``. The
+        results are close to the ones of the default PCA (``None``), but may differ slightly, as the incremental fit
+        is an approximation. ``batch_size`` must be at least equal to the number of labels.
+
     Other parameters
     ~~~~~~~~~~~~~~~~
     .. rubric:: Parameters
@@ -1975,35 +2237,22 @@ def pca(data, n_components=0.95, groups=None, conditions=None, subjects=None, tr
     **kwargs: optional
         Additional arguments passed to :func:`_plot_components`.
     """
-    if isinstance(data, Sequence):
-        df = data.to_analysis_dataframe(measure=sequence_measure)
-    elif isinstance(data, Trial):
-        df = pd.DataFrame()
-        if data.has_sequence():
-            df = data.sequence.to_analysis_dataframe(measure=sequence_measure, trial=data.trial_id)
-        if data.has_audio():
-            if type(data.audio).__name__.lower() != audio_measure.lower():
-                raise Exception(f"The selected audio measure {audio_measure} does not match with the audio measure "
-                                f"present in the Trial instance ({type(data.audio)}.")
-            df = pd.concat([df, data.audio.to_analysis_dataframe(measure=audio_measure, trial=data.trial_id)],
-                           axis=0, ignore_index=True)
-    elif isinstance(data, Subject):
-        df = pd.DataFrame()
-        for trial in data.trials:
-            if trial.has_sequence():
-                df_seq = trial.sequence.to_analysis_dataframe(measure=sequence_measure, subject=data.name,
-                                                              trial=trial.trial_id)
-                df = pd.concat([df, df_seq], axis=0, ignore_index=True)
-            if trial.has_audio():
-                if type(trial.audio).__name__.lower() != audio_measure.lower():
-                    raise Exception(f"The selected audio measure {audio_measure} does not match with the audio measure "
-                                    f"present in the Trial instance ({type(trial.audio)}.")
-                df = pd.concat([df, trial.audio.to_analysis_dataframe(measure=audio_measure,
-                                                                      trial=trial.trial_id)], axis=0, ignore_index=True)
-    else:
-        df = data
+    if batch_size is not None:
+        if level != "timestamp":
+            raise ValueError("The parameter batch_size can only be used with level='timestamp'.")
+        pca_result, components, labels, explained_variance_ratio = _pca_incremental(
+            data, n_components, groups, conditions, subjects, trials, labels, sequence_measure, audio_measure,
+            nan_behaviour, batch_size, verbosity)
+
+        _plot_components(pca_result, components, labels, "PCA", selected_components, verbosity=verbosity, **kwargs)
+
+        pca_comps = [{l: c for l, c in zip(labels, comp)} for comp in components]
+        return pca_result, pca_comps, explained_variance_ratio
+
+    if level not in ("timestamp", "trial"):
+        raise ValueError(f"Invalid value for level: {level}.")
 
-    params = AnalysisParameters(analysis="pca", experiment_or_dataframe=df, groups=groups, conditions=conditions,
+    params = AnalysisParameters(analysis="pca", experiment_or_dataframe=data, groups=groups, conditions=conditions,
                                 trials = trials, sequence_measure=sequence_measure, audio_measure=audio_measure,
                                 result_type="pca", random_seed=random_seed, nan_behaviour=nan_behaviour,
                                 selected_components=selected_components, verbosity=verbosity, **kwargs)
@@ -2013,36 +2262,41 @@ def pca(data, n_components=0.95, groups=None, conditions=None, subjects=None, tr
     except ImportError:
         raise ModuleNotFoundException("sklearn", "calculate a PCA")
 
-    dataframe = _prepare_dataframe(params)
-    if labels == "all":
-        labels = list(dataframe["label"].unique())
+    if isinstance(data, (Experiment, Subject, Trial, Sequence)):
+        # The wide matrix is built directly from the arrays of the trials, without the long dataframe and its pivot
+        matrix, matrix_labels = _get_data_matrix(data, labels, sequence_measure, audio_measure, groups, conditions,
+                                                 subjects, trials, level)
+        data_matrix = pd.DataFrame(matrix, columns=matrix_labels)
 
-    # Keep only the labels of interest
-    dataframe_filtered = dataframe[dataframe["label"].isin(labels)].copy()
+    else:
+        dataframe = _prepare_dataframe(params)
+        if labels == "all":
+            labels = list(dataframe["label"].unique())
 
-    pca_model = PCA(n_components=n_components, random_state=params.random_seed)
+        # Keep only the labels of interest
+        dataframe_filtered = dataframe[dataframe["label"].isin(labels)].copy()
 
-    # Single subject/trial: fill the default columns
-    for col, default in [("subject", "_single_subject"), ("trial", "_single_trial")]:
-        if col not in dataframe_filtered.columns:
-            dataframe_filtered[col] = default
-        else:
-            if dataframe_filtered[col].isna().all():
+        # Single subject/trial: fill the default columns
+        for col, default in [("subject", "_single_subject"), ("trial", "_single_trial")]:
+            if col not in dataframe_filtered.columns:
                 dataframe_filtered[col] = default
             else:
-                dataframe_filtered[col] = dataframe_filtered[col].fillna(default)
+                if dataframe_filtered[col].isna().all():
+                    dataframe_filtered[col] = default
+                else:
+                    dataframe_filtered[col] = dataframe_filtered[col].fillna(default)
 
-    if level == "timestamp":
-        index = ["subject", "trial", "timestamp"]
-    elif level == "trial":
-        index = ["subject", "trial"]
-    else:
-        raise ValueError(f"Invalid value for level: {level}.")
+        if level == "timestamp":
+            index = ["subject", "trial", "timestamp"]
+        else:
+            index = ["subject", "trial"]
+
+        data_matrix = dataframe_filtered.pivot_table(index=index,
+                                                    columns="label",
+                                                    values="value",
+                                                    aggfunc="mean").sort_index()
 
-    data_matrix = dataframe_filtered.pivot_table(index=index,
-                                                columns="label",
-                                                values="value",
-                                                aggfunc="mean").sort_index()
+    pca_model = PCA(n_components=n_components, random_state=params.random_seed)
 
     # NaN handling
     if isinstance(nan_behaviour, str):
@@ -2099,6 +2353,8 @@ def pca(data, n_components=0.95, groups=None, conditions=None, subjects=None, tr
 
     pca_result = pca_model.fit_transform(data_matrix)
 
+    # The columns of the matrix are sorted, and some labels may have been dropped
+    labels = list(data_matrix.columns)
     _plot_components(pca_result, pca_model.components_, labels, "PCA", selected_components, verbosity=verbosity, **kwargs)
 
     pca_comps = [{l: c for l, c in zip(labels, comp)} for comp in pca_model.components_]
@@ -2115,7 +2371,7 @@ def ica(experiment_or_dataframe, n_components, group=None, condition=None, subje
 
     Parameters
     ----------
-    experiment_or_dataframe: Experiment, pandas.DataFrame, str or list(any).
+    experiment_or_dataframe: Experiment, Subject, Trial, Sequence, pandas.DataFrame, str or list(any).
         This parameter can be:
 
         • A :class:`Experiment` instance, containing the full dataset to be analyzed.
@@ -2123,7 +2379,14 @@ def ica(experiment_or_dataframe, n_components, group=None, condition=None, subje
           generally generated from :meth:`Experiment.get_dataframe()`.
         • The path of a file containing a pandas DataFrame, generally generated from
           :class:`Experiment.save_dataframe()`.
+        • A :class:`SegmentedDataframe` instance, generally generated from
+          :meth:`Experiment.get_segmented_dataframe()`. The segments are filtered before being converted to a
+          dataframe.
         • A list combining any of the above types. In that case, all the dataframes will be merged sequentially.
+        • A :class:`Subject`, a :class:`Trial` or a :class:`Sequence` instance.
+
+        For an Experiment, a Subject, a Trial or a Sequence, the matrix of the ICA is built directly from the arrays
+        of the sequences and audio instances, without creating the dataframe.
 
     n_components: int, optional
         The number of components to generate from the ICA.
@@ -2246,9 +2509,50 @@ def ica(experiment_or_dataframe, n_components, group=None, condition=None, subje
     except ImportError:
         raise ModuleNotFoundException("pandas", "calculate an ICA")
 
+    ica_ = FastICA(n_components=n_components)
+
+    if isinstance(experiment_or_dataframe, (Experiment, Subject, Trial, Sequence)):
+        # The matrix is built directly from the arrays of the trials, without the long dataframe
+        if verbosity > 0:
+            print("Preparing the data matrix...")
+        matrix, labels = _get_data_matrix(experiment_or_dataframe, "all", sequence_measure,
+                                          audio_measure if include_audio else None, group, condition, subjects, trials)
+        if verbosity > 0:
+            print("Done.")
+
+        # The audio is the first column, and only the timestamps having both an audio and a mocap value are kept
+        if "Audio" in labels:
+            audio_index = labels.index("Audio")
+            mocap_values = np.delete(matrix, audio_index, axis=1)
+            matrix = matrix[~np.isnan(matrix[:, audio_index]) & ~np.all(np.isnan(mocap_values), axis=1)]
+            order = [audio_index] + [i for i in range(len(labels)) if i != audio_index]
+            matrix = matrix[:, order]
+            labels = [audio_measure] + [labels[i] for i in order[1:]]
+
+        has_nans = np.any(np.isnan(matrix), axis=0)
+        if nan_behaviour == "ignore":
+            if verbosity > 0:
+                for label in np.array(labels)[has_nans]:
+                    print(f"Ignoring {label} as it contains nan values.")
+            matrix = matrix[:, ~has_nans]
+            labels = [label for label, has_nan in zip(labels, has_nans) if not has_nan]
+        elif nan_behaviour == "zero":
+            if verbosity > 0:
+                for label in np.array(labels)[has_nans]:
+                    print(f"Replacing some nan values from joint label {label} by 0.")
+            matrix = np.nan_to_num(matrix, nan=0)
+
+        ica_result = ica_.fit_transform(matrix)
+
+        if show_graph:
+            _plot_components(ica_result, ica_.components_, labels, "ICA", selected_components)
+
+        return ica_result
+
     # Get the full dataframe
     if verbosity > 0:
         print("Preparing the dataframe...")
+    experiment_or_dataframe = _filter_segments(experiment_or_dataframe, group, condition, subjects, trials)
     dataframe = _make_dataframe(experiment_or_dataframe, sequence_measure, audio_measure, sampling_frequency)
     dataframe = _filter_dataframe(dataframe, group, condition, subjects, trials)
     if verbosity > 0:
@@ -2258,7 +2562,6 @@ def ica(experiment_or_dataframe, n_components, group=None, condition=None, subje
     joint_labels = list(dataframe.loc[dataframe["modality"] == "mocap"]["label"].unique())
 
     ignored = []
-    ica_ = FastICA(n_components=n_components)
     i = 0
 
     data_matrix = {}
@@ -2302,14 +2605,92 @@ def ica(experiment_or_dataframe, n_components, group=None, condition=None, subje
     return ica_result
 
 
-def _prepare_dataframe(params):
-    """Prepares the dataframe by creating it if necessary, and filtering it.
+def _get_segment_arrays(segmented_dataframe, segments_measure, labels, segments_target=None):
+    """Returns the values of the labels of an individual, and the values of its target, from the segments of a
+    SegmentedDataframe. The values are the same as the ones extracted from the long dataframe by
+    :func:`_common_analysis`: the segments are concatenated in the order of the segment table, and if segments_target
+    is set, only the timestamps present in both the measure and the target segments of a trial are kept.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    segmented_dataframe: SegmentedDataframe
+        The SegmentedDataframe containing the segments.
+    segments_measure: pandas.DataFrame
+        The rows of the segment table for the measure of the individual.
+    labels: list(str)
+        The labels to return the values of.
+    segments_target: pandas.DataFrame|None, optional
+        The rows of the segment table for the target of the individual, or ``None`` if there is no target.
+
+    Returns
+    -------
+    dict(str: numpy.ndarray)
+        The values of each label.
+    numpy.ndarray|None
+        The values of the target, or ``None`` if segments_target is ``None``.
+    """
+    def _read_segments(segments):
+        for index, subject, trial, label in zip(segments.index, segments["subject"], segments["trial"],
+                                                segments["label"]):
+            yield (subject, trial), label, *segmented_dataframe.get_segment(index)
+
+    if segments_target is not None:
+        timestamps_measure = {}
+        timestamps_target = {}
+        for key, _, timestamps, _ in _read_segments(segments_measure):
+            timestamps_measure.setdefault(key, []).append(timestamps)
+        for key, _, timestamps, _ in _read_segments(segments_target):
+            timestamps_target.setdefault(key, []).append(timestamps)
+
+    def _matched_values(key, timestamps, values, other_timestamps):
+        if key not in other_timestamps:
+            return values[:0]
+        return values[np.isin(timestamps, np.concatenate(other_timestamps[key]))]
+
+    label_values = {label: [] for label in labels}
+    for key, label, timestamps, values in _read_segments(segments_measure):
+        if label in label_values:
+            if segments_target is not None:
+                values = _matched_values(key, timestamps, values, timestamps_target)
+            label_values[label].append(values)
+    label_arrays = {label: np.concatenate(values) if len(values) > 0 else np.array([])
+                    for label, values in label_values.items()}
+
+    if segments_target is None:
+        return label_arrays, None
+
+    target_values = [_matched_values(key, timestamps, values, timestamps_measure)
+                     for key, _, timestamps, values in _read_segments(segments_target)]
+    target_values = np.concatenate(target_values) if len(target_values) > 0 else np.array([])
+
+    return label_arrays, target_values
+
+
+def _prepare_dataframe(params, keep_segments=False):
+    """Prepares the dataframe by creating it if necessary, and filtering it. If keep_segments is ``True`` and the input
+    is a SegmentedDataframe, the filtered SegmentedDataframe is returned instead of the long dataframe.
 
     .. versionadded:: 2.0
     """
     if params.verbosity > 0:
         print("Preparing the dataframe...")
-    dataframe = _make_dataframe(params.experiment_or_dataframe, params.sequence_measure, params.audio_measure,
+    experiment_or_dataframe = _filter_segments(params.experiment_or_dataframe, params.groups, params.conditions,
+                                               params.subjects, params.trials)
+
+    if keep_segments and isinstance(experiment_or_dataframe, SegmentedDataframe):
+        if len(experiment_or_dataframe) == 0:
+            raise ValueError("The provided dataframe is empty, or the dataframe after applying the required filters "
+                             "(group, condition, subjects, trials) is empty. Please check your input parameters.")
+        if params.verbosity > 0:
+            print(f"Segmented dataframe ready ({len(experiment_or_dataframe.segments)} segments).")
+        if params.verbosity > 1:
+            print("\nShowing the first few segments...")
+            print(experiment_or_dataframe.segments.head(10))
+        return experiment_or_dataframe
+
+    dataframe = _make_dataframe(experiment_or_dataframe, params.sequence_measure, params.audio_measure,
                                 params.sampling_rate, params.verbosity, 1)
     dataframe = _filter_dataframe(dataframe, params.groups, params.conditions, params.subjects,
                                   params.trials, params.verbosity, 1)
@@ -2345,6 +2726,8 @@ def _make_dataframe(experiment_or_dataframe, sequence_measure, audio_measure, sa
           generally generated from :meth:`Experiment.get_dataframe()`.
         • The path of a file containing a pandas DataFrame, generally generated from
           :class:`Experiment.save_dataframe()`.
+        • A :class:`SegmentedDataframe` instance, generally generated from
+          :meth:`Experiment.get_segmented_dataframe()`.
         • A list combining any of the above types. In that case, all the dataframes will be merged sequentially.
 
     sequence_measure: str, optional
@@ -2429,9 +2812,11 @@ def _make_dataframe(experiment_or_dataframe, sequence_measure, audio_measure, sa
             dataframe_item = read_pandas_dataframe(item, verbosity, add_tabs + 1)
         elif type(item) is pd.DataFrame:
             dataframe_item = item
+        elif type(item) is SegmentedDataframe:
+            dataframe_item = item.to_dataframe()
         else:
-            raise Exception("One item in experiment_or_dataframe is neither an Experiment, a Pandas Dataframe or a "
-                            "path to a Pandas Dataframe.")
+            raise Exception("One item in experiment_or_dataframe is neither an Experiment, a Pandas Dataframe, a "
+                            "SegmentedDataframe or a path to a Pandas Dataframe.")
 
         if verbosity > 1:
             print(t+f"\tDataframe {i} with {dataframe_item.shape[1]} columns and {dataframe_item.shape[0]} rows.")
@@ -2449,6 +2834,19 @@ def _make_dataframe(experiment_or_dataframe, sequence_measure, audio_measure, sa
     return dataframe
 
 
+def _filter_segments(experiment_or_dataframe, group=None, condition=None, subjects=None, trials=None):
+    """If the input is a SegmentedDataframe, returns a SegmentedDataframe containing only the segments matching the
+    filters of :func:`_filter_dataframe`, so that only these segments are converted to the long dataframe. Any other
+    input is returned as-is.
+
+    .. versionadded:: 2.0
+    """
+    if isinstance(experiment_or_dataframe, SegmentedDataframe):
+        segments = _filter_dataframe(experiment_or_dataframe.segments, group, condition, subjects, trials, verbosity=0)
+        return experiment_or_dataframe.get_subset(segments)
+    return experiment_or_dataframe
+
+
 def _filter_dataframe(dataframe, group=None, condition=None, subjects=None, trials=None, verbosity=1,
                       add_tabs=1):
     """Returns a sub-dataframe containing only the data where the group, condition, subjects and trails match
@@ -2617,10 +3015,341 @@ def _filter_dataframe(dataframe, group=None, condition=None, subjects=None, tria
 
     return dataframe
 
+def _get_data_trials(data, groups=None, conditions=None, subjects=None, trials=None):
+    """Returns the trials of an Experiment, a Subject, a Trial or a Sequence, filtered as :func:`_filter_dataframe`
+    would filter the rows of the corresponding dataframe, and sorted by subject and trial.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    data: Experiment|Subject|Trial|Sequence
+        The data to get the trials from.
+    groups, conditions, subjects, trials: list|str|dict|None, optional
+        The filters of :func:`_filter_dataframe`.
+
+    Returns
+    -------
+    list(tuple)
+        For each trial, a tuple ``(subject_name, trial_id, sequence, audio)``. The subject name and the trial ID are
+        set on ``"_single_subject"`` and ``"_single_trial"`` if they are not defined, as in :func:`pca`.
+    """
+    if isinstance(data, Experiment):
+        items = [(subject.name, subject.group, trial) for subject in data.subjects.values()
+                 for trial in subject.trials.values()]
+    elif isinstance(data, Subject):
+        items = [(data.name, data.group, trial) for trial in data.trials.values()]
+    elif isinstance(data, Trial):
+        items = [(None, None, data)]
+    elif isinstance(data, Sequence):
+        items = [(None, None, Trial(None, None, data))]
+    else:
+        raise ValueError("The data must be an Experiment, a Subject, a Trial or a Sequence instance.")
+
+    def _matches(value, values):
+        return values is None or (value in values if isinstance(values, (tuple, list)) else value == values)
+
+    data_trials = []
+    for subject_name, group, trial in items:
+        if not (_matches(group, groups) and _matches(trial.condition, conditions) and
+                _matches(subject_name, subjects)):
+            continue
+        if isinstance(trials, dict):
+            trial_list = trials.get(subject_name, trials.get(group))
+            if trial_list is None or not _matches(trial.trial_id, trial_list):
+                continue
+        elif not _matches(trial.trial_id, trials):
+            continue
+
+        subject_name = subject_name if subject_name is not None else "_single_subject"
+        trial_id = trial.trial_id if trial.trial_id is not None else "_single_trial"
+        data_trials.append((subject_name, trial_id, trial.sequence, trial.audio))
+
+    if len(data_trials) == 0:
+        raise ValueError("The provided data is empty, or the data after applying the required filters (group, "
+                         "condition, subjects, trials) is empty. Please check your input parameters.")
+
+    return sorted(data_trials, key=lambda data_trial: (data_trial[0], data_trial[1]))
+
+
+def _get_trial_matrix(sequence, audio, labels, sequence_measure, audio_measure, align_end=False):
+    """Returns the values of a trial as a (timestamps, labels) matrix, as a pivot of the analysis dataframe of the
+    trial would: the rows are the sorted timestamps of all the labels, the missing values are NaN, and the rows
+    without any value are dropped.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    sequence: Sequence|None
+        The sequence of the trial.
+    audio: Audio|AudioDerivative|None
+        The audio of the trial.
+    labels: list(str)
+        The labels of the columns of the matrix (``"Audio"`` for the audio measure).
+    sequence_measure: str
+        The measure to get from the sequence (see :meth:`Sequence.get_measure`).
+    audio_measure: str|None
+        The audio measure. If the audio is an Audio instance and this measure is not ``"audio"``, the audio derivative
+        is calculated. If set on ``"auto"``, the audio is used as-is if it is an AudioDerivative, and ignored if it is
+        an Audio instance.
+    align_end: bool, optional
+        If ``True``, the measures of the sequence that have fewer values than timestamps (e.g. the velocity) are aligned
+        on the last timestamps, as in :meth:`Experiment.get_dataframe`. Otherwise (default), they are aligned on the
+        first timestamps, as in :meth:`Sequence.to_analysis_dataframe`.
+
+    Returns
+    -------
+    numpy.ndarray
+        The timestamps of the rows.
+    numpy.ndarray
+        The matrix of values, of shape ``(len(timestamps), len(labels))``.
+    """
+    columns = {}
+
+    if sequence is not None and any(label != "Audio" for label in labels):
+        sequence_values = sequence.get_measure(sequence_measure, verbosity=0)
+        timestamps = sequence.get_timestamps(relative=True)
+        for label, values in sequence_values.items():
+            if label in labels:
+                values = np.asarray(values, dtype=float)
+                if align_end:
+                    columns[label] = (timestamps[len(timestamps) - len(values):], values)
+                else:
+                    columns[label] = (timestamps[:len(values)], values)
+
+    if audio is not None and audio_measure == "auto" and type(audio) is Audio:
+        audio = None
+
+    if audio is not None and audio_measure is not None and "Audio" in labels:
+        if audio_measure == "auto":
+            pass
+        elif type(audio) is Audio and audio_measure != "audio":
+            audio = audio.get_derivative(audio_measure, verbosity=0)
+        elif type(audio).__name__.lower() != audio_measure.lower() and audio_measure not in ("f1", "f2", "f3", "f4",
+                                                                                              "f5"):
+            raise Exception(f"The selected audio measure {audio_measure} does not match with the audio measure "
+                            f"present in the Trial instance ({type(audio)}.")
+        columns["Audio"] = (np.asarray(audio.timestamps), np.asarray(audio.samples, dtype=float))
+
+    if len(columns) == 0:
+        return np.array([]), np.empty((0, len(labels)))
+
+    timestamps = np.unique(np.concatenate([column_timestamps for column_timestamps, _ in columns.values()]))
+    matrix = np.full((len(timestamps), len(labels)), np.nan)
+    for label, (column_timestamps, values) in columns.items():
+        matrix[np.searchsorted(timestamps, column_timestamps), labels.index(label)] = values
+
+    has_values = ~np.all(np.isnan(matrix), axis=1)
+    return timestamps[has_values], matrix[has_values]
+
+
+def _get_matrix_trials(data, labels, sequence_measure, audio_measure, groups, conditions, subjects, trials):
+    """Prepares the construction of the matrices of the trials of an Experiment, a Subject, a Trial or a Sequence
+    (see :func:`_get_trial_matrix`).
+
+    .. versionadded:: 2.0
+
+    Returns
+    -------
+    list(tuple)
+        The filtered trials (see :func:`_get_data_trials`).
+    list(str)
+        The labels of the columns, sorted as in a pivot table. If ``labels`` is ``"all"``, all the joint labels of the
+        sequences, and ``"Audio"`` if an audio measure is used; otherwise, the labels of ``labels`` present in the data.
+    str
+        The sequence measure.
+    str|None
+        The audio measure (``None`` if the audio is not used).
+    bool
+        Whether the measures of the sequences are aligned on the last timestamps (for an Experiment, as in
+        :meth:`Experiment.get_dataframe`).
+    """
+    if isinstance(sequence_measure, list):
+        if len(sequence_measure) != 1:
+            raise ValueError("Only one sequence measure can be used when the data is an Experiment, a Subject, a "
+                             "Trial or a Sequence instance.")
+        sequence_measure = sequence_measure[0]
+    if sequence_measure == "auto":
+        raise ValueError("The parameter sequence_measure cannot be set to 'auto' when the data is an Experiment, a "
+                         "Subject, a Trial or a Sequence instance.")
+    if audio_measure not in ["auto", "audio", "envelope", "intensity", "pitch", "f1", "f2", "f3", "f4", "f5"]:
+        audio_measure = None
+
+    data_trials = _get_data_trials(data, groups, conditions, subjects, trials)
+
+    all_labels = set()
+    for _, _, sequence, audio in data_trials:
+        if sequence is not None:
+            all_labels.update(sequence.get_joint_labels())
+        if audio is not None and audio_measure is not None and not (audio_measure == "auto" and type(audio) is Audio):
+            all_labels.add("Audio")
+    if labels == "all":
+        labels = sorted(all_labels)
+    else:
+        labels = sorted(label for label in all_labels if label in labels)
+
+    return data_trials, labels, sequence_measure, audio_measure, isinstance(data, Experiment)
+
+
+def _get_data_matrix(data, labels, sequence_measure, audio_measure, groups=None, conditions=None, subjects=None,
+                     trials=None, level="timestamp"):
+    """Returns the (samples, labels) matrix of the values of an Experiment, a Subject, a Trial or a Sequence, built
+    directly from the arrays of the sequences and audio instances of each trial, without creating the analysis
+    dataframe. The matrix is the same as the pivot table of the dataframe used by :func:`pca`: the rows are sorted by
+    subject, trial and timestamp, and the labels without any value are dropped.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    data: Experiment|Subject|Trial|Sequence
+        The data to build the matrix from.
+    labels: str|list(str)
+        ``"all"``, or the list of the labels to include.
+    sequence_measure: str|list(str)
+        The measure to get from the sequences.
+    audio_measure: str|None
+        The audio measure, or ``None`` to ignore the audio.
+    groups, conditions, subjects, trials: list|str|dict|None, optional
+        The filters of :func:`_filter_dataframe`.
+    level: str, optional
+        ``"timestamp"`` (default) for one row per timestamp, or ``"trial"`` for one row per trial, containing the mean
+        value of each label.
+
+    Returns
+    -------
+    numpy.ndarray
+        The matrix of values.
+    list(str)
+        The labels of the columns.
+    """
+    if level not in ("timestamp", "trial"):
+        raise ValueError(f"Invalid value for level: {level}.")
+
+    data_trials, labels, sequence_measure, audio_measure, align_end = _get_matrix_trials(
+        data, labels, sequence_measure, audio_measure, groups, conditions, subjects, trials)
+
+    rows = []
+    for _, _, sequence, audio in data_trials:
+        _, matrix = _get_trial_matrix(sequence, audio, labels, sequence_measure, audio_measure, align_end)
+        if level == "trial":
+            counts = np.sum(~np.isnan(matrix), axis=0)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                matrix = np.where(counts > 0, np.nansum(matrix, axis=0) / counts, np.nan).reshape(1, -1)
+            matrix = matrix[~np.all(np.isnan(matrix), axis=1)]
+        rows.append(matrix)
+
+    matrix = np.concatenate(rows) if len(rows) > 0 else np.empty((0, len(labels)))
+    has_values = ~np.all(np.isnan(matrix), axis=0)
+    return matrix[:, has_values], [label for label, has_value in zip(labels, has_values) if has_value]
+
+
+def _get_nan_rows_mask(matrix, nan_behaviour):
+    """Returns the mask of the rows to keep in a matrix for the given nan_behaviour, once the labels to drop have been
+    removed: the rows containing NaN values are dropped with ``"drop_timestamps"`` and with a proportion."""
+    if nan_behaviour in ("drop_timestamps", "drop_rows") or isinstance(nan_behaviour, (int, float)):
+        return ~np.isnan(matrix).any(axis=1)
+    return np.ones(len(matrix), dtype=bool)
+
+
+def _pca_incremental(data, n_components, groups, conditions, subjects, trials, labels, sequence_measure,
+                     audio_measure, nan_behaviour, batch_size, verbosity):
+    """Performs the timestamp-level PCA of :func:`pca` without building the dataframe of the data: the matrix of each
+    trial is built directly from the Sequence and audio arrays, and an IncrementalPCA is fitted on batches of
+    batch_size rows. The data is read three times (NaN count, fit, transform), so that only the matrix of one trial
+    and one batch are kept in memory at once, on top of the transformed values.
+
+    .. versionadded:: 2.0
+    """
+    try:
+        from sklearn.decomposition import IncrementalPCA
+    except ImportError:
+        raise ModuleNotFoundException("sklearn", "calculate a PCA")
+
+    if n_components == "mle":
+        raise ValueError("The parameter n_components cannot be set on 'mle' when batch_size is set.")
+
+    data_trials, matrix_labels, sequence_measure, audio_measure, align_end = _get_matrix_trials(
+        data, labels, sequence_measure, audio_measure, groups, conditions, subjects, trials)
+
+    def _trial_matrices(columns):
+        for _, _, trial_sequence, trial_audio in data_trials:
+            yield _get_trial_matrix(trial_sequence, trial_audio, matrix_labels, sequence_measure, audio_measure,
+                                    align_end)[1][:, columns]
+
+    # First pass: count the NaN values of each label
+    number_rows = 0
+    number_nans = np.zeros(len(matrix_labels), dtype=int)
+    for matrix in _trial_matrices(slice(None)):
+        number_rows += len(matrix)
+        number_nans += np.sum(np.isnan(matrix), axis=0)
+
+    if nan_behaviour in ("drop_labels", "drop_columns"):
+        keep_columns = number_nans == 0
+    elif isinstance(nan_behaviour, (int, float)) and not isinstance(nan_behaviour, bool):
+        if not (0 < nan_behaviour <= 1):
+            raise ValueError("nan_behaviour as a number must satisfy 0 < x <= 1.")
+        keep_columns = number_nans / max(number_rows, 1) <= nan_behaviour
+    elif nan_behaviour in (None, "drop_timestamps", "drop_rows", "zero", "0"):
+        keep_columns = np.ones(len(matrix_labels), dtype=bool)
+    else:
+        raise ValueError(f"Invalid value for nan_behaviour: {nan_behaviour}.")
+
+    # The labels without any value are not part of the matrix of the in-memory PCA either
+    has_values = number_nans < number_rows
+    dropped_labels = [label for label, keep, has_value in zip(matrix_labels, keep_columns, has_values)
+                      if has_value and not keep]
+    keep_columns &= has_values
+    labels = [label for label, keep in zip(matrix_labels, keep_columns) if keep]
+    columns = np.where(keep_columns)[0]
+    if verbosity > 0 and len(dropped_labels) > 0:
+        print(f"Dropped {len(dropped_labels)} label(s) containing NaNs: {', '.join(dropped_labels[:10])}"
+              f"{'...' if len(dropped_labels) > 10 else ''}")
+
+    def _clean_matrices():
+        for matrix in _trial_matrices(columns):
+            matrix = matrix[_get_nan_rows_mask(matrix, nan_behaviour)]
+            if nan_behaviour in ("zero", "0"):
+                matrix = np.nan_to_num(matrix, nan=0.0)
+            yield matrix
+
+    # Second pass: fit on batches of batch_size rows (the last batch takes the remaining rows)
+    pca_model = IncrementalPCA(n_components=n_components if isinstance(n_components, int) else None)
+    buffer = np.empty((0, len(labels)))
+    number_kept_rows = 0
+    for matrix in _clean_matrices():
+        number_kept_rows += len(matrix)
+        buffer = np.concatenate([buffer, matrix])
+        while len(buffer) >= 2 * batch_size:
+            pca_model.partial_fit(buffer[:batch_size])
+            buffer = buffer[batch_size:]
+    if len(buffer) > 0:
+        pca_model.partial_fit(buffer)
+    del buffer
+
+    if verbosity > 0 and number_kept_rows != number_rows:
+        print(f"Dropped {number_rows - number_kept_rows} row(s) containing NaNs.")
+
+    # Number of components explaining the requested proportion of variance, as in sklearn's PCA
+    number_components = len(pca_model.components_)
+    if isinstance(n_components, float):
+        ratio_cumsum = np.cumsum(pca_model.explained_variance_ratio_)
+        number_components = min(int(np.searchsorted(ratio_cumsum, n_components, side="right")) + 1,
+                                number_components)
+
+    # Third pass: transform the values of each trial
+    pca_result = np.concatenate([pca_model.transform(matrix)[:, :number_components] for matrix in _clean_matrices()])
+    components = pca_model.components_[:number_components]
+
+    return pca_result, components, labels, pca_model.explained_variance_ratio_[:number_components]
+
+
 def _compute_power_spectrum(method, measure_values, frequencies, sampling_rate):
 
     if frequencies is None:
-        frequencies, _ = signal.welch(np.zeros(1000), fs=sampling_rate)
+        # Frequencies returned by signal.welch with its default segment length (256 samples)
+        frequencies = sp_fft.rfftfreq(256, 1 / sampling_rate)
 
     if measure_values.size == 0:
         results = np.empty(len(frequencies))
@@ -2655,6 +3384,8 @@ def _resolve_lower_freq(frequencies, analysis_values, params, target_measure, me
     across all participants and labels. This ensures the fitting range starts cleanly above the hump for
     every participant and every joint, making slopes comparable across joints.
 
+    The spectra of all the participants and labels are inspected at once, on the array of ``analysis_values``.
+
     A warning is emitted if the auto-detected lower bound varies by more than
     ``params.background_lower_freq_warn_bins`` bins, as this may indicate inconsistent spectral shapes
     and suggests the user should set ``background_lower_freq`` explicitly.
@@ -2665,9 +3396,8 @@ def _resolve_lower_freq(frequencies, analysis_values, params, target_measure, me
     ----------
     frequencies : numpy.ndarray
         Frequency values in Hz, as returned by the power spectrum computation.
-    analysis_values : dict
-        Nested dictionary of individual power spectra, structured as
-        ``[target_measure][measure][series_value][individual][label][lag]``.
+    analysis_values : LabelledArray
+        Individual power spectra, indexed as ``[target_measure][measure][series_value][individual][label][lag]``.
     params : AnalysisParameters
         The analysis parameters object, from which ``background_lower_freq``,
         ``background_lower_freq_warn_bins``, ``individuals``, ``average``, and ``series`` are read.
@@ -2691,22 +3421,29 @@ def _resolve_lower_freq(frequencies, analysis_values, params, target_measure, me
     if params.background_lower_freq is not None:
         return params.background_lower_freq
 
+    # Spectra of all the participants and labels: (n_spectra, n_frequencies)
+    if params.average == params.series and params.average is not None:
+        individuals = [series_value]
+    else:
+        individuals = params.individuals
+    block = analysis_values.get_indices([target_measure, measure, series_value])
+    selection = np.ix_([analysis_values.get_index("individual", ind) for ind in individuals],
+                       [analysis_values.get_index("label", label) for label in labels_modality])
+    lag_index = analysis_values.get_index("lag", lag)
+    filled = analysis_values.filled[block][selection][:, :, lag_index]
+    spectra = analysis_values.values[block][selection][:, :, lag_index][filled]
+
     # Auto-detect peak bin per participant and per label
-    peak_indices = []
-    for label in labels_modality:
-        for ind in params.individuals:
-            if params.average == params.series and params.average is not None:
-                ind_spectrum = analysis_values[target_measure][measure][series_value][series_value][label][lag]
-            else:
-                ind_spectrum = analysis_values[target_measure][measure][series_value][ind][label][lag]
-            ind_valid = np.ones(len(frequencies), dtype=bool)
-            ind_valid[0] = False
-            ind_valid[-1] = False
-            ind_valid[ind_spectrum == 0] = False
-            ind_valid_indices = np.where(ind_valid)[0]
-            peak_in_valid = np.argmax(ind_spectrum[ind_valid])
-            lower_in_valid = min(peak_in_valid + 1, len(ind_valid_indices) - 2)
-            peak_indices.append(ind_valid_indices[lower_in_valid])
+    valid = np.ones(spectra.shape, dtype=bool)
+    valid[:, 0] = False
+    valid[:, -1] = False
+    valid[spectra == 0] = False
+    ranks_in_valid = np.cumsum(valid, axis=1) - 1
+    number_valid = np.sum(valid, axis=1)
+    peaks = np.argmax(np.where(valid, spectra, -np.inf), axis=1)
+    lower_in_valid = np.minimum(ranks_in_valid[np.arange(len(spectra)), peaks] + 1, number_valid - 2)
+    lower_in_valid = np.where(lower_in_valid < 0, lower_in_valid + number_valid, lower_in_valid)
+    peak_indices = np.argmax(valid & (ranks_in_valid == lower_in_valid[:, None]), axis=1)
 
     range_in_bins = max(peak_indices) - min(peak_indices)
     if range_in_bins > params.background_lower_freq_warn_bins:
@@ -2720,7 +3457,57 @@ def _resolve_lower_freq(frequencies, analysis_values, params, target_measure, me
     return frequencies[max(peak_indices)]
 
 
-def _fit_spectral_background(frequencies, power, background_lower_freq, signif_alpha=0.05, signif_tail="1"):
+def _fit_spectral_background_lines(frequencies, powers, background_lower_freqs):
+    """Fits the lines of :func:`_fit_spectral_background` for several power spectra at once, with a least-squares fit
+    in log-log space vectorized across the spectra.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    frequencies : np.ndarray
+        Frequency values (Hz). Must start at 0 (DC bin included).
+    powers : np.ndarray
+        Power spectral density values, with one spectrum per row.
+    background_lower_freqs : list(float)
+        The lower frequency bound (in Hz) of the fit, for each spectrum.
+
+    Returns
+    -------
+    np.ndarray
+        The slopes of the lines, for each spectrum (NaN if fewer than 2 bins are available for the fit).
+    np.ndarray
+        The intercepts of the lines, for each spectrum.
+    """
+    frequencies = np.asarray(frequencies, dtype=float)
+    powers = np.asarray(powers, dtype=float)
+
+    # Same bins as in _fit_spectral_background: valid bins at or above the lower bound
+    fit_mask = np.ones(powers.shape, dtype=bool)
+    fit_mask[:, 0] = False
+    fit_mask[:, -1] = False
+    fit_mask[powers == 0] = False
+    lower_indices = np.searchsorted(frequencies, background_lower_freqs)
+    fit_mask &= np.arange(len(frequencies)) >= lower_indices[:, None]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_freq = np.where(fit_mask, np.log10(frequencies), 0)
+        log_power = np.where(fit_mask, np.log10(np.where(fit_mask, powers, 1)), 0)
+        number_bins = np.sum(fit_mask, axis=1)
+        mean_log_freq = np.sum(log_freq, axis=1) / number_bins
+        mean_log_power = np.sum(log_power, axis=1) / number_bins
+        centered_log_freq = np.where(fit_mask, log_freq - mean_log_freq[:, None], 0)
+        centered_log_power = np.where(fit_mask, log_power - mean_log_power[:, None], 0)
+        slopes = np.sum(centered_log_freq * centered_log_power, axis=1) / np.sum(centered_log_freq ** 2, axis=1)
+        intercepts = mean_log_power - slopes * mean_log_freq
+
+    slopes[number_bins < 2] = np.nan
+    intercepts[number_bins < 2] = np.nan
+    return slopes, intercepts
+
+
+def _fit_spectral_background(frequencies, power, background_lower_freq, signif_alpha=0.05, signif_tail="1",
+                             line=None):
     """Fit a 1/f background model to a power spectrum in log-log space and identify peaks as positive residuals above
     a significance threshold derived from the fit.
 
@@ -2739,6 +3526,9 @@ def _fit_spectral_background(frequencies, power, background_lower_freq, signif_a
         Significance level for peak detection (default: 0.05).
     signif_tail : str, optional
         Whether to use a one-tailed (``"1"``) or two-tailed (``"2"``) test (default: ``"1"``).
+    line : tuple(float, float)|None, optional
+        The slope and the intercept of the line in log-log space, if they have already been fitted (see
+        :func:`_fit_spectral_background_lines`). By default (``None``), the line is fitted with ``numpy.polyfit``.
 
     Returns
     -------
@@ -2793,7 +3583,10 @@ def _fit_spectral_background(frequencies, power, background_lower_freq, signif_a
         raise ValueError(f"Fewer than 2 bins available for fitting above {lower_freq_used} Hz.")
 
     # Fit line in log-log space
-    slope, intercept = np.polyfit(log_freq[fit_mask], log_power[fit_mask], 1)
+    if line is None:
+        slope, intercept = np.polyfit(log_freq[fit_mask], log_power[fit_mask], 1)
+    else:
+        slope, intercept = line
 
     # Evaluate background across all valid bins
     log_background_valid = slope * log_freq + intercept
@@ -2873,7 +3666,7 @@ def _compute_correlation(pg, method, measure_values, target_values):
             results = np.abs(pg.corr(x=measure_values, y=target_values).values[0][1])
         except (ValueError, AssertionError):
             results = np.nan
-    elif method == "numpy":
+    elif method in ("numpy", "fft"):
         measure_values_mean = np.mean(measure_values)
         target_values_mean = np.mean(target_values)
         num = np.sum((measure_values - measure_values_mean) * (target_values - target_values_mean))
@@ -2885,11 +3678,94 @@ def _compute_correlation(pg, method, measure_values, target_values):
             results = np.nan
     else:
         raise ValueError(f"""When computing a correlation, the parameter method (current value: {method} must 
-                         be "pingouin" or "numpy".""")
+                         be "pingouin", "numpy" or "fft".""")
+
+    return results
+
+
+def _compute_correlation_lags(measure_values, target_values, lags, sampling_rate):
+    """Returns a dictionary mapping each lag to the Pearson correlation between the measure values and the target
+    values trimmed for this lag, as calculated by _compute_correlation with the "numpy" method. The sums of products
+    for all the lags are obtained from a single FFT-based cross-correlation, and the sums and sums of squares of the
+    trimmed arrays from cumulative sums."""
+    measure_values = np.asarray(measure_values, dtype=float)
+    target_values = np.asarray(target_values, dtype=float)
+    n = measure_values.size
+    samples = {lag: int(np.round(lag * sampling_rate)) for lag in lags}
+
+    # With NaNs, the cross-correlation would be NaN for all the lags: we fall back on the lag-by-lag calculation
+    if n == 0 or np.isnan(measure_values).any() or np.isnan(target_values).any():
+        results = {}
+        for lag, sample in samples.items():
+            if sample >= 0:
+                results[lag] = _compute_correlation(None, "numpy", measure_values[:n - sample], target_values[sample:])
+            else:
+                results[lag] = _compute_correlation(None, "numpy", measure_values[-sample:], target_values[:n + sample])
+        return results
+
+    # Centering on the global means does not change the correlations, but limits the cancellation errors
+    x = measure_values - np.mean(measure_values)
+    y = target_values - np.mean(target_values)
+
+    # cross_products[k] = sum(x[t] * y[t + k]), negative lags being wrapped at the end of the array
+    nfft = sp_fft.next_fast_len(2 * n - 1, real=True)
+    cross_products = sp_fft.irfft(np.conj(sp_fft.rfft(x, nfft)) * sp_fft.rfft(y, nfft), nfft)
+
+    cumsum_x = np.concatenate(([0], np.cumsum(x)))
+    cumsum_y = np.concatenate(([0], np.cumsum(y)))
+    cumsum_x2 = np.concatenate(([0], np.cumsum(x ** 2)))
+    cumsum_y2 = np.concatenate(([0], np.cumsum(y ** 2)))
+
+    results = {}
+    for lag, sample in samples.items():
+        m = n - abs(sample)
+        if m <= 0:
+            results[lag] = np.nan
+            continue
+
+        if sample >= 0:
+            start_x, end_x, start_y, end_y = 0, m, sample, n
+        else:
+            start_x, end_x, start_y, end_y = -sample, n, 0, m
+
+        sum_x = cumsum_x[end_x] - cumsum_x[start_x]
+        sum_y = cumsum_y[end_y] - cumsum_y[start_y]
+        num = cross_products[sample] - sum_x * sum_y / m
+        var_x = max(cumsum_x2[end_x] - cumsum_x2[start_x] - sum_x ** 2 / m, 0)
+        var_y = max(cumsum_y2[end_y] - cumsum_y2[start_y] - sum_y ** 2 / m, 0)
+        denom = np.sqrt(var_x * var_y)
+
+        if denom != 0:
+            results[lag] = num / denom
+        else:
+            results[lag] = np.nan
 
     return results
 
 
+def _compute_correlation_shifts(measure_values, target_values, shifts):
+    """Returns the Pearson correlations (as calculated by _compute_correlation with the "numpy" method) between
+    np.roll(measure_values, shift) and target_values, for each of the shifts. The correlations for all the circular
+    shifts are obtained from a single FFT, as rolling the measure values does not change their mean and variance."""
+    measure_values = np.asarray(measure_values, dtype=float)
+    target_values = np.asarray(target_values, dtype=float)
+    n = measure_values.size
+
+    if n == 0:
+        return [np.nan] * len(shifts)
+
+    x = measure_values - np.mean(measure_values)
+    y = target_values - np.mean(target_values)
+
+    # circular_products[k] = sum(np.roll(x, k) * y)
+    circular_products = sp_fft.irfft(np.conj(sp_fft.rfft(x)) * sp_fft.rfft(y), n)
+    denom = np.sqrt(np.sum(x ** 2) * np.sum(y ** 2))
+
+    if denom == 0:
+        return [np.nan] * len(shifts)
+    return list(circular_products[np.asarray(shifts, dtype=int)] / denom)
+
+
 def _compute_coherence(measure_values, target_values, frequencies, sampling_rate, nperseg,
                        target_psd=None, measure_psd=None):
     if target_psd is not None and measure_psd is not None:
@@ -2919,6 +3795,75 @@ def _compute_coherence(measure_values, target_values, frequencies, sampling_rate
 
     return frequencies, coh
 
+
+def _get_segment_spectra(values, sampling_rate, nperseg):
+    """Returns the frequencies and the spectra of the segments of values (1D or 2D, along the last axis), segmented as
+    in signal.welch: Hann window, half-overlapping segments of nperseg samples (or of the length of the signal if it is
+    shorter), and removal of the mean of each segment. The spectra have a shape (..., n_segments, n_frequencies)."""
+    values = np.asarray(values, dtype=float)
+    nperseg = min(int(nperseg), values.shape[-1])
+    step = nperseg - nperseg // 2
+
+    segments = np.lib.stride_tricks.sliding_window_view(values, nperseg, axis=-1)[..., ::step, :]
+    segments = segments - np.mean(segments, axis=-1, keepdims=True)
+    spectra = sp_fft.rfft(segments * signal.get_window("hann", nperseg), axis=-1)
+
+    return sp_fft.rfftfreq(nperseg, 1 / sampling_rate), spectra
+
+
+def _compute_coherence_spectra(measure_spectra, target_spectra):
+    """Returns the coherence between the signals from their segment spectra (see _get_segment_spectra), as
+    signal.coherence would: the shape of target_spectra must be broadcastable to the shape of measure_spectra. The
+    scaling factors of the Welch densities cancel out in the ratio, and are not applied."""
+    pxy = np.mean(np.conj(measure_spectra) * target_spectra, axis=-2)
+    pxx = np.mean(np.abs(measure_spectra) ** 2, axis=-2)
+    pyy = np.mean(np.abs(target_spectra) ** 2, axis=-2)
+    denom = pxx * pyy
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(denom > 0, np.abs(pxy) ** 2 / denom, np.nan)
+
+
+def _compute_individual_coherences(label_arrays, target_values, lags, sampling_rate, nperseg):
+    """Computes the coherences of all the labels of an individual with the target, across all lags. For each lag,
+    the segment spectra of the target are calculated once, and the segment spectra of the labels are calculated on
+    (n_labels, n_samples) matrices of at most _BATCH_PERMS_MAX_ELEMENTS values. Returns the frequencies (of the first
+    lag) and a dictionary mapping each label to a dictionary mapping each lag to the coherence."""
+    labels = list(label_arrays.keys())
+    n = target_values.size
+    block_size = max(1, _BATCH_PERMS_MAX_ELEMENTS // max(n, 1))
+
+    frequencies = None
+    results_by_label = {label: {} for label in labels}
+
+    for lag in lags:
+        # Trim the arrays for the given lag
+        sample = int(np.round(lag * sampling_rate))
+        if sample > 0:
+            measure_slice, target_values_lag = slice(None, n - sample), target_values[sample:]
+        elif sample == 0:
+            measure_slice, target_values_lag = slice(None), target_values
+        else:
+            measure_slice, target_values_lag = slice(-sample, None), target_values[:n + sample]
+
+        if target_values_lag.size == 0:
+            for label in labels:
+                results_by_label[label][lag] = np.tile(np.nan, int(nperseg // 2 + 1))
+            continue
+
+        freqs, target_spectra = _get_segment_spectra(target_values_lag, sampling_rate, nperseg)
+        if frequencies is None:
+            frequencies = freqs
+
+        for start in range(0, len(labels), block_size):
+            block_labels = labels[start:start + block_size]
+            measure_values_lag = np.stack([label_arrays[label][measure_slice] for label in block_labels])
+            _, measure_spectra = _get_segment_spectra(measure_values_lag, sampling_rate, nperseg)
+            for label, coherence in zip(block_labels, _compute_coherence_spectra(measure_spectra, target_spectra)):
+                results_by_label[label][lag] = coherence
+
+    return frequencies, results_by_label
+
 def _compute_mutual_information(mi, sc, measure_values, target_values, random_state, n_neighbors, scale, direction):
 
     if scale:
@@ -2946,23 +3891,261 @@ def _compute_mutual_information(mi, sc, measure_values, target_values, random_st
     return result
 
 
+def _scale_mutual_information_values(values, scale):
+    """Scales the values (1D, or 2D with one signal per row) as _compute_mutual_information does with the StandardScaler
+    or the MinMaxScaler (if scale is set), then divides them by their standard deviation, as mutual_info_regression
+    does. The constant signals are not divided."""
+    values = np.asarray(values, dtype=float)
+
+    if scale == "standard":
+        std = np.std(values, axis=-1, keepdims=True)
+        values = (values - np.mean(values, axis=-1, keepdims=True)) / np.where(std == 0, 1, std)
+    elif scale == "minmax":
+        value_range = np.ptp(values, axis=-1, keepdims=True)
+        values = (values - np.min(values, axis=-1, keepdims=True)) / np.where(value_range == 0, 1, value_range)
+
+    std = np.std(values, axis=-1, keepdims=True)
+    return values / np.where(std == 0, 1, std)
+
+
+def _add_mutual_information_noise(values, noise):
+    """Adds the small noise advised by Kraskov et al. (2004) to the scaled values, with the amplitude used by
+    mutual_info_regression."""
+    return values + 1e-10 * np.maximum(1, np.mean(np.abs(values), axis=-1, keepdims=True)) * noise
+
+
+def _count_marginal_neighbours(values, radii):
+    """For each point of each row of values, counts the other points of the row at a distance lower than or equal to
+    the radius of the point (radii has one row per row of values), as the KDTree of mutual_info_regression does. The
+    distances to the points are compared to the radius: the bounds v - r and v + r are rounded, and a binary search on
+    them would count the neighbours excluded by the radius. If values is 1D, it is shared by all the rows of radii and
+    its tree is only built once."""
+    if values.ndim == 1:
+        points = values[:, None]
+        tree = spatial.cKDTree(points)
+        return np.array([tree.query_ball_point(points, row_radii, p=np.inf, return_length=True) - 1
+                         for row_radii in radii])
+
+    counts = np.empty(radii.shape, dtype=int)
+    for i, row in enumerate(values):
+        points = row[:, None]
+        counts[i] = spatial.cKDTree(points).query_ball_point(points, radii[i], p=np.inf, return_length=True) - 1
+    return counts
+
+
+def _compute_ksg(x, y, n_neighbors):
+    """Returns the mutual information between each row of x and y, estimated with the Kraskov-Stögbauer-Grassberger
+    estimator, as in mutual_info_regression. x and y are 1D (shared by all the rows) or 2D arrays of noisy scaled
+    values, and at least one of them is 2D."""
+    n_rows = max(len(x) if x.ndim == 2 else 1, len(y) if y.ndim == 2 else 1)
+    n = x.shape[-1]
+    x_rows = np.broadcast_to(x, (n_rows, n))
+    y_rows = np.broadcast_to(y, (n_rows, n))
+
+    # Distance to the k-th neighbour in the joint space, for the maximum norm
+    radii = np.empty((n_rows, n))
+    for i in range(n_rows):
+        points = np.column_stack((x_rows[i], y_rows[i]))
+        distances, _ = spatial.cKDTree(points).query(points, k=n_neighbors + 1, p=np.inf)
+        radii[i] = np.nextafter(distances[:, -1], 0)
+
+    nx = _count_marginal_neighbours(x, radii)
+    ny = _count_marginal_neighbours(y, radii)
+
+    mi = (special.digamma(n) + special.digamma(n_neighbors) - np.mean(special.digamma(nx + 1), axis=1) -
+          np.mean(special.digamma(ny + 1), axis=1))
+    return np.maximum(mi, 0)
+
+
+def _compute_mutual_information_ksg(measure_values, target_values, random_state, n_neighbors, scale, direction):
+    """Native version of _compute_mutual_information: returns the mutual information between each row of
+    measure_values (2D) and target_values (1D). The target is scaled once for all the rows and, when random_state is
+    set, the noise is drawn once, as mutual_info_regression draws the same noise for each call; the marginal
+    neighbours of the target are then counted with a single KD-tree, shared by all the rows (see
+    _count_marginal_neighbours)."""
+    measure_values = _scale_mutual_information_values(measure_values, scale)
+    target_values = _scale_mutual_information_values(target_values, scale)
+    n = target_values.size
+
+    if n <= n_neighbors:
+        return np.full(len(measure_values), np.nan)
+
+    # Noise of the predictor (drawn first) and of the target, as in mutual_info_regression
+    if random_state is not None:
+        rng = np.random.RandomState(random_state)
+        noise_predictor, noise_target = rng.standard_normal(n), rng.standard_normal(n)
+    else:
+        noise_predictor, noise_target = np.random.standard_normal((2,) + measure_values.shape)
+
+    results = []
+    if direction != "predictor":
+        results.append(_compute_ksg(_add_mutual_information_noise(measure_values, noise_predictor),
+                                    _add_mutual_information_noise(target_values, noise_target), n_neighbors))
+    if direction != "target":
+        results.append(_compute_ksg(_add_mutual_information_noise(target_values, noise_predictor),
+                                    _add_mutual_information_noise(measure_values, noise_target), n_neighbors))
+
+    return np.mean(results, axis=0)
+
+
+def _compute_individual_mutual_information(label_arrays, target_values, lags, sampling_rate, random_state,
+                                           n_neighbors, mi_scale, mi_direction):
+    """Computes the mutual information of all the labels of an individual with the target, across all lags, with the
+    native estimator (_compute_mutual_information_ksg). For each lag, the labels are stacked in (n_labels, n_samples)
+    matrices of at most _BATCH_PERMS_MAX_ELEMENTS values. Returns None (no frequencies) and a dictionary mapping each
+    label to a dictionary mapping each lag to the mutual information."""
+    labels = list(label_arrays.keys())
+    n = target_values.size
+    block_size = max(1, _BATCH_PERMS_MAX_ELEMENTS // max(n, 1))
+    results_by_label = {label: {} for label in labels}
+
+    for lag in lags:
+        # Trim the arrays for the given lag
+        sample = int(np.round(lag * sampling_rate))
+        if sample > 0:
+            measure_slice, target_values_lag = slice(None, n - sample), target_values[sample:]
+        elif sample == 0:
+            measure_slice, target_values_lag = slice(None), target_values
+        else:
+            measure_slice, target_values_lag = slice(-sample, None), target_values[:n + sample]
+
+        for start in range(0, len(labels), block_size):
+            block_labels = labels[start:start + block_size]
+            measure_values_lag = np.stack([label_arrays[label][measure_slice] for label in block_labels])
+            results = _compute_mutual_information_ksg(measure_values_lag, target_values_lag, random_state,
+                                                      n_neighbors, mi_scale, mi_direction)
+            for label, result in zip(block_labels, results):
+                results_by_label[label][lag] = result
+
+    return None, results_by_label
+
+
+def _compute_label_analysis(measure_values, target_values, lags, sampling_rate, analysis, method, nperseg,
+                            random_seed, n_neighbors, mi_scale, mi_direction):
+    """Computes the analysis of the real data for a single label, across all lags. Returns the frequencies (or None
+    for the analyses in the time domain) and a dictionary mapping each lag to the results."""
+    pg = mi = sc = None
+    if analysis == "correlation" and method == "pingouin":
+        import pingouin as pg
+    elif analysis == "mutual information":
+        from sklearn.feature_selection import mutual_info_regression as mi
+        if mi_scale == "standard":
+            from sklearn.preprocessing import StandardScaler
+            sc = StandardScaler()
+        elif mi_scale == "minmax":
+            from sklearn.preprocessing import MinMaxScaler
+            sc = MinMaxScaler()
+
+    # Lag scan: the correlations for all the lags are obtained from a single FFT
+    if analysis == "correlation" and method == "fft":
+        return None, _compute_correlation_lags(measure_values, target_values, lags, sampling_rate)
+
+    frequencies = None
+    results_by_lag = {}
+
+    for lag in lags:
+        # Trim the arrays for the given lag
+        sample = int(np.round(lag * sampling_rate))
+        n = measure_values.size
+
+        if sample > 0:
+            measure_values_lag = measure_values[:n - sample]
+        elif sample == 0:
+            measure_values_lag = measure_values
+        else:
+            measure_values_lag = measure_values[-sample:]
+
+        if target_values is not None:
+            if sample > 0:
+                target_values_lag = target_values[sample:]
+            elif sample == 0:
+                target_values_lag = target_values
+            else:
+                target_values_lag = target_values[:n + sample]
+        else:
+            target_values_lag = None
+
+        if analysis == "power spectrum":
+            frequencies, results = _compute_power_spectrum(method, measure_values_lag, frequencies, sampling_rate)
+        elif analysis == "correlation":
+            results = _compute_correlation(pg, method, measure_values_lag, target_values_lag)
+        elif analysis == "coherence":
+            frequencies, results = _compute_coherence(measure_values_lag, target_values_lag, frequencies,
+                                                      sampling_rate, nperseg)
+        elif analysis == "mutual information":
+            results = _compute_mutual_information(mi, sc, measure_values_lag, target_values_lag, random_seed,
+                                                  n_neighbors, mi_scale, mi_direction)
+        else:
+            raise Exception("Invalid value for the parameter analysis. Choose either 'power spectrum', "
+                            "'correlation', 'coherence' or 'mutual information'.")
+
+        results_by_lag[lag] = results
+
+    return frequencies, results_by_lag
+
+
+def _compute_individual_power_spectra(label_arrays, lags, sampling_rate, method):
+    """Computes the power spectra of all the labels of an individual, across all lags. The labels having the same
+    number of samples are stacked in a (n_labels, n_samples) matrix, so that each lag requires a single call to
+    _compute_power_spectrum_batch per array length. Returns the frequencies and a dictionary mapping each label to a
+    dictionary mapping each lag to the power spectrum."""
+    labels_by_size = {}
+    for label, values in label_arrays.items():
+        labels_by_size.setdefault(values.size, []).append(label)
+
+    frequencies = None
+    results_by_label = {label: {} for label in label_arrays}
+
+    for n, labels in labels_by_size.items():
+        stacked_values = np.stack([label_arrays[label] for label in labels]).astype(float)
+
+        for lag in lags:
+            # Trim the arrays for the given lag
+            sample = int(np.round(lag * sampling_rate))
+            if sample > 0:
+                stacked_values_lag = stacked_values[:, :n - sample]
+            elif sample == 0:
+                stacked_values_lag = stacked_values
+            else:
+                stacked_values_lag = stacked_values[:, -sample:]
+
+            frequencies, results = _compute_power_spectrum_batch(method, stacked_values_lag, frequencies,
+                                                                 sampling_rate)
+            for label, result in zip(labels, results):
+                results_by_label[label][lag] = result
+
+    return frequencies, results_by_label
+
+
 def _compute_label_perms(parent_seed, number_of_randperms, measure_values,
                           target_values, lags, sampling_rate,
                           permutation_method, analysis, method,
                           nperseg, frequencies,
                           precomputed_perms_by_lag,
-                          random_seed, n_neighbors, mi_scale, mi_direction):
+                          random_seed, n_neighbors, mi_scale, mi_direction, permutation_engine="loop",
+                          label_arrays=None, perm_labels=None, perm_range=None):
     """Compute all permutations for a single label, across all lags.
-    measure_psd is computed once and reused across all lags (valid for shift permutations).
+    The power spectrum, coherence and native mutual information permutations are always evaluated in batched calls per
+    lag (see _compute_batch_perms); with permutation_engine="batch", the correlation permutations are evaluated the
+    same way.
+    When the label permutations have different lengths, the coherence permutations are calculated one by one, and
+    measure_psd is computed once and reused across all lags.
+    For label permutations, perm_labels contains the label drawn for each permutation, and label_arrays the values of
+    all the labels of the individual.
+    If perm_range is set, only the permutations with an index in [perm_range[0], perm_range[1]) are computed (see the
+    parameter shard): their seeds are the same as when all the permutations are computed.
     """
+    if precomputed_perms_by_lag is None and perm_labels is not None:
+        precomputed_perms_by_lag = _get_label_perms_by_lag(label_arrays, perm_labels, measure_values.size, lags,
+                                                           sampling_rate)
+
     rng = np.random.default_rng(parent_seed)
     child_seeds = rng.integers(0, 2**31, size=number_of_randperms)
+    if perm_range is not None:
+        child_seeds = child_seeds[perm_range[0]:perm_range[1]]
 
-    # Precompute measure_psd once for this label (valid across all lags for shift perms,
-    # since Pxx(roll(x, k)) == Pxx(x) exactly)
-    if (analysis == "coherence" and
-            permutation_method in ("shift", "phase", "label") and
-            nperseg is not None):
+    # Precompute measure_psd once for this label, for the label permutations calculated one by one
+    if analysis == "coherence" and permutation_method == "label" and nperseg is not None:
         _, measure_psd = signal.welch(measure_values, fs=sampling_rate, nperseg=int(nperseg))
     else:
         measure_psd = None
@@ -2983,18 +4166,39 @@ def _compute_label_perms(parent_seed, number_of_randperms, measure_values,
             measure_values_lag = measure_values[-sample:]
             target_values_lag = target_values[:n + sample]
 
+        precomputed_perms = precomputed_perms_by_lag.get(lag) if precomputed_perms_by_lag else None
+
+        # With the FFT correlation, the correlations of all the circular shifts come from a single FFT
+        if (analysis == "correlation" and method == "fft" and permutation_method == "shift" and
+                precomputed_perms is None and not np.isnan(measure_values_lag).any() and
+                not np.isnan(target_values_lag).any()):
+            m = len(measure_values_lag)
+            shifts = [np.random.default_rng(seed).integers(1, m) if m > 1 else 0 for seed in child_seeds]
+            results_by_lag[lag] = _compute_correlation_shifts(measure_values_lag, target_values_lag, shifts)
+            continue
+
+        # The permutations of the power spectrum, of the coherence and of the native mutual information are always
+        # stacked, as the real analysis (see _compute_individual_power_spectra, _compute_individual_coherences and
+        # _compute_individual_mutual_information)
+        batched_analysis = (analysis in ("power spectrum", "coherence") or
+                            (analysis == "mutual information" and method == "ksg") or
+                            (analysis == "correlation" and permutation_engine == "batch"))
+        if (batched_analysis and
+                (precomputed_perms is None or all(len(perm) == len(measure_values_lag) for perm in precomputed_perms))):
+            results_by_lag[lag] = _compute_batch_perms(child_seeds, measure_values_lag, target_values_lag,
+                                                       permutation_method, analysis, method, sampling_rate, nperseg,
+                                                       frequencies, precomputed_perms, random_seed, n_neighbors, mi_scale,
+                                                       mi_direction)
+            continue
+
         # Precompute target_psd per lag (target trimming does change with lag)
-        if (analysis == "coherence" and
-                permutation_method in ("shift", "phase", "label") and
-                nperseg is not None and target_values_lag is not None):
+        if analysis == "coherence" and measure_psd is not None:
             _, target_psd = signal.welch(target_values_lag, fs=sampling_rate, nperseg=int(nperseg))
         else:
             target_psd = None
 
-        precomputed_perms = precomputed_perms_by_lag.get(lag) if precomputed_perms_by_lag else None
-
         perm_list = []
-        for p in range(number_of_randperms):
+        for p in range(len(child_seeds)):
             perm_values = _compute_one_perm(
                 seed=child_seeds[p],
                 measure_values_lag=measure_values_lag,
@@ -3020,9 +4224,90 @@ def _compute_label_perms(parent_seed, number_of_randperms, measure_values,
     return results_by_lag
 
 
-def _compute_one_perm(seed, measure_values_lag, target_values_lag, permutation_method, analysis, method, sampling_rate,
-                      nperseg, frequencies, precomputed_perm=None, target_psd=None, measure_psd=None, random_seed=None,
-                      n_neighbors=3, mi_scale=None, mi_direction="target"):
+def _get_checkpoint_key(params, task, parent_seed, nperseg, target_measure, measure, series_value):
+    """Returns the key under which the permutations of a task are saved in the checkpoint folder. The key depends on
+    the values of the task, on the seed of the task, and on all the parameters that change the permutations."""
+    arrays = [task["measure_values"]]
+    if task["target_values"] is not None:
+        arrays.append(task["target_values"])
+    if task["label_arrays"] is not None:
+        arrays += list(task["label_arrays"].values())
+    values = np.concatenate([np.asarray(array, dtype=float) for array in arrays])
+
+    return get_cache_key(values, "checkpoint", params.analysis, params.method, params.sampling_rate, params.lags,
+                         params.permutation_method, params.number_of_randperms, params.random_seed,
+                         params.permutation_engine, params.shard, nperseg, params.n_neighbors, params.mi_scale,
+                         params.mi_direction, int(parent_seed), target_measure, measure, series_value,
+                         task["individual"], task["label"], task["perm_labels"])
+
+
+def _load_checkpoint(folder, key, lags):
+    """Returns the permutations saved under key in the checkpoint folder, as a dictionary with the lags as keys, or
+    None if they have not been saved (or if the file is incomplete)."""
+    path = os.path.join(folder, key + ".npz")
+    try:
+        with np.load(path, allow_pickle=False) as content:
+            return {lag: list(content[f"lag_{i}"]) for i, lag in enumerate(lags)}
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+        return None
+
+
+def _save_checkpoint(folder, key, results_by_lag):
+    """Saves the permutations of a task, returned by _compute_label_perms, under key in the checkpoint folder."""
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, key + ".npz")
+
+    # The file is written under a temporary name first, so that an interrupted run never leaves an incomplete file
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "wb") as f:
+        np.savez(f, **{f"lag_{i}": np.asarray(perm_list) for i, perm_list in enumerate(results_by_lag.values())})
+    os.replace(temporary_path, path)
+
+
+def _get_label_perms_by_lag(label_arrays, perm_labels, n, lags, sampling_rate):
+    """Returns, for each lag, the list of the arrays of the labels in perm_labels, trimmed for the lag."""
+    precomputed_perms_by_lag = {}
+    for lag in lags:
+        sample = int(np.round(lag * sampling_rate))
+        perms_this_lag = []
+        for perm_label in perm_labels:
+            perm = label_arrays[perm_label]
+            if sample > 0:
+                perm = perm[:n - sample]
+            elif sample < 0:
+                perm = perm[-sample:]
+            perms_this_lag.append(perm)
+        precomputed_perms_by_lag[lag] = perms_this_lag
+    return precomputed_perms_by_lag
+
+
+def _share_individual_arrays(label_arrays, target_values, folder):
+    """Writes the values of all the labels of an individual, followed by the target values, to a single .npy file in
+    folder, and returns views on the memory-mapped file. joblib sends these views to the worker processes as
+    references to the file, so the arrays are serialized once per individual instead of once per task."""
+    arrays = list(label_arrays.values())
+    if target_values is not None:
+        arrays.append(target_values)
+    offsets = np.concatenate(([0], np.cumsum([array.size for array in arrays])))
+
+    # Empty files cannot be memory-mapped
+    if offsets[-1] == 0:
+        return label_arrays, target_values
+
+    file_descriptor, path = tempfile.mkstemp(suffix=".npy", dir=folder)
+    os.close(file_descriptor)
+    np.save(path, np.concatenate(arrays).astype(float))
+    shared = np.load(path, mmap_mode="r")
+
+    shared_label_arrays = {label: shared[offsets[i]:offsets[i + 1]] for i, label in enumerate(label_arrays)}
+    if target_values is not None:
+        target_values = shared[offsets[-2]:offsets[-1]]
+
+    return shared_label_arrays, target_values
+
+
+def _generate_surrogate(seed, measure_values_lag, permutation_method, precomputed_perm=None):
+    """Returns one surrogate of the measure values, generated from its own seed."""
     perm_rng = np.random.default_rng(seed)
 
     if precomputed_perm is not None:
@@ -3040,14 +4325,27 @@ def _compute_one_perm(seed, measure_values_lag, target_values_lag, permutation_m
     else:
         raise ValueError(f"Unknown permutation_method: {permutation_method}")
 
+    return perm
+
+
+def _compute_one_perm(seed, measure_values_lag, target_values_lag, permutation_method, analysis, method, sampling_rate,
+                      nperseg, frequencies, precomputed_perm=None, target_psd=None, measure_psd=None, random_seed=None,
+                      n_neighbors=3, mi_scale=None, mi_direction="target"):
+    perm = _generate_surrogate(seed, measure_values_lag, permutation_method, precomputed_perm)
+
     if analysis == "power spectrum":
         _, perm_values = _compute_power_spectrum(method, perm, frequencies, sampling_rate)
     elif analysis == "correlation":
-        import pingouin as pg
+        pg = None
+        if method == "pingouin":
+            import pingouin as pg
         perm_values = _compute_correlation(pg, method, perm, target_values_lag)
     elif analysis == "coherence":
         _, perm_values = _compute_coherence(perm, target_values_lag, frequencies, sampling_rate, nperseg,
                                             target_psd=target_psd, measure_psd=measure_psd)
+    elif analysis == "mutual information" and method == "ksg":
+        perm_values = _compute_mutual_information_ksg(perm.reshape(1, -1), target_values_lag, random_seed,
+                                                      n_neighbors, mi_scale, mi_direction)[0]
     elif analysis == "mutual information":
         from sklearn.feature_selection import mutual_info_regression as mi
         sc = None
@@ -3061,6 +4359,124 @@ def _compute_one_perm(seed, measure_values_lag, target_values_lag, permutation_m
                                                   n_neighbors, mi_scale, mi_direction)
     return perm_values
 
+def _compute_batch_perms(seeds, measure_values_lag, target_values_lag, permutation_method, analysis, method,
+                         sampling_rate, nperseg, frequencies, precomputed_perms=None, random_seed=None, n_neighbors=3,
+                         mi_scale=None, mi_direction="target"):
+    """Computes the power spectrum, the correlation, the coherence or the mutual information (with the native
+    estimator) of all the permutations of a label at a given lag, by stacking the surrogates in a (n_perms, n_samples)
+    matrix, evaluated in blocks of at most _BATCH_PERMS_MAX_ELEMENTS values. For the coherence, the segment spectra of
+    the target are calculated once for all the blocks. The surrogates are generated from the same seeds as in
+    _compute_one_perm, so the results only differ from the loop engine by floating-point rounding."""
+    n = len(measure_values_lag)
+    block_size = max(1, _BATCH_PERMS_MAX_ELEMENTS // max(n, 1))
+
+    # For phase permutations, the spectrum of the signal is calculated once for all the blocks
+    if permutation_method == "phase" and precomputed_perms is None:
+        spectrum = np.fft.rfft(measure_values_lag)
+    else:
+        spectrum = None
+
+    if analysis == "coherence" and n > 0:
+        _, target_spectra = _get_segment_spectra(target_values_lag, sampling_rate, nperseg)
+    else:
+        target_spectra = None
+
+    perm_list = []
+    for start in range(0, len(seeds), block_size):
+        end = min(start + block_size, len(seeds))
+        if spectrum is not None:
+            perms = _phase_randomize_batch(spectrum, n, seeds[start:end])
+        else:
+            perms = np.stack([_generate_surrogate(seeds[p], measure_values_lag, permutation_method,
+                                                  precomputed_perms[p] if precomputed_perms is not None else None)
+                              for p in range(start, end)]).astype(float)
+
+        if analysis == "power spectrum":
+            _, perm_values = _compute_power_spectrum_batch(method, perms, frequencies, sampling_rate)
+        elif analysis == "correlation":
+            perm_values = _compute_correlation_batch(method, perms, target_values_lag)
+        elif analysis == "mutual information":
+            perm_values = _compute_mutual_information_ksg(perms, target_values_lag, random_seed, n_neighbors, mi_scale,
+                                                          mi_direction)
+        elif target_spectra is not None:
+            _, perms_spectra = _get_segment_spectra(perms, sampling_rate, nperseg)
+            perm_values = _compute_coherence_spectra(perms_spectra, target_spectra)
+        else:
+            perm_values = np.tile(np.nan, (len(perms), int(nperseg // 2 + 1)))
+        perm_list.extend(perm_values)
+
+    return perm_list
+
+
+def _compute_power_spectrum_batch(method, measure_values, frequencies, sampling_rate):
+    """Batched version of _compute_power_spectrum: returns the power spectrum of each row of measure_values (2D)."""
+    if frequencies is None:
+        # Frequencies returned by signal.welch with its default segment length (256 samples)
+        frequencies = sp_fft.rfftfreq(256, 1 / sampling_rate)
+
+    if measure_values.shape[1] == 0:
+        results = np.full((measure_values.shape[0], len(frequencies)), np.nan)
+
+    elif method == "fft":
+        power_spectrum = np.abs(np.fft.fft(measure_values, axis=-1)) ** 2
+        fft_freqs = np.fft.fftfreq(measure_values.shape[1], 1 / sampling_rate)
+        fft_freqs = fft_freqs[:len(fft_freqs) // 2]
+        power_spectrum = power_spectrum[:, :len(fft_freqs)]
+        results = np.stack([np.interp(frequencies, fft_freqs, row) for row in power_spectrum])
+
+    elif method == "welch":
+        frequencies, results = signal.welch(measure_values, fs=sampling_rate, axis=-1)
+
+    else:
+        raise ValueError(f"""When computing the power spectrum, the parameter method (current value: {method} must 
+                         be "fft" or "welch".""")
+
+    return frequencies, results
+
+
+def _compute_correlation_batch(method, measure_values, target_values):
+    """Batched version of _compute_correlation: returns the Pearson correlation of each row of measure_values (2D)
+    with target_values (1D). With pingouin, the NaN pairs are removed row by row, and the absolute value is returned."""
+    target_values = np.asarray(target_values, dtype=float)
+
+    if measure_values.shape[1] != target_values.size:
+        return np.full(measure_values.shape[0], np.nan)
+
+    valid = ~(np.isnan(measure_values) | np.isnan(target_values))
+    if method == "pingouin" and not valid.all():
+        counts = valid.sum(axis=1)
+        x = np.where(valid, measure_values, 0)
+        y = np.where(valid, target_values, 0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            x_mean = x.sum(axis=1, keepdims=True) / counts[:, None]
+            y_mean = y.sum(axis=1, keepdims=True) / counts[:, None]
+        x_centered = np.where(valid, x - x_mean, 0)
+        y_centered = np.where(valid, y - y_mean, 0)
+    else:
+        counts = np.full(measure_values.shape[0], measure_values.shape[1])
+        x_centered = measure_values - np.mean(measure_values, axis=1, keepdims=True)
+        y_centered = (target_values - np.mean(target_values))[None, :]
+
+    num = np.sum(x_centered * y_centered, axis=1)
+    denom = np.sqrt(np.sum(x_centered ** 2, axis=1) * np.sum(y_centered ** 2, axis=1))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        results = np.where(denom != 0, num / denom, np.nan)
+
+    if method == "pingouin":
+        # Like scipy.stats.pearsonr, constant inputs return NaN
+        x_valid = np.where(valid, measure_values, np.nan)
+        y_valid = np.where(valid, target_values, np.nan)
+        constant = ((np.fmax.reduce(x_valid, axis=1) == np.fmin.reduce(x_valid, axis=1)) |
+                    (np.fmax.reduce(y_valid, axis=1) == np.fmin.reduce(y_valid, axis=1)))
+        results = np.abs(np.clip(results, -1, 1))
+        results[(counts < 2) | constant] = np.nan
+    elif method not in ("numpy", "fft"):
+        raise ValueError(f"""When computing a correlation, the parameter method (current value: {method} must 
+                         be "pingouin", "numpy" or "fft".""")
+
+    return results
+
+
 def _phase_randomize(array, rng):
     """Return a phase-randomized surrogate of a real-valued signal."""
     # FFT
@@ -3084,6 +4500,24 @@ def _phase_randomize(array, rng):
     return surrogate
 
 
+def _phase_randomize_batch(spectrum, n, seeds):
+    """Returns a (len(seeds), n) array of phase-randomized surrogates of a real-valued signal of length n, from its
+    one-sided spectrum. Each row is the surrogate _phase_randomize returns with the generator seeded by the
+    corresponding seed, but all the surrogates are obtained with a single inverse FFT."""
+    amplitudes = np.abs(spectrum)
+    phases = np.angle(spectrum)
+    n_freqs = len(spectrum)
+
+    # Random phases, drawn in the same order as _phase_randomize
+    random_phases = np.stack([np.random.default_rng(seed).uniform(0, 2 * np.pi, n_freqs) for seed in seeds])
+    # Keep DC (0 Hz) and Nyquist (if present) unchanged
+    random_phases[:, 0] = phases[0]
+    if n % 2 == 0:
+        random_phases[:, -1] = phases[-1]
+
+    return np.fft.irfft(amplitudes * np.exp(1j * random_phases), n=n, axis=-1)
+
+
 def _count_tqdm_iterations(params, loop_number):
     total = 0
     for target_measure in params.target_measures:
@@ -1,5 +1,6 @@
 __all__ = ["analysis_parameters", "audio", "audio_derivatives", "exceptions", "experiment", "graph_element",
-           "graphic_classes", "joint", "pose", "results", "sequence", "subject", "time_series", "trial"]
+           "graphic_classes", "joint", "labelled_array", "pose", "results", "segmented_dataframe", "sequence", "subject",
+           "time_series", "trial"]
 
 from . import exceptions
 from .time_series import TimeSeries
@@ -10,8 +11,10 @@ from .joint import Joint
 from .sequence import Sequence
 from .trial import Trial
 from .subject import Subject
+from .segmented_dataframe import SegmentedDataframe
 from .experiment import Experiment
 from .graph_element import Graph, GraphPlot
 from .graphic_classes import GraphicJoint, GraphicPose, GraphicSequence
+from .labelled_array import LabelledArray
 from .analysis_parameters import AnalysisParameters
 from .results import Results
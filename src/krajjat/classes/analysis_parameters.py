@@ -1,15 +1,17 @@
 from __future__ import annotations
 
+import copy
 import itertools
 from typing import Any, Sequence
 from numbers import Number
 
 import numpy as np
 import scipy
-from pandas import DataFrame
+from pandas import Categorical, DataFrame, Series
 
 from krajjat.classes.graph_element import GraphPlot
 from krajjat.classes.experiment import Experiment
+from krajjat.classes.segmented_dataframe import SegmentedDataframe
 from krajjat.tool_functions import CLEAN_DERIV_NAMES, convert_color, find_closest_value_index, has_nested_key
 from dataclasses import dataclass, field
 
@@ -21,7 +23,7 @@ TupleOrString = tuple[str, str] | str
 class AnalysisParameters:
     # Required parameters
     analysis: str
-    experiment_or_dataframe: Experiment | DataFrame | str | list[Experiment | DataFrame | str]
+    experiment_or_dataframe: Experiment | DataFrame | SegmentedDataframe | str | list[Experiment | DataFrame | str]
 
     # Core analysis parameters
     method: str | None = None
@@ -62,6 +64,9 @@ class AnalysisParameters:
     random_seed: int | None = None
     n_jobs: int = 1
     parallel_prefer: str | None = None
+    checkpoint_folder: str | None = None
+    shard: tuple[int, int] | None = None
+    permutation_engine: str = "loop"
 
     # Specific frequency parameters
     specific_frequency: Number | list[Number] | tuple[Number, ...] | None = None
@@ -138,8 +143,11 @@ class AnalysisParameters:
 
         if self.analysis == "power spectrum" and self.method not in ("fft", "welch"):
             raise ValueError(f"Invalid value for the parameter method: {self.method}, must be fft or welch.")
-        elif self.analysis == "correlation" and self.method not in ("pingouin", "numpy"):
-            raise ValueError(f"Invalid value for the parameter method: {self.method}, must be pingouin or numpy.")
+        elif self.analysis == "correlation" and self.method not in ("pingouin", "numpy", "fft"):
+            raise ValueError(f"Invalid value for the parameter method: {self.method}, must be pingouin, numpy or "
+                             f"fft.")
+        elif self.analysis == "mutual information" and self.method not in ("ksg", "sklearn"):
+            raise ValueError(f"Invalid value for the parameter method: {self.method}, must be ksg or sklearn.")
 
         # Sequence measures and audio measures
         if self.sequence_measure is not None:
@@ -174,6 +182,24 @@ class AnalysisParameters:
         if self.permutation_method not in (None, "value", "label", "shift", "phase"):
             raise ValueError(f"Invalid value for the parameter permutation_method: {self.permutation_method}, "
                              f"must be value, label, shift or phase or None.")
+        if self.permutation_engine not in ("loop", "batch"):
+            raise ValueError(f"Invalid value for the parameter permutation_engine: {self.permutation_engine}, "
+                             f"must be loop or batch.")
+        if self.checkpoint_folder is not None and self.random_seed is None:
+            raise ValueError("The parameter checkpoint_folder requires the parameter random_seed to be set, so that "
+                             "the permutations of a resumed analysis are the same as the saved ones.")
+        if self.shard is not None:
+            if (not isinstance(self.shard, (tuple, list)) or len(self.shard) != 2 or
+                    not all(isinstance(value, (int, np.integer)) for value in self.shard)):
+                raise ValueError(f"Invalid value for the parameter shard: {self.shard}, must be a tuple of two "
+                                 f"integers (shard index, number of shards).")
+            if not 0 <= self.shard[0] < self.shard[1]:
+                raise ValueError(f"Invalid value for the parameter shard: {self.shard}, the shard index must be "
+                                 f"between 0 and the number of shards minus 1.")
+            if self.random_seed is None:
+                raise ValueError("The parameter shard requires the parameter random_seed to be set, so that all the "
+                                 "shards draw the same permutations.")
+            self.shard = (int(self.shard[0]), int(self.shard[1]))
         if self.permutation_method is not None and self.number_of_randperms > 0:
             self.compute_permutations = True
         else:
@@ -206,6 +232,13 @@ class AnalysisParameters:
         # Set the random seed for reproducibility on the randperm arrays
         self.rng = np.random.default_rng(self.random_seed)
 
+        # The columns of a SegmentedDataframe are read from its segment table
+        if isinstance(dataframe, SegmentedDataframe):
+            segmented_dataframe = dataframe
+            dataframe = dataframe.segments
+        else:
+            segmented_dataframe = None
+
         # Set the series of interest
         if self.series is not None:
             self.series_values = list(dataframe[self.series].unique())
@@ -289,6 +322,8 @@ class AnalysisParameters:
         else:
             raise ValueError(f"The target measure has to be defined for a {self.analysis} analysis.")
 
+        if segmented_dataframe is not None:
+            dataframe = segmented_dataframe
         self._infer_sampling_rate(dataframe)
 
         self._validate_lags(dataframe)
@@ -321,9 +356,43 @@ class AnalysisParameters:
         else:
             raise ValueError(f"Invalid value for the parameter signif_tail: {self.signif_tail}, must be one or two.")
 
+    def _get_shard_range(self):
+        # Returns the indices (start, end) of the permutations computed by the shard
+        if self.shard is None:
+            return 0, self.number_of_randperms
+        index, number_of_shards = self.shard
+        return (index * self.number_of_randperms // number_of_shards,
+                (index + 1) * self.number_of_randperms // number_of_shards)
+
+    def _get_state(self):
+        # Returns the attributes needed to finish the analysis of a shard on another machine (see Results.merge)
+        state = {k: v for k, v in vars(self).items() if k not in ("experiment_or_dataframe", "rng")}
+        # The unique values of categorical columns (e.g. individuals, labels) are stored as arrays, so that the state
+        # can be saved with the results of the shard
+        state = {k: np.asarray(v) if isinstance(v, Categorical) else v for k, v in state.items()}
+        state["rng_state"] = self.rng.bit_generator.state
+        return state
+
+    @classmethod
+    def _from_state(cls, state):
+        # Restores the parameters saved by _get_state, without the dataframe. The state is copied, as the summary of
+        # the analysis modifies some parameters (e.g. the silhouette titles in kwargs)
+        params = cls.__new__(cls)
+        params.__dict__.update(copy.deepcopy({k: v for k, v in state.items() if k != "rng_state"}))
+        params.experiment_or_dataframe = None
+        params.rng = np.random.default_rng()
+        params.rng.bit_generator.state = state["rng_state"]
+        return params
+
     def _validate_lags(self, dataframe):
         # Validate that lags are in the correct time range
-        trials_max = dataframe.groupby(["subject", "trial"])["timestamp"].max().to_numpy()
+        if isinstance(dataframe, SegmentedDataframe):
+            segments_max = [np.max(dataframe.get_segment(i)[0], initial=-np.inf)
+                            for i in range(len(dataframe.segments))]
+            segments = dataframe.segments.assign(timestamp=segments_max)
+            trials_max = segments.groupby(["subject", "trial"])["timestamp"].max().to_numpy()
+        else:
+            trials_max = dataframe.groupby(["subject", "trial"])["timestamp"].max().to_numpy()
         min_of_max = np.min(trials_max)
         for lag in self.lags:
             if abs(lag) > min_of_max:
@@ -378,7 +447,11 @@ class AnalysisParameters:
         if self.verbosity > 0:
             print("\nInferring the sampling rate from the dataframe to compare it with the provided sampling rate...")
 
-        time_diffs = dataframe["timestamp"].diff().dropna()
+        if isinstance(dataframe, SegmentedDataframe):
+            timestamps = [dataframe.get_segment(i)[0] for i in range(len(dataframe.segments))]
+            time_diffs = Series(np.concatenate(timestamps)).diff().dropna()
+        else:
+            time_diffs = dataframe["timestamp"].diff().dropna()
         median_diff = time_diffs.median()
         if median_diff <= 0:
             raise ValueError("Invalid or non-monotonic time values found in the dataframe.")
@@ -426,6 +426,56 @@ class Audio(AudioDerivative):
         overlap = int(np.ceil(overlap_ratio * window_size))
         number_of_windows = get_number_of_windows(len(self.samples), window_size, overlap_ratio, True)
 
+        envelope_samples = self._get_derivative_samples(
+            lambda: self._calculate_envelope_samples(window_size, overlap, number_of_windows, verbosity),
+            "envelope", window_size, overlap_ratio, verbosity=verbosity)
+
+        envelope = Envelope(envelope_samples, self.frequency, name, self.condition, verbosity=verbosity)
+
+        envelope._set_attributes_from_other_object(self)
+        envelope.metadata["processing_steps"].append({"processing_type": "get_envelope",
+                                                      "original_audio": self.name, "original_path": self.path,
+                                                      "window_size": window_size, "overlap_ratio": overlap_ratio,
+                                                      "filter_below": filter_below, "filter_over": filter_over})
+
+        # Filtering
+        if filter_below is not None or filter_over is not None:
+            envelope = envelope.filter_frequencies(filter_below, filter_over, padtype, padlen, name, verbosity)
+
+        return envelope
+
+    def _calculate_envelope_samples(self, window_size, overlap, number_of_windows, verbosity=1):
+        """Calculates the samples of the envelope of the audio clip, window by window. This function is called by
+        :meth:`Audio.get_envelope`.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        ----------
+        window_size: int
+            The size of the windows, in samples.
+
+        overlap: int
+            The number of samples overlapping between each window.
+
+        number_of_windows: int
+            The number of windows.
+
+        verbosity: int, optional
+            Sets how much feedback the code will provide in the console output:
+
+            • *0: Silent mode.* The code won’t provide any feedback, apart from error messages.
+            • *1: Normal mode* (default). The code will provide essential feedback such as progression markers and
+              current steps.
+            • *2: Chatty mode.* The code will provide all possible information on the events happening. Note that this
+              may clutter the output and slow down the execution.
+
+        Returns
+        -------
+        numpy.ndarray
+            The samples of the envelope.
+        """
+
         # Hilbert transform
         if verbosity == 1:
             print("\tGetting the Hilbert transform...", end=" ")
@@ -482,19 +532,7 @@ class Audio(AudioDerivative):
         elif verbosity > 1:
             print("Done.")
 
-        envelope = Envelope(envelope_samples, self.frequency, name, self.condition, verbosity=verbosity)
-
-        envelope._set_attributes_from_other_object(self)
-        envelope.metadata["processing_steps"].append({"processing_type": "get_envelope",
-                                                      "original_audio": self.name, "original_path": self.path,
-                                                      "window_size": window_size, "overlap_ratio": overlap_ratio,
-                                                      "filter_below": filter_below, "filter_over": filter_over})
-
-        # Filtering
-        if filter_below is not None or filter_over is not None:
-            envelope = envelope.filter_frequencies(filter_below, filter_over, padtype, padlen, name, verbosity)
-
-        return envelope
+        return envelope_samples
 
     # noinspection PyArgumentList
     def get_pitch(self, method="parselmouth", filter_below=None, filter_over=None, padtype="constant", padlen=None,
@@ -562,65 +600,24 @@ class Audio(AudioDerivative):
 
         samples = np.array(self.samples, dtype=np.float64)
 
-        if verbosity > 0:
-            if method == "parselmouth":
-                print("\tTurning the audio into a parselmouth object...", end=" ")
-            else:
-                print("\tGetting the pitch from crepe...", end=" ")
-
         if method == "parselmouth":
-            # parselmouth_sound = Sound(np.ndarray(np.shape(samples), dtype=np.float64, buffer=samples), self.frequency)
-            parselmouth_sound = Sound(samples, self.frequency)
-
             if name is None:
                 name = self.name + " (PIT)"
 
-            if verbosity > 0:
-                print("Done.")
-                print("\tGetting the pitch...", end=" ")
-
-            parselmouth_pitch = parselmouth_sound.to_pitch(time_step=1 / self.frequency)
-
-            if verbosity > 0:
-                print("Done.")
-
-            original_data_length = len(parselmouth_pitch.xs())
-            pitch_times = parselmouth_pitch.xs()
-            pitch_data = parselmouth_pitch.selected_array["frequency"]
-            audio_times = self.timestamps
-
-            # Find missing times at start and end
-            pad_start_times = audio_times[audio_times < pitch_times[0]]
-            pad_end_times = audio_times[audio_times > pitch_times[-1]]
-
-            # Construct padded timestamps array
-            padded_times = np.concatenate([pad_start_times, pitch_times, pad_end_times])
-
-            # Create padded data array filled with padding_value (e.g., 0)
-            padding_value = 0
-            padded_data = np.full(len(padded_times), padding_value, dtype=pitch_data.dtype)
-
-            # Insert pitch data into correct slice
-            start_idx = len(pad_start_times)
-            padded_data[start_idx: start_idx + len(pitch_data)] = pitch_data
-
-            # Now resample padded_data onto audio_times
-            samples, timestamps = resample_data(padded_data, padded_times, self.frequency, verbosity=verbosity)
-
-            # samples, timestamps = pad(parselmouth_pitch.selected_array["frequency"], parselmouth_pitch.xs(),
-            #                           self.timestamps, verbosity=verbosity)
+            samples = self._get_derivative_samples(lambda: self._calculate_pitch_samples(samples, verbosity),
+                                                   "pitch", method, verbosity=verbosity)
 
             if zeros_as_nan:
                 samples[samples == 0] = np.nan
 
-            if verbosity > 0:
-                print(f"The calculated pitch contained {original_data_length} samples. Padding the data added "
-                      f"{len(samples) - original_data_length} samples, to reach {len(samples)} samples.")
-
             pitch = Pitch(samples, self.frequency, self.name, self.condition, verbosity=verbosity)
 
         else:
-            _, frequency, confidence, activation = crepe.predict(samples, self.frequency, viterbi=True)
+            if verbosity > 0:
+                print("\tGetting the pitch from crepe...", end=" ")
+
+            frequency = self._get_derivative_samples(
+                lambda: crepe.predict(samples, self.frequency, viterbi=True)[1], "pitch", method, verbosity=verbosity)
 
             pitch = Pitch(frequency, self.frequency, self.name, self.condition, verbosity=verbosity)
 
@@ -635,6 +632,78 @@ class Audio(AudioDerivative):
 
         return pitch
 
+    def _calculate_pitch_samples(self, samples, verbosity=1):
+        """Calculates the pitch of the audio clip with Parselmouth, and pads and resamples it to match the timestamps
+        of the audio clip. This function is called by :meth:`Audio.get_pitch`.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        ----------
+        samples: numpy.ndarray
+            The samples of the audio clip, as 64-bit floats.
+
+        verbosity: int, optional
+            Sets how much feedback the code will provide in the console output:
+
+            • *0: Silent mode.* The code won’t provide any feedback, apart from error messages.
+            • *1: Normal mode* (default). The code will provide essential feedback such as progression markers and
+              current steps.
+            • *2: Chatty mode.* The code will provide all possible information on the events happening. Note that this
+              may clutter the output and slow down the execution.
+
+        Returns
+        -------
+        numpy.ndarray
+            The samples of the pitch.
+        """
+        if verbosity > 0:
+            print("\tTurning the audio into a parselmouth object...", end=" ")
+
+        # parselmouth_sound = Sound(np.ndarray(np.shape(samples), dtype=np.float64, buffer=samples), self.frequency)
+        parselmouth_sound = Sound(samples, self.frequency)
+
+        if verbosity > 0:
+            print("Done.")
+            print("\tGetting the pitch...", end=" ")
+
+        parselmouth_pitch = parselmouth_sound.to_pitch(time_step=1 / self.frequency)
+
+        if verbosity > 0:
+            print("Done.")
+
+        original_data_length = len(parselmouth_pitch.xs())
+        pitch_times = parselmouth_pitch.xs()
+        pitch_data = parselmouth_pitch.selected_array["frequency"]
+        audio_times = self.timestamps
+
+        # Find missing times at start and end
+        pad_start_times = audio_times[audio_times < pitch_times[0]]
+        pad_end_times = audio_times[audio_times > pitch_times[-1]]
+
+        # Construct padded timestamps array
+        padded_times = np.concatenate([pad_start_times, pitch_times, pad_end_times])
+
+        # Create padded data array filled with padding_value (e.g., 0)
+        padding_value = 0
+        padded_data = np.full(len(padded_times), padding_value, dtype=pitch_data.dtype)
+
+        # Insert pitch data into correct slice
+        start_idx = len(pad_start_times)
+        padded_data[start_idx: start_idx + len(pitch_data)] = pitch_data
+
+        # Now resample padded_data onto audio_times
+        samples, timestamps = resample_data(padded_data, padded_times, self.frequency, verbosity=verbosity)
+
+        # samples, timestamps = pad(parselmouth_pitch.selected_array["frequency"], parselmouth_pitch.xs(),
+        #                           self.timestamps, verbosity=verbosity)
+
+        if verbosity > 0:
+            print(f"The calculated pitch contained {original_data_length} samples. Padding the data added "
+                  f"{len(samples) - original_data_length} samples, to reach {len(samples)} samples.")
+
+        return samples
+
     # noinspection PyArgumentList
     def get_intensity(self, filter_below=None, filter_over=None, padtype="constant", padlen=None, name=None,
                       zeros_as_nan=False, verbosity=1):
@@ -690,6 +759,50 @@ class Audio(AudioDerivative):
         if verbosity > 0:
             print("Creating an Intensity object...")
 
+        if name is None:
+            name = self.name + " (INT)"
+
+        samples = self._get_derivative_samples(lambda: self._calculate_intensity_samples(verbosity), "intensity",
+                                               verbosity=verbosity)
+
+        if zeros_as_nan:
+            samples[samples == 0] = np.nan
+
+        intensity = Intensity(samples, self.frequency, name, self.condition, verbosity=verbosity)
+        intensity._set_attributes_from_other_object(self)
+
+        intensity.metadata["processing_steps"].append({"processing_type": "get_intensity",
+                                                       "original_audio": self.name, "original_path": self.path,
+                                                       "zeros_as_nan": zeros_as_nan,
+                                                       "filter_below": filter_below, "filter_over": filter_over})
+
+        if filter_below is not None or filter_over is not None:
+            intensity = intensity.filter_frequencies(filter_below, filter_over, padtype, padlen, name, verbosity)
+
+        return intensity
+
+    def _calculate_intensity_samples(self, verbosity=1):
+        """Calculates the intensity of the audio clip with Parselmouth, and pads it to match the timestamps of the audio
+        clip. This function is called by :meth:`Audio.get_intensity`.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        ----------
+        verbosity: int, optional
+            Sets how much feedback the code will provide in the console output:
+
+            • *0: Silent mode.* The code won’t provide any feedback, apart from error messages.
+            • *1: Normal mode* (default). The code will provide essential feedback such as progression markers and
+              current steps.
+            • *2: Chatty mode.* The code will provide all possible information on the events happening. Note that this
+              may clutter the output and slow down the execution.
+
+        Returns
+        -------
+        numpy.ndarray
+            The samples of the intensity.
+        """
         samples = np.array(self.samples, dtype=np.float64)
 
         if verbosity > 0:
@@ -697,9 +810,6 @@ class Audio(AudioDerivative):
 
         parselmouth_sound = Sound(np.ndarray(np.shape(samples), dtype=np.float64, buffer=samples), self.frequency)
 
-        if name is None:
-            name = self.name + " (INT)"
-
         if verbosity > 0:
             print("Done.")
             print("\tGetting the intensity...", end=" ")
@@ -715,24 +825,10 @@ class Audio(AudioDerivative):
         samples, timestamps = pad(parselmouth_intensity.values[0], intensity_timestamps, self.timestamps,
                                   verbosity=verbosity)
 
-        if zeros_as_nan:
-            samples[samples == 0] = np.nan
-
         if verbosity > 0:
             print("Done.")
 
-        intensity = Intensity(samples, self.frequency, name, self.condition, verbosity=verbosity)
-        intensity._set_attributes_from_other_object(self)
-
-        intensity.metadata["processing_steps"].append({"processing_type": "get_intensity",
-                                                       "original_audio": self.name, "original_path": self.path,
-                                                       "zeros_as_nan": zeros_as_nan,
-                                                       "filter_below": filter_below, "filter_over": filter_over})
-
-        if filter_below is not None or filter_over is not None:
-            intensity = intensity.filter_frequencies(filter_below, filter_over, padtype, padlen, name, verbosity)
-
-        return intensity
+        return samples
 
     # noinspection PyArgumentList
     def get_formant(self, formant_number=1, filter_below=None, filter_over=None, padtype="constant", padlen=None,
@@ -791,6 +887,51 @@ class Audio(AudioDerivative):
         if verbosity > 0:
             print("Creating a Formant object...")
 
+        if name is None:
+            name = self.name + " (F" + str(formant_number) + ")"
+
+        f = self._get_derivative_samples(lambda: self._calculate_formant_samples(formant_number, verbosity),
+                                         "formant", formant_number, verbosity=verbosity)
+
+        formant = Formant(f, self.frequency, formant_number, name, self.condition, verbosity=verbosity)
+        formant._set_attributes_from_other_object(self)
+
+        formant.metadata["processing_steps"].append({"processing_type": "get_formant",
+                                                     "original_audio": self.name, "original_path": self.path,
+                                                     "formant_number": formant_number, "zeros_as_nan": zeros_as_nan,
+                                                     "filter_below": filter_below, "filter_over": filter_over})
+        formant.metadata["formant_number"] = formant_number
+
+        if filter_below is not None or filter_over is not None:
+            formant = formant.filter_frequencies(filter_below, filter_over, padtype, padlen, name, verbosity)
+
+        return formant
+
+    def _calculate_formant_samples(self, formant_number, verbosity=1):
+        """Calculates a formant of the audio clip with Parselmouth, and pads it to match the timestamps of the audio
+        clip. This function is called by :meth:`Audio.get_formant`.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        ----------
+        formant_number: int
+            One of the formants of the voice in the audio clip (1, 2, 3, 4 or 5).
+
+        verbosity: int, optional
+            Sets how much feedback the code will provide in the console output:
+
+            • *0: Silent mode.* The code won’t provide any feedback, apart from error messages.
+            • *1: Normal mode* (default). The code will provide essential feedback such as progression markers and
+              current steps.
+            • *2: Chatty mode.* The code will provide all possible information on the events happening. Note that this
+              may clutter the output and slow down the execution.
+
+        Returns
+        -------
+        numpy.ndarray
+            The samples of the formant.
+        """
         if verbosity > 0:
             print("\tTurning the audio into a parselmouth object...", end=" ")
 
@@ -801,9 +942,6 @@ class Audio(AudioDerivative):
             print("Done.")
             print("\tGetting the formant...", end=" ")
 
-        if name is None:
-            name = self.name + " (F" + str(formant_number) + ")"
-
         parselmouth_formant = parselmouth_sound.to_formant_burg(time_step=1 / self.frequency)
         formant_timestamps = parselmouth_formant.xs()
 
@@ -824,19 +962,54 @@ class Audio(AudioDerivative):
         if verbosity > 0:
             print("Done.")
 
-        formant = Formant(f, self.frequency, formant_number, name, self.condition, verbosity=verbosity)
-        formant._set_attributes_from_other_object(self)
+        return f
 
-        formant.metadata["processing_steps"].append({"processing_type": "get_formant",
-                                                     "original_audio": self.name, "original_path": self.path,
-                                                     "formant_number": formant_number, "zeros_as_nan": zeros_as_nan,
-                                                     "filter_below": filter_below, "filter_over": filter_over})
-        formant.metadata["formant_number"] = formant_number
+    def _get_derivative_samples(self, calculate, derivative, *parameters, verbosity=1):
+        """Returns the samples of an audio derivative calculated from the audio clip. If the on-disk cache is enabled
+        (see :func:`tool_functions.set_cache_folder`), the samples are loaded from the cache if they have already been
+        calculated with the same parameters on the same samples; otherwise, they are calculated and saved in the cache.
 
-        if filter_below is not None or filter_over is not None:
-            formant = formant.filter_frequencies(filter_below, filter_over, padtype, padlen, name, verbosity)
+        .. versionadded:: 2.0
 
-        return formant
+        Parameters
+        ----------
+        calculate: callable
+            A function without parameters, returning the samples of the audio derivative.
+
+        derivative: str
+            The name of the audio derivative (e.g. ``"envelope"``).
+
+        *parameters: any
+            The parameters used to calculate the audio derivative, identifying it in the cache along with the samples,
+            the frequency and the first timestamp of the audio clip.
+
+        verbosity: int, optional
+            Sets how much feedback the code will provide in the console output:
+
+            • *0: Silent mode.* The code won’t provide any feedback, apart from error messages.
+            • *1: Normal mode* (default). The code will provide essential feedback such as progression markers and
+              current steps.
+            • *2: Chatty mode.* The code will provide all possible information on the events happening. Note that this
+              may clutter the output and slow down the execution.
+
+        Returns
+        -------
+        numpy.ndarray
+            The samples of the audio derivative.
+        """
+        if get_cache_folder() is None:
+            return calculate()
+
+        key = get_cache_key(self.samples, self.frequency, self.timestamps[0], derivative, *parameters)
+        samples = load_from_cache(key)
+
+        if samples is None:
+            samples = calculate()
+            save_to_cache(key, samples)
+        elif verbosity > 0:
+            print(f"\tLoaded the {derivative} from the cache.")
+
+        return samples
 
     def get_derivative(self, derivative, filter_below=None, filter_over=None, padtype="constant", padlen=None,
                        resampling_frequency=None, resampling_mode="pchip", res_window_size=1e7, res_overlap_ratio=0.5,
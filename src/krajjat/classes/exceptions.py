@@ -112,6 +112,11 @@ class ImpossibleTimeTravelException(Exception):
                        " (difference of " + str(timestamp1 - timestamp2) + ")."
         super().__init__(self.message)
 
+    def __reduce__(self):
+        """Allows the exception to be pickled, typically to be sent back from a parallel job."""
+        return self.__class__, (self.index1, self.index2, self.timestamp1, self.timestamp2, self.number_of_timestamps,
+                                self.object_type)
+
 
 class InvalidJointLabelException(Exception):
     """Exception raised when the provided joint name does not exist in the Sequence or the Pose.
@@ -7,6 +7,8 @@ from scipy.io import savemat
 from tqdm import tqdm
 
 from krajjat.classes import Audio
+from krajjat.classes.exceptions import ModuleNotFoundException
+from krajjat.classes.segmented_dataframe import SegmentedDataframe
 from krajjat.tool_functions import get_system_csv_separator, show_progression, CLEAN_DERIV_NAMES
 
 import pandas as pd
@@ -336,9 +338,11 @@ class Experiment(object):
         return joint_labels
 
     def get_dataframe(self, sequence_measure="distance", audio_measure="envelope", sampling_frequency=None,
-                      exclude_columns=None, include_columns=None, subjects="all", use_categoricals=True, verbosity=1,
-                      **kwargs):
-        """Returns the data from the experiment as a Pandas dataframe containing multiple columns.
+                      exclude_columns=None, include_columns=None, subjects="all", use_categoricals=True, n_jobs=1,
+                      verbosity=1, **kwargs):
+        """Returns the data from the experiment as a Pandas dataframe containing multiple columns. The dataframe
+        is created from the compact representation returned by :meth:`get_segmented_dataframe`, which can be used
+        instead of the dataframe to reduce the memory used.
 
         .. versionadded:: 2.0
 
@@ -421,6 +425,10 @@ class Experiment(object):
             Whether to use categoricals for all columns apart from timestamps and values (default: `True`). This
             parameter generally allows to drastically reduce the size of the dataframe.
 
+        n_jobs: int, optional
+            Max amount of jobs to run in parallel (default: 1). Set on -1 to use the maximum amount of available cores.
+            The trials are processed in parallel and their data is concatenated in the same order as with ``n_jobs=1``.
+
         verbosity: int, optional
             Sets how much feedback the code will provide in the console output:
 
@@ -444,8 +452,74 @@ class Experiment(object):
         • :meth:`Audio.get_intensity`
         """
 
+        segmented_dataframe = self.get_segmented_dataframe(sequence_measure, audio_measure, sampling_frequency,
+                                                           exclude_columns, include_columns, subjects, n_jobs,
+                                                           verbosity, **kwargs)
+
+        return segmented_dataframe.to_dataframe(use_categoricals)
+
+    def get_segmented_dataframe(self, sequence_measure="distance", audio_measure="envelope", sampling_frequency=None,
+                                exclude_columns=None, include_columns=None, subjects="all", n_jobs=1, verbosity=1,
+                                **kwargs):
+        """Returns the data from the experiment as a :class:`SegmentedDataframe`: a table containing one row per
+        subject, trial, label and measure, and two contiguous arrays containing the timestamps and the values of all
+        the rows. This representation contains the same data as :meth:`get_dataframe`, without repeating the values
+        of the descriptive columns for every timestamp; the long dataframe can be obtained on demand with
+        :meth:`SegmentedDataframe.to_dataframe`.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        ----------
+        sequence_measure: str or list(str), optional
+            The time series to be returned (see :meth:`get_dataframe`).
+
+        audio_measure: str, list(str) or None, optional
+            The time series to be returned (see :meth:`get_dataframe`).
+
+        sampling_frequency: float, optional
+            The frequency at which to resample the two measures before adding them to the segments. By default,
+            no resampling is applied.
+
+        exclude_columns: list or None, optional
+            A list of the columns to exclude (see :meth:`get_dataframe`).
+
+        include_columns: list or None, optional
+            A list of columns to include, from the attributes of the Subject and the Trial instances (see
+            :meth:`get_dataframe`).
+
+        subjects: str|list, optional
+            A subject, a list of subjects or ``"all"`` (default).
+
+        n_jobs: int, optional
+            Max amount of jobs to run in parallel (default: 1). Set on -1 to use the maximum amount of available cores.
+            The trials are processed in parallel and their data is concatenated in the same order as with ``n_jobs=1``.
+
+        verbosity: int, optional
+            Sets how much feedback the code will provide in the console output:
+
+            • *0: Silent mode.* The code won’t provide any feedback, apart from error messages.
+            • *1: Normal mode* (default). The code will provide essential feedback such as progression markers and
+              current steps.
+            • *2: Chatty mode.* The code will provide all possible information on the events happening. Note that this
+              may clutter the output and slow down the execution.
+
+        **kwargs: optional
+            The parameters related to the generation of the Audio or AudioDerivative objects (see
+            :meth:`get_dataframe`).
+
+        Returns
+        -------
+        SegmentedDataframe
+            The data of the experiment.
+
+        Example
+        -------
+        >>> segmented = experiment.get_segmented_dataframe("velocity", "envelope")
+        >>> dataframe = segmented.to_dataframe()
+        """
         if verbosity > 1:
-            print("Creating a dataframe for the experiment.")
+            print("Creating a segmented dataframe for the experiment.")
             print("Number of subjects: " + str(len(self.subjects)))
             print("Number of trials: " + str(sum([len(self.subjects[sub]) for sub in self.subjects])))
 
@@ -474,8 +548,11 @@ class Experiment(object):
         # Define the joint labels
         joint_labels = self.get_joint_labels()
 
-        # Create the dataframe skeleton
-        data = {column: [] for column in columns}
+        # The segment table contains all the columns apart from the timestamps and the values
+        segment_columns = [column for column in columns if column not in ["timestamp", "value"]]
+        segments = []
+        timestamps = []
+        values = []
 
         # Get timestamps if specified
         timestamp_start = kwargs.get("timestamp_start", None)
@@ -490,184 +567,68 @@ class Experiment(object):
                       for trial_id in self.subjects[subject_name].trials]
 
         if verbosity > 0:
-            print("Creating the dataframe...")
-
-        # For each subject
-        for subject_name, trial_id in tqdm(all_trials, desc="Building dataframe", disable=verbosity != 1, ncols=80,
-                                           colour="#99cc00", bar_format="{l_bar}{bar} · {elapsed}<{remaining}"):
-
-            if verbosity > 1:
-                print(f"\tSubject {subject_name}")
+            print("Creating the segmented dataframe...")
 
+        # Checking the trials and getting the attributes of the subjects
+        trial_arguments = []
+        for subject_name, trial_id in all_trials:
             subject = self.subjects[subject_name]
-
-            if verbosity > 1:
-                print(f"\t\tTrial {trial_id}")
-
             trial = subject.trials[trial_id]
 
             if not trial.has_sequence():
                 raise Exception(f"A Sequence is missing for Subject {subject_name}, Trial {trial_id}.")
-            sequence = trial.sequence
 
             if len(audio_measure) > 0 and not trial.has_audio():
                 raise Exception(f"An Audio is missing for Subject {subject_name}, Trial {trial_id}.")
 
-            if sampling_frequency is not None and sequence.get_sampling_rate() != sampling_frequency:
-                sequence = sequence.resample(sampling_frequency,
-                                             method=kwargs.get("method", "cubic"),
-                                             window_size=kwargs.get("window_size", 1e7),
-                                             overlap_ratio=kwargs.get("overlap_ratio", 0.5),
-                                             verbosity=verbosity-1)
-
-            # For each measure (mocap)
-            for measure in sequence_measure:
-                # perc = show_progression(verbosity, i, number_of_iterations, perc)
-
-                if verbosity > 1:
-                    print(f"\t\t\tMeasure {measure}")
-
-                sequence_values = sequence.get_measure(measure,
-                                                       timestamp_start=timestamp_start,
-                                                       timestamp_end=timestamp_end,
-                                                       window_length=kwargs.get("window_length", "auto"),
-                                                       poly_order=kwargs.get("poly_order", "auto"),
-                                                       verbosity=verbosity-1)
-
-
-
-                timestamps = sequence.get_timestamps(relative=True,
-                                                     timestamp_start=timestamp_start,
-                                                     timestamp_end=timestamp_end)
-
-                timestamps = timestamps[len(timestamps) - len(sequence_values[joint_labels[0]]):]
-
-                # For each joint
-                for joint_label in joint_labels:
-                    values_to_append = {"subject": subject_name,
-                                        "group": subject.group,
-                                        "trial": trial_id,
-                                        "condition": trial.condition,
-                                        "modality": "mocap",
-                                        "label": joint_label,
-                                        "measure": CLEAN_DERIV_NAMES[measure]}
-
-                    for column in columns:
-
-                        # Repeat the value for the first columns
-                        if column in values_to_append.keys():
-                            repeated_values = np.repeat(values_to_append[column], len(timestamps)).astype(object)
-                            data[column].append(repeated_values)
-
-                        # Timestamps
-                        elif column == "timestamp":
-                            data[column].append(timestamps)
-
-                        # Value
-                        elif column == "value":
-                            if joint_label not in sequence_values.keys():
-                                data[column].append(np.full(np.shape(timestamps), np.nan))
-                            else:
-                                data[column].append(sequence_values[joint_label])
-
-                        # Subject attribute
-                        elif hasattr(subject, column):
-                            repeated_values = np.repeat(getattr(subject, column), len(timestamps)).astype(object)
-                            data[column].append(repeated_values)
-
-                        # Trial attribute
-                        elif hasattr(trial, column):
-                            repeated_values = np.repeat(getattr(trial, column), len(timestamps)).astype(object)
-                            data[column].append(repeated_values)
-
-                        # Attribute not found (nan)
-                        else:
-                            data[column].append(np.full(np.shape(timestamps), np.nan))
-
-            # For each measure (audio)
-            for measure in audio_measure:
-
-                if verbosity > 1:
-                    print(f"\t\t\tMeasure {measure}")
-
-                audio = trial.audio
-
-                if type(audio) is Audio and measure != "audio":
-                    audio = audio.get_derivative(measure,
-                                                 filter_over=kwargs.get("filter_over", None),
-                                                 filter_below=kwargs.get("filter_below", None),
-                                                 timestamp_start=timestamp_start,
-                                                 timestamp_end=timestamp_end,
-                                                 verbosity=verbosity-1)
-                elif (type(audio).__name__ != measure.title() and
-                      (type(audio).__name__ == "Formant" and measure not in ["f1", "f2", "f3", "f4", "f5"])):
-                    raise Exception(f"Impossible to derive the measure {measure} from a {type(audio).__name__} "
-                                    f"object.")
-
-                if sampling_frequency is not None and audio.frequency != sampling_frequency:
-                    audio = audio.resample(sampling_frequency,
-                                           method=kwargs.get("resampling_mode", "cubic"),
-                                           window_size=kwargs.get("res_window_size", 1e7),
-                                           overlap_ratio=kwargs.get("res_overlap_ratio", 0.5),
-                                           verbosity=verbosity-1)
-
-                audio_values = audio.get_samples()
-                timestamps = audio.timestamps
-
-                values_to_append = {"subject": subject_name,
-                                    "group": subject.group,
-                                    "trial": trial_id,
-                                    "condition": trial.condition,
-                                    "modality": "audio",
-                                    "label": "Audio",
-                                    "measure": measure}
-
-                for column in columns:
-
-                    # Repeat the value for the first columns
-                    if column in values_to_append.keys():
-                        repeated_values = np.repeat(values_to_append[column], len(timestamps)).astype(object)
-                        data[column].append(repeated_values)
-
-                    # Timestamps
-                    elif column == "timestamp":
-                        data[column].append(timestamps)
-
-                    # Value
-                    elif column == "value":
-                        data[column].append(audio.samples)
-
-                    # Subject attribute
-                    elif hasattr(subject, column):
-                        repeated_values = np.repeat(getattr(subject, column), len(timestamps)).astype(object)
-                        data[column].append(repeated_values)
-
-                    # Trial attribute
-                    elif hasattr(trial, column):
-                        repeated_values = np.repeat(getattr(trial, column), len(timestamps)).astype(object)
-                        data[column].append(repeated_values)
-
-                    # Attribute not found (nan)
-                    else:
-                        data[column].append(np.full(np.shape(timestamps), np.nan))
+            subject_attributes = {column: getattr(subject, column) for column in columns if hasattr(subject, column)}
+            trial_arguments.append((subject_name, subject.group, subject_attributes, trial_id, trial))
+
+        common_arguments = (segment_columns, sequence_measure, audio_measure, joint_labels, sampling_frequency,
+                            timestamp_start, timestamp_end)
+
+        if n_jobs == 1:
+            trials_data = (_get_trial_segments(*arguments, *common_arguments, verbosity=verbosity, **kwargs)
+                           for arguments in trial_arguments)
+        else:
+            try:
+                from joblib import Parallel, delayed
+            except ImportError:
+                raise ModuleNotFoundException("joblib", "create the dataframe in parallel")
+
+            trials_data = Parallel(n_jobs=n_jobs, return_as="generator")(
+                delayed(_get_trial_segments)(*arguments, *common_arguments, verbosity=0, **kwargs)
+                for arguments in trial_arguments)
+
+        # For each subject and trial, in order
+        for subject_name, trial_id in tqdm(all_trials, desc="Building dataframe", disable=verbosity != 1, ncols=80,
+                                           colour="#99cc00", bar_format="{l_bar}{bar} · {elapsed}<{remaining}"):
+
+            if verbosity > 1:
+                print(f"\tSubject {subject_name}")
+                print(f"\t\tTrial {trial_id}")
+
+            trial_segments, trial_timestamps, trial_values = next(trials_data)
+            segments.extend(trial_segments)
+            timestamps.extend(trial_timestamps)
+            values.extend(trial_values)
 
         if verbosity == 1:
             print("Done.")
 
-        df = pd.DataFrame({col: np.concatenate(chunks) for col, chunks in data.items()})
-        del data
+        lengths = np.array([len(segment_values) for segment_values in values], dtype=int)
+        segments = pd.DataFrame(segments, columns=segment_columns)
+        segments["offset"] = np.cumsum(lengths) - lengths
+        segments["length"] = lengths
 
-        if use_categoricals:
-            categorical_columns = [column for column in columns if column not in ["timestamp", "value"]]
-            for col in categorical_columns:
-                if col in df.columns:
-                    df[col] = df[col].astype("category")
+        timestamps = np.concatenate(timestamps) if len(timestamps) > 0 else np.array([])
+        values = np.concatenate(values) if len(values) > 0 else np.array([])
 
-        return df
+        return SegmentedDataframe(segments, timestamps, values, columns)
 
     def save_dataframe(self, folder_out="", name="dataframe", file_format="gzip", sequence_measure="distance",
                        audio_measure="envelope", sampling_frequency=None, exclude_columns=None, include_columns=None,
-                       use_categoricals=True, verbosity=1, **kwargs):
+                       use_categoricals=True, n_jobs=1, verbosity=1, **kwargs):
         """Saves a dataframe to disk.
 
         .. versionadded:: 2.0
@@ -763,6 +724,10 @@ class Experiment(object):
             Whether to use categoricals for all columns apart from timestamps and values (default: `True`). This
             parameter generally allows to drastically reduce the size of the dataframe.
 
+        n_jobs: int, optional
+            Max amount of jobs to run in parallel when creating the dataframe (default: 1). Set on -1 to use the
+            maximum amount of available cores.
+
         verbosity: int, optional
             Sets how much feedback the code will provide in the console output:
 
@@ -787,7 +752,7 @@ class Experiment(object):
             • :meth:`Audio.get_intensity`
         """
         dataframe = self.get_dataframe(sequence_measure, audio_measure, sampling_frequency, exclude_columns,
-                                       include_columns, "all", use_categoricals, verbosity, **kwargs)
+                                       include_columns, "all", use_categoricals, n_jobs, verbosity, **kwargs)
 
         if folder_out == "":
             folder_out = os.getcwd()
@@ -866,4 +831,173 @@ class Experiment(object):
         >>> experiment.add_subject(subject)
         >>> experiment["Mathilde"]
         """
-        return self.subjects[name]
\ No newline at end of file
+        return self.subjects[name]
+
+
+def _get_trial_segments(subject_name, subject_group, subject_attributes, trial_id, trial, columns, sequence_measure,
+                        audio_measure, joint_labels, sampling_frequency, timestamp_start, timestamp_end, verbosity=1,
+                        **kwargs):
+    """Returns the segments of a single trial for :meth:`Experiment.get_segmented_dataframe`: one segment per label
+    and measure. This function is defined outside the Experiment class, so that parallel workers only receive the
+    trial rather than the whole experiment.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    subject_name: str
+        The name of the subject the trial belongs to.
+
+    subject_group: str|None
+        The group of the subject the trial belongs to.
+
+    subject_attributes: dict
+        The values of the attributes of the subject matching the columns of the segment table.
+
+    trial_id: str|int
+        The key of the trial in the subject.
+
+    trial: Trial
+        The trial to get the segments from.
+
+    columns: list(str)
+        The columns of the segment table (without ``"timestamp"`` and ``"value"``).
+
+    sequence_measure: list(str)
+        The sequence measures to add to the segments.
+
+    audio_measure: list(str)
+        The audio measures to add to the segments.
+
+    joint_labels: list(str)
+        The joint labels of the experiment.
+
+    sampling_frequency: float|None
+        The frequency at which to resample the two measures, or ``None``.
+
+    timestamp_start: float|None
+        The timestamp from which to get the measures, or ``None``.
+
+    timestamp_end: float|None
+        The timestamp until which to get the measures, or ``None``.
+
+    verbosity: int, optional
+        Sets how much feedback the code will provide in the console output:
+
+        • *0: Silent mode.* The code won’t provide any feedback, apart from error messages.
+        • *1: Normal mode* (default). The code will provide essential feedback such as progression markers and
+          current steps.
+        • *2: Chatty mode.* The code will provide all possible information on the events happening. Note that this
+          may clutter the output and slow down the execution.
+
+    **kwargs: dict
+        The other parameters passed to :meth:`Experiment.get_segmented_dataframe`.
+
+    Returns
+    -------
+    list(dict)
+        For each segment, the values of the columns of the segment table.
+    list(numpy.ndarray)
+        For each segment, the timestamps.
+    list(numpy.ndarray)
+        For each segment, the values.
+    """
+    segments = []
+    segments_timestamps = []
+    segments_values = []
+
+    def _add_segment(values_to_append, timestamps, values):
+        segment = {}
+        for column in columns:
+            if column in values_to_append.keys():
+                segment[column] = values_to_append[column]
+            elif column in subject_attributes:
+                segment[column] = subject_attributes[column]
+            elif hasattr(trial, column):
+                segment[column] = getattr(trial, column)
+            else:
+                segment[column] = np.nan
+        segments.append(segment)
+        segments_timestamps.append(np.asarray(timestamps, dtype=float))
+        segments_values.append(np.asarray(values, dtype=float))
+
+    sequence = trial.sequence
+
+    if sampling_frequency is not None and sequence.get_sampling_rate() != sampling_frequency:
+        sequence = sequence.resample(sampling_frequency,
+                                     method=kwargs.get("method", "cubic"),
+                                     window_size=kwargs.get("window_size", 1e7),
+                                     overlap_ratio=kwargs.get("overlap_ratio", 0.5),
+                                     verbosity=verbosity-1)
+
+    # For each measure (mocap)
+    for measure in sequence_measure:
+        if verbosity > 1:
+            print(f"\t\t\tMeasure {measure}")
+
+        sequence_values = sequence.get_measure(measure,
+                                               timestamp_start=timestamp_start,
+                                               timestamp_end=timestamp_end,
+                                               window_length=kwargs.get("window_length", "auto"),
+                                               poly_order=kwargs.get("poly_order", "auto"),
+                                               verbosity=verbosity-1)
+
+        timestamps = sequence.get_timestamps(relative=True,
+                                             timestamp_start=timestamp_start,
+                                             timestamp_end=timestamp_end)
+
+        timestamps = timestamps[len(timestamps) - len(sequence_values[joint_labels[0]]):]
+
+        # For each joint
+        for joint_label in joint_labels:
+            values_to_append = {"subject": subject_name,
+                                "group": subject_group,
+                                "trial": trial_id,
+                                "condition": trial.condition,
+                                "modality": "mocap",
+                                "label": joint_label,
+                                "measure": CLEAN_DERIV_NAMES[measure]}
+
+            if joint_label not in sequence_values.keys():
+                _add_segment(values_to_append, timestamps, np.full(np.shape(timestamps), np.nan))
+            else:
+                _add_segment(values_to_append, timestamps, sequence_values[joint_label])
+
+    # For each measure (audio)
+    for measure in audio_measure:
+
+        if verbosity > 1:
+            print(f"\t\t\tMeasure {measure}")
+
+        audio = trial.audio
+
+        if type(audio) is Audio and measure != "audio":
+            audio = audio.get_derivative(measure,
+                                         filter_over=kwargs.get("filter_over", None),
+                                         filter_below=kwargs.get("filter_below", None),
+                                         timestamp_start=timestamp_start,
+                                         timestamp_end=timestamp_end,
+                                         verbosity=verbosity-1)
+        elif (type(audio).__name__ != measure.title() and
+              (type(audio).__name__ == "Formant" and measure not in ["f1", "f2", "f3", "f4", "f5"])):
+            raise Exception(f"Impossible to derive the measure {measure} from a {type(audio).__name__} "
+                            f"object.")
+
+        if sampling_frequency is not None and audio.frequency != sampling_frequency:
+            audio = audio.resample(sampling_frequency,
+                                   method=kwargs.get("resampling_mode", "cubic"),
+                                   window_size=kwargs.get("res_window_size", 1e7),
+                                   overlap_ratio=kwargs.get("res_overlap_ratio", 0.5),
+                                   verbosity=verbosity-1)
+
+        values_to_append = {"subject": subject_name,
+                            "group": subject_group,
+                            "trial": trial_id,
+                            "condition": trial.condition,
+                            "modality": "audio",
+                            "label": "Audio",
+                            "measure": measure}
+
+        _add_segment(values_to_append, audio.timestamps, audio.samples)
+
+    return segments, segments_timestamps, segments_values
@@ -0,0 +1,193 @@
+"""Class storing the values of an analysis in a dense array, with labelled dimensions."""
+import numpy as np
+
+
+class LabelledArray(object):
+    """Class storing values (scalars or arrays of equal shape) in a single dense NumPy array, where each dimension is
+    labelled by a list of coordinates (e.g. the joint labels). The values can be accessed as in nested dictionaries:
+    indexing a LabelledArray with a coordinate of its first dimension returns a LabelledArray of the remaining
+    dimensions (sharing the same memory), and indexing the last dimension returns the stored value.
+
+    Only the coordinates for which at least one value has been set are visible (when iterating, or with ``in``), so
+    that a LabelledArray behaves like the nested dictionaries it replaces (for example, the audio measures only have
+    values for the label ``"Audio"``).
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    dimensions: list(str)
+        The names of the dimensions (e.g. ``["target", "measure", "series", "label", "lag"]``).
+    coordinates: list(list)
+        For each dimension, the list of its coordinates.
+    values: numpy.ndarray|None, optional
+        The values, of shape ``(len(coordinates[0]), ..., len(coordinates[-1])) + value_shape``. If ``None``
+        (default), the array is created when the first value is set, with the shape and type of this value.
+    filled: numpy.ndarray|None, optional
+        An array of booleans of shape ``(len(coordinates[0]), ..., len(coordinates[-1]))``, indicating which values
+        have been set. If ``None`` (default), no value is considered as set.
+
+    Attributes
+    ----------
+    dimensions: list(str)
+        The names of the dimensions.
+    coordinates: list(list)
+        For each dimension, the list of its coordinates.
+    values: numpy.ndarray|None
+        The values, with one axis per dimension, followed by the axes of the values themselves (e.g. the frequencies
+        or the permutations). Unset values are NaN.
+    filled: numpy.ndarray
+        An array of booleans indicating which values have been set.
+
+    Example
+    -------
+    >>> averages = LabelledArray(["label", "lag"], [["Head", "HandRight"], [0, 0.1]])
+    >>> averages.set_value(["Head", 0], 0.42)
+    >>> averages["Head"][0]
+    0.42
+    >>> list(averages)
+    ['Head']
+    """
+
+    def __init__(self, dimensions, coordinates, values=None, filled=None):
+        self.dimensions = list(dimensions)
+        self.coordinates = [list(coordinates_dimension) for coordinates_dimension in coordinates]
+        self.values = values
+        if filled is None:
+            filled = np.zeros([len(coordinates_dimension) for coordinates_dimension in self.coordinates], dtype=bool)
+        self.filled = filled
+
+    def get_index(self, dimension, coordinate):
+        """Returns the index of a coordinate along a dimension.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        ----------
+        dimension: int|str
+            The index or the name of the dimension.
+        coordinate: any
+            A coordinate of the dimension.
+
+        Returns
+        -------
+        int
+            The index of the coordinate.
+        """
+        if isinstance(dimension, str):
+            dimension = self.dimensions.index(dimension)
+        try:
+            return self.coordinates[dimension].index(coordinate)
+        except ValueError:
+            raise KeyError(coordinate)
+
+    def get_indices(self, keys):
+        """Returns the tuple of the indices of the coordinates given for the first dimensions.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        ----------
+        keys: list|tuple
+            A coordinate for each of the first ``len(keys)`` dimensions.
+
+        Returns
+        -------
+        tuple(int)
+            The indices of the coordinates.
+        """
+        return tuple(self.get_index(dimension, key) for dimension, key in enumerate(keys))
+
+    def set_value(self, keys, value):
+        """Sets the value at the given coordinates (one per dimension).
+
+        .. versionadded:: 2.0
+
+        Parameters
+        ----------
+        keys: list|tuple
+            A coordinate for each dimension.
+        value: number|numpy.ndarray
+            The value to set. All the values must have the same shape.
+        """
+        if self.values is None:
+            dtype = np.result_type(np.asarray(value).dtype, float)
+            self.values = np.full(self.filled.shape + np.shape(value), np.nan, dtype=dtype)
+        elif np.shape(value) != self.values.shape[self.filled.ndim:]:
+            raise ValueError(f"At least one element does not have the same length as the others: expected a shape "
+                             f"{self.values.shape[self.filled.ndim:]}, got {np.shape(value)}.")
+
+        indices = self.get_indices(keys)
+        self.values[indices] = value
+        self.filled[indices] = True
+
+    def has_value(self, keys):
+        """Returns ``True`` if a value has been set at the given coordinates (one per dimension).
+
+        .. versionadded:: 2.0
+
+        Parameters
+        ----------
+        keys: list|tuple
+            A coordinate for each dimension.
+
+        Returns
+        -------
+        bool
+            ``True`` if a value has been set, ``False`` otherwise.
+        """
+        try:
+            return bool(self.filled[self.get_indices(keys)])
+        except KeyError:
+            return False
+
+    def keys(self):
+        """Returns the coordinates of the first dimension for which at least one value has been set.
+
+        .. versionadded:: 2.0
+
+        Returns
+        -------
+        list
+            The coordinates of the first dimension.
+        """
+        if self.filled.size == 0:
+            return []
+        filled = self.filled.reshape(self.filled.shape[0], -1).any(axis=1)
+        return [coordinate for coordinate, is_filled in zip(self.coordinates[0], filled) if is_filled]
+
+    def items(self):
+        """Returns the pairs (coordinate, sub-array or value) of the first dimension, as :meth:`dict.items` would.
+
+        .. versionadded:: 2.0
+
+        Returns
+        -------
+        list(tuple)
+            The pairs (coordinate, sub-array or value).
+        """
+        return [(key, self[key]) for key in self.keys()]
+
+    def __getitem__(self, key):
+        index = self.get_index(0, key)
+        if not self.filled[index].any():
+            raise KeyError(key)
+        if len(self.dimensions) == 1:
+            return self.values[index]
+        return LabelledArray(self.dimensions[1:], self.coordinates[1:], self.values[index], self.filled[index])
+
+    def __contains__(self, key):
+        return key in self.keys()
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __repr__(self):
+        shape = " × ".join([f"{len(coordinates)} {dimension}" for dimension, coordinates in
+                            zip(self.dimensions, self.coordinates)])
+        if self.values is not None and self.values.ndim > self.filled.ndim:
+            shape += " × " + " × ".join([str(size) for size in self.values.shape[self.filled.ndim:]])
+        return f"LabelledArray ({shape}), {np.sum(self.filled)} values set"
@@ -5,6 +5,8 @@ import numpy as np
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from krajjat.classes.labelled_array import LabelledArray
+
 
 class Results(object):
 
@@ -69,6 +71,12 @@ class Results(object):
         self.mi_scale = analysis_parameters.get("mi_scale", "standard")
         self.mi_direction = analysis_parameters.get("mi_direction", "target")
 
+        # Raw values of a shard, combined by Results.merge
+        self.shard = analysis_parameters.get("shard", None)
+        self.shard_parameters = analysis_parameters.get("shard_parameters", None)
+        self.analysis_values = analysis_results.get("analysis_values", {})
+        self.randperm_values = analysis_results.get("randperm_values", {})
+
         self.plot_dictionary = plot_dictionary
 
         self.timestamp = timestamp
@@ -77,13 +85,20 @@ class Results(object):
     # ── Serialization helpers ─────────────────────────────────────────────────
 
     @staticmethod
-    def _encode(obj):
+    def _encode(obj, arrays=None):
         """Recursively convert an object to a JSON-serialisable structure.
 
         Handles: numpy arrays/scalars, tuples (including as dict keys), datetime,
-        timedelta, and Graph/GraphPlot objects.
+        timedelta, and Graph/GraphPlot/LabelledArray objects.
+
+        If ``arrays`` is a dict, the numpy arrays are stored in it instead of being converted
+        to lists, and replaced by a reference to their key (see :meth:`Results.save`).
         """
         if isinstance(obj, np.ndarray):
+            if arrays is not None and obj.dtype != object:
+                key = f"array_{len(arrays)}"
+                arrays[key] = obj
+                return {"__type__": "array_ref", "key": key}
             return {"__type__": "ndarray", "data": obj.tolist(), "dtype": str(obj.dtype)}
         elif isinstance(obj, np.integer):
             return int(obj)
@@ -96,28 +111,29 @@ class Results(object):
         elif isinstance(obj, timedelta):
             return {"__type__": "timedelta", "seconds": obj.total_seconds()}
         elif isinstance(obj, tuple):
-            return {"__type__": "tuple", "data": [Results._encode(v) for v in obj]}
+            return {"__type__": "tuple", "data": [Results._encode(v, arrays) for v in obj]}
         elif isinstance(obj, dict):
             return {
                 "__type__": "dict",
-                "items": [[Results._encode(k), Results._encode(v)] for k, v in obj.items()]
+                "items": [[Results._encode(k, arrays), Results._encode(v, arrays)] for k, v in obj.items()]
             }
         elif isinstance(obj, list):
-            return [Results._encode(v) for v in obj]
+            return [Results._encode(v, arrays) for v in obj]
         elif hasattr(obj, "__dict__"):
-            # Graph and GraphPlot — serialise by class name + attributes
+            # Graph, GraphPlot and LabelledArray — serialise by class name + attributes
             return {
                 "__type__": "object",
                 "class": type(obj).__name__,
-                "attrs": Results._encode(obj.__dict__)
+                "attrs": Results._encode(obj.__dict__, arrays)
             }
         return obj
 
     @staticmethod
-    def _decode(obj):
-        """Recursively restore a JSON-decoded structure to its original Python types."""
+    def _decode(obj, arrays=None):
+        """Recursively restore a JSON-decoded structure to its original Python types. The
+        array references are read from ``arrays`` (an opened ``.npz`` file)."""
         if isinstance(obj, list):
-            return [Results._decode(v) for v in obj]
+            return [Results._decode(v, arrays) for v in obj]
         if not isinstance(obj, dict):
             return obj
 
@@ -125,23 +141,25 @@ class Results(object):
 
         if t == "ndarray":
             return np.array(obj["data"], dtype=obj["dtype"])
+        elif t == "array_ref":
+            return arrays[obj["key"]]
         elif t == "datetime":
             return datetime.fromisoformat(obj["data"])
         elif t == "timedelta":
             return timedelta(seconds=obj["seconds"])
         elif t == "tuple":
-            return tuple(Results._decode(v) for v in obj["data"])
+            return tuple(Results._decode(v, arrays) for v in obj["data"])
         elif t == "dict":
-            return {Results._decode(k): Results._decode(v) for k, v in obj["items"]}
+            return {Results._decode(k, arrays): Results._decode(v, arrays) for k, v in obj["items"]}
         elif t == "object":
-            return Results._restore_object(obj["class"], Results._decode(obj["attrs"]))
+            return Results._restore_object(obj["class"], Results._decode(obj["attrs"], arrays))
 
         # Plain JSON dict with no __type__ tag (e.g. from older saves) — decode values
-        return {k: Results._decode(v) for k, v in obj.items()}
+        return {k: Results._decode(v, arrays) for k, v in obj.items()}
 
     @staticmethod
     def _restore_object(class_name, attrs):
-        """Reconstruct a Graph or GraphPlot from its serialised attributes."""
+        """Reconstruct a Graph, GraphPlot or LabelledArray from its serialised attributes."""
         try:
             from krajjat.classes.graph_element import Graph, GraphPlot
         except ImportError:
@@ -154,14 +172,17 @@ class Results(object):
             obj = Graph.__new__(Graph)
         elif class_name == "GraphPlot":
             obj = GraphPlot.__new__(GraphPlot)
+        elif class_name == "LabelledArray":
+            obj = LabelledArray.__new__(LabelledArray)
         else:
             # Unknown class — keep as plain dict rather than silently losing data
             return attrs
         obj.__dict__.update(attrs)
         return obj
 
-    def _build_payload(self):
-        """Assemble the full serialisable payload from self."""
+    def _build_payload(self, arrays=None):
+        """Assemble the full serialisable payload from self. If ``arrays`` is a dict, the numpy
+        arrays are stored in it (see :meth:`Results._encode`)."""
         analysis_parameters = {
             "analysis":             self.analysis,
             "method":               self.method,
@@ -204,6 +225,8 @@ class Results(object):
             "n_neighbors":          self.n_neighbors,
             "mi_scale":             self.mi_scale,
             "mi_direction":         self.mi_direction,
+            "shard":                self.shard,
+            "shard_parameters":     self.shard_parameters,
         }
         analysis_results = {
             "frequencies":      self.frequencies,
@@ -214,30 +237,52 @@ class Results(object):
             "z_scores":         self.z_scores,
             "p_values":         self.p_values,
             "background_fits":  self.background_fits,
+            "analysis_values":  self.analysis_values,
+            "randperm_values":  self.randperm_values,
         }
+        if arrays is None:
+            encoded_results = Results._encode(analysis_results)
+        else:
+            # Each result is encoded separately, so that it can be decoded on first access (see Results.load)
+            encoded_results = {name: Results._encode(value, arrays) for name, value in analysis_results.items()}
         return {
             "krajjat_results_version": 1,
-            "analysis_parameters": Results._encode(analysis_parameters),
-            "analysis_results":    Results._encode(analysis_results),
-            "plot_dictionary":     Results._encode(self.plot_dictionary),
+            "analysis_parameters": Results._encode(analysis_parameters, arrays),
+            "analysis_results":    encoded_results,
+            "plot_dictionary":     Results._encode(self.plot_dictionary, arrays),
             "timestamp":           Results._encode(self.timestamp),
             "duration":            Results._encode(self.duration),
         }
 
     def save(self, path):
-        """Save the Results object to a JSON file.
+        """Save the Results object to a JSON file, or to a binary ``.npz`` file.
+
+        With the ``.npz`` extension, the parameters and the structure of the results are stored in a
+        small JSON header, and the numpy arrays are stored natively next to it. This format is much
+        more compact and faster to load than JSON for large results (e.g. with many permutations or
+        frequencies). The JSON format remains human-readable.
 
         Parameters
         ----------
         path : str or Path
-            Destination file path. The appropriate extension is added automatically
-            if not already present.
+            Destination file path. If the extension is ``.npz``, the binary format is used; otherwise,
+            the ``.json`` extension is added automatically if not already present.
 
         Examples
         --------
         >>> out.save("results/coherence_velocity.json")           # JSON, lossless
+        >>> out.save("results/coherence_velocity.npz")            # Binary, lossless
         """
         path = Path(path)
+        if path.suffix == ".npz":
+            os.makedirs(path.parent, exist_ok=True)
+            arrays = {}
+            header = json.dumps(self._build_payload(arrays), ensure_ascii=False)
+            with open(path, "wb") as f:
+                np.savez(f, header=np.array(header), **arrays)
+            print(f"Results saved to {path}")
+            return
+
         if path.suffix != ".json":
             path = path.with_suffix(".json")
         os.makedirs(path.parent, exist_ok=True)
@@ -250,10 +295,14 @@ class Results(object):
         """Load a Results object previously saved with :meth:`Results.save`.
         The loaded object includes the full plot dictionary and can be passed directly to :func:`plot_body_graphs`.
 
+        For a ``.npz`` file, only the parameters, the frequencies and the plot dictionary are read when
+        loading. The other results (averages, z-scores, permutations...) are read from the file the first
+        time they are accessed, so the file must not be moved or deleted before.
+
         Parameters
         ----------
         path : str or Path
-            Path to the ``.json`` file.
+            Path to the ``.json`` or ``.npz`` file.
 
         Returns
         -------
@@ -266,6 +315,9 @@ class Results(object):
         >>> plot_body_graphs(out.plot_dictionary, ...)
         """
         path = Path(path)
+        if path.suffix == ".npz":
+            return cls._load_npz(path)
+
         if path.suffix != ".json":
             path = path.with_suffix(".json")
 
@@ -284,6 +336,117 @@ class Results(object):
 
         return cls(analysis_parameters, analysis_results, plot_dictionary, timestamp, duration)
 
+    @classmethod
+    def _load_npz(cls, path):
+        """Load a Results object from a ``.npz`` file, leaving the large results to be read on first access."""
+        with np.load(path, allow_pickle=False) as arrays:
+            raw = json.loads(str(arrays["header"]))
+
+            version = raw.get("krajjat_results_version", 1)
+            if version != 1:
+                raise ValueError(f"Unsupported results file version: {version}")
+
+            analysis_parameters = cls._decode(raw["analysis_parameters"], arrays)
+            frequencies         = cls._decode(raw["analysis_results"].pop("frequencies"), arrays)
+            plot_dictionary     = cls._decode(raw["plot_dictionary"], arrays)
+            timestamp           = cls._decode(raw["timestamp"])
+            duration            = cls._decode(raw["duration"])
+
+        results = cls(analysis_parameters, {"frequencies": frequencies}, plot_dictionary, timestamp, duration)
+
+        # The other results are decoded by __getattr__ when they are first accessed
+        for name in raw["analysis_results"]:
+            delattr(results, name)
+        results._lazy_path = path
+        results._lazy_results = raw["analysis_results"]
+
+        return results
+
+    def __getattr__(self, name):
+        # Only called when the attribute is not found: decodes the results not read yet from a .npz file
+        lazy_results = self.__dict__.get("_lazy_results", {})
+        if name not in lazy_results:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+        with np.load(self.__dict__["_lazy_path"], allow_pickle=False) as arrays:
+            value = Results._decode(lazy_results[name], arrays)
+        setattr(self, name, value)
+        del lazy_results[name]
+        return value
+
+    @classmethod
+    def merge(cls, shards, verbosity=1):
+        """Combines the results of the shards of an analysis into the results that the analysis would have returned if
+        it had been run at once. Each shard is the output of an analysis function (e.g. :func:`coherence`) run with the
+        same parameters, except for the parameter ``shard``, which must go from ``(0, n)`` to ``(n - 1, n)``. The
+        shards can be computed on different machines, saved with :meth:`Results.save`, and loaded with
+        :meth:`Results.load` before being merged.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        ----------
+        shards: list(Results)
+            The results of all the shards of an analysis, in any order.
+        verbosity: int, optional
+            Sets how much feedback the code will provide in the console output:
+
+            • *0: Silent mode.* The code won’t provide any feedback, apart from error messages.
+            • *1: Normal mode* (default). The code will provide essential feedback such as progression markers and
+              current steps.
+            • *2: Chatty mode.* The code will provide all possible information on the events happening. Note that
+              this may clutter the output and slow down the execution.
+
+        Returns
+        -------
+        Results
+            The results of the full analysis, with the averages, z-scores and plot dictionary, and the plot is shown as
+            for an analysis run at once.
+
+        Examples
+        --------
+        >>> shards = [Results.load(f"results/coherence_shard_{i}.json") for i in range(10)]
+        >>> out = Results.merge(shards)
+        """
+        from krajjat.classes.analysis_parameters import AnalysisParameters
+        from krajjat.analysis_functions import _summarize_analysis
+
+        if len(shards) == 0:
+            raise ValueError("At least one shard is needed to merge the results.")
+        for shard in shards:
+            if shard.shard is None:
+                raise ValueError("Only the results of an analysis run with the parameter shard can be merged.")
+
+        shards = sorted(shards, key=lambda result: result.shard[0])
+        number_of_shards = shards[0].shard[1]
+        if [shard.shard for shard in shards] != [(i, number_of_shards) for i in range(number_of_shards)]:
+            raise ValueError(f"The shards to merge must go from (0, {number_of_shards}) to ({number_of_shards - 1}, "
+                             f"{number_of_shards}), each appearing once. Got: {[shard.shard for shard in shards]}.")
+
+        for shard in shards[1:]:
+            for attribute in ("analysis", "method", "permutation_method", "number_of_randperms", "random_seed",
+                              "lags", "individuals", "labels", "series_values", "target_measures"):
+                if not np.array_equal(np.asarray(getattr(shard, attribute), dtype=object),
+                                      np.asarray(getattr(shards[0], attribute), dtype=object)):
+                    raise ValueError(f"The shards were not computed with the same parameters: the attribute "
+                                     f"{attribute} differs between the shards {shards[0].shard} and {shard.shard}.")
+
+        # The permutations of each shard follow those of the previous shards, as in an analysis run at once
+        randperm_values = shards[0].randperm_values
+        shard_values = [shard.randperm_values.values for shard in shards if shard.randperm_values.values is not None]
+        if len(shard_values) > 0:
+            randperm_values = LabelledArray(randperm_values.dimensions, randperm_values.coordinates,
+                                            np.concatenate(shard_values, axis=randperm_values.filled.ndim),
+                                            np.logical_or.reduce([shard.randperm_values.filled for shard in shards]))
+
+        params = AnalysisParameters._from_state(shards[0].shard_parameters)
+        params.shard = None
+        params.verbosity = verbosity
+
+        time_start = datetime.now() - sum((shard.duration for shard in shards), timedelta())
+        return _summarize_analysis(params, shards[0].analysis_values, randperm_values, shards[0].frequencies,
+                                   time_start)
+
     def __repr__(self):
         out = []
 
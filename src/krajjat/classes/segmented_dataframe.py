@@ -0,0 +1,156 @@
+"""Class storing the data of an experiment as a table of segments, pointing to contiguous arrays of values."""
+import numpy as np
+import pandas as pd
+
+
+class SegmentedDataframe(object):
+    """Class storing the data of an experiment in a compact form: a table of segments, with one row per subject,
+    trial, label and measure, and two contiguous arrays containing the timestamps and the values of all the segments.
+    Each row of the table contains the columns describing the segment (e.g. ``"subject"``, ``"trial"``, ``"label"``,
+    ``"measure"``), along with the ``"offset"`` and the ``"length"`` of the segment in the arrays.
+
+    Contrary to the dataframe returned by :meth:`Experiment.get_dataframe`, the values of the descriptive columns are
+    not repeated for every timestamp. The long dataframe can be obtained on demand with :meth:`to_dataframe`, and the
+    analysis functions accept a SegmentedDataframe wherever they accept a dataframe: the segments are then filtered,
+    and the values of the selected segments are read directly from the arrays (:func:`power_spectrum`,
+    :func:`correlation`, :func:`coherence`, :func:`mutual_information`) or expanded into a long dataframe containing
+    only the selected data (:func:`pca`, :func:`ica`).
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    segments: pandas.DataFrame
+        The table of the segments, containing the columns ``"offset"`` and ``"length"``.
+    timestamps: numpy.ndarray
+        The timestamps of all the segments.
+    values: numpy.ndarray
+        The values of all the segments, of the same length as ``timestamps``.
+    columns: list(str)|None, optional
+        The columns of the long dataframe, in order. If ``None`` (default), the columns of the segment table (apart from
+        ``"offset"`` and ``"length"``), followed by ``"timestamp"`` and ``"value"``.
+
+    Attributes
+    ----------
+    segments: pandas.DataFrame
+        The table of the segments.
+    timestamps: numpy.ndarray
+        The timestamps of all the segments.
+    values: numpy.ndarray
+        The values of all the segments.
+    columns: list(str)
+        The columns of the long dataframe.
+
+    Example
+    -------
+    >>> segmented = experiment.get_segmented_dataframe("velocity", "envelope")
+    >>> segmented.segments.head()
+    >>> timestamps, values = segmented.get_segment(0)
+    >>> dataframe = segmented.to_dataframe()
+    """
+
+    def __init__(self, segments, timestamps, values, columns=None):
+        self.segments = segments.reset_index(drop=True)
+        self.timestamps = np.asarray(timestamps)
+        self.values = np.asarray(values)
+        if len(self.timestamps) != len(self.values):
+            raise ValueError(f"The timestamps ({len(self.timestamps)}) and the values ({len(self.values)}) must have "
+                             f"the same length.")
+        if columns is None:
+            columns = [column for column in self.segments.columns if column not in ["offset", "length"]]
+            columns += ["timestamp", "value"]
+        self.columns = list(columns)
+
+    def get_segment(self, index):
+        """Returns the timestamps and the values of a segment. The returned arrays are views on the arrays of the
+        SegmentedDataframe.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        ----------
+        index: int
+            The index of the segment, in the segment table.
+
+        Returns
+        -------
+        numpy.ndarray
+            The timestamps of the segment.
+        numpy.ndarray
+            The values of the segment.
+        """
+        offset = self.segments["offset"].iat[index]
+        length = self.segments["length"].iat[index]
+        return self.timestamps[offset:offset + length], self.values[offset:offset + length]
+
+    def get_subset(self, segments):
+        """Returns a SegmentedDataframe containing only some of the segments, sharing the arrays of this one.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        ----------
+        segments: pandas.DataFrame
+            A subset of the rows of the segment table (e.g. ``segmented.segments.loc[segmented.segments["subject"] ==
+            "Alice"]``).
+
+        Returns
+        -------
+        SegmentedDataframe
+            A SegmentedDataframe containing the given segments.
+        """
+        return SegmentedDataframe(segments, self.timestamps, self.values, self.columns)
+
+    def to_dataframe(self, use_categoricals=True):
+        """Returns the data as a long dataframe, with one row per timestamp of each segment, as returned by
+        :meth:`Experiment.get_dataframe`.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        ----------
+        use_categoricals: bool, optional
+            Whether to use categoricals for all columns apart from timestamps and values (default: `True`). The
+            categorical columns are created from the codes of the segment table, without creating the repeated values.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The long dataframe.
+        """
+        lengths = self.segments["length"].to_numpy(dtype=int)
+        offsets = self.segments["offset"].to_numpy(dtype=int)
+
+        # Indices of the rows of each segment in the arrays
+        starts = offsets - (np.cumsum(lengths) - lengths)
+        indices = np.repeat(starts, lengths) + np.arange(np.sum(lengths))
+
+        data = {}
+        for column in self.columns:
+            if column == "timestamp":
+                data[column] = self.timestamps[indices]
+            elif column == "value":
+                data[column] = self.values[indices]
+            elif use_categoricals:
+                categorical = pd.Categorical(self.segments[column].to_numpy(dtype=object))
+                data[column] = pd.Categorical.from_codes(np.repeat(categorical.codes, lengths),
+                                                         categories=categorical.categories)
+            else:
+                data[column] = np.repeat(self.segments[column].to_numpy(dtype=object), lengths)
+
+        return pd.DataFrame(data)
+
+    def __len__(self):
+        """Returns the number of rows of the long dataframe (the sum of the lengths of the segments).
+
+        .. versionadded:: 2.0
+
+        Returns
+        -------
+        int
+            The number of rows of the long dataframe.
+        """
+        return int(self.segments["length"].sum())
+
+    def __repr__(self):
+        return f"SegmentedDataframe ({len(self.segments)} segments, {len(self)} rows)"
@@ -19,7 +19,8 @@ from krajjat.classes.joint import Joint
 from krajjat.classes.exceptions import *
 from krajjat.classes.time_series import TimeSeries
 from krajjat.tool_functions import (convert_timestamp_to_seconds, show_progression, read_json, read_xlsx,
-                                    read_text_table, write_xlsx, write_text_table, get_system_csv_separator,
+                                    read_text_table, read_text_table_array, read_npz, read_json_stream, write_xlsx,
+                                    write_text_table, get_system_csv_separator,
                                     load_joint_labels, load_qualisys_to_kinect, calculate_distance,
                                     calculate_derivative, calculate_delay, resample_data, interpolate_data,
                                     generate_random_joints, UNITS,
@@ -88,6 +89,11 @@ class Sequence(TimeSeries):
         set at 0, and the timestamps of the other poses will be reassigned to keep the same delay from the first pose.
         As such, the attributes timestamp and relative_timestamp from every pose will be equal.
 
+    max_poses: int or None, optional
+        If set, only the first ``max_poses`` poses of the recording are loaded. For global ``.json`` files, the other
+        poses are read one by one and discarded, so that the metadata placed after the poses is still loaded, while
+        the memory used only depends on ``max_poses``. If set on ``None`` (default), all the poses are loaded.
+
     verbosity: int, optional
         Sets how much feedback the code will provide in the console output:
 
@@ -111,7 +117,9 @@ class Sequence(TimeSeries):
     files: list(str)
         List of files contained in the path. The list will be of size 1 if the path points to a single file.
     poses: list(Pose)
-        List of all the :class:`Pose` objects of the :class:`Sequence`.
+        List of all the :class:`Pose` objects of the :class:`Sequence`. When the sequence is loaded from a single file,
+        the poses are stored internally as arrays, and the Pose objects are only created the first time this attribute
+        is accessed.
     is_randomized: bool
         Testifies if the starting position of the joints have been randomized by the function
         :meth:`Sequence.randomize()`. Is ``False`` upon initialisation.
@@ -134,7 +142,7 @@ class Sequence(TimeSeries):
     """
 
     def __init__(self, path=None, path_audio=None, name=None, condition=None, time_unit="auto", system="auto",
-                 start_timestamps_at_zero=False, verbosity=1):
+                 start_timestamps_at_zero=False, max_poses=None, verbosity=1):
 
         super().__init__("Sequence", path, name, condition, verbosity)
 
@@ -142,7 +150,12 @@ class Sequence(TimeSeries):
 
         self.path_audio = path_audio  # Path to the audio file matched with this series of gestures
 
-        self.poses = []  # List of the poses in the sequence, ordered
+        self._poses = []  # List of the Pose objects, or None if the poses are only stored in the arrays below
+        self._timestamps_array = None  # Timestamps of the poses, shape (n_poses,)
+        self._relative_timestamps_array = None  # Relative timestamps of the poses, shape (n_poses,)
+        self._coordinates_array = None  # Coordinates of the joints, shape (n_poses, n_joints, 3)
+        self._none_mask = None  # True where a coordinate is None rather than a number, same shape as the coordinates
+        self._array_joint_labels = None  # Joint labels matching the second axis of the coordinates array
         self.joint_labels = []  # Name of the joint labels contained in the sequence
         self.system = system.lower()  # Placeholder for Kinect, Qualisys, OpenPose, etc.
         self.dimensions = 0  # Dimensionality of the data (2D, 3D) - unused as of v2.0.
@@ -154,7 +167,7 @@ class Sequence(TimeSeries):
         self.time_unit = time_unit  # Time unit of the timestamps.
 
         if path is not None:
-            self._load_from_path(verbosity)
+            self._load_from_path(max_poses, verbosity)
 
         if self.time_unit == "auto":
             self._set_time_unit()
@@ -169,6 +182,208 @@ class Sequence(TimeSeries):
         self._apply_joint_labels(None, True, verbosity)
         self._set_system(verbosity)
 
+    # === Storage functions ===
+    @property
+    def poses(self):
+        """List of all the :class:`Pose` objects of the sequence, in chronological order. If the sequence is stored
+        as arrays (typically, after being loaded from a single file), the Pose and Joint objects are created upon the
+        first access of this attribute, and the arrays are discarded.
+
+        .. versionadded:: 2.0
+        """
+        if self._poses is None:
+            self._create_poses_from_arrays()
+        return self._poses
+
+    @poses.setter
+    def poses(self, poses):
+        self._poses = poses
+        self._timestamps_array = None
+        self._relative_timestamps_array = None
+        self._coordinates_array = None
+        self._none_mask = None
+        self._array_joint_labels = None
+
+    def __setstate__(self, state):
+        """Restores a pickled sequence. The sequences pickled with a version of the toolbox prior to 2.0 contain an
+        attribute ``poses`` instead of ``_poses`` and the arrays: the poses are then set through the property setter.
+
+        .. versionadded:: 2.0
+        """
+        state = dict(state)
+        legacy_poses = state.pop("poses", None)
+        self.__dict__.update(state)
+        if legacy_poses is not None or "_poses" not in state:
+            self.poses = legacy_poses if legacy_poses is not None else []
+
+    def _is_stored_as_arrays(self):
+        """Returns `True` if the poses of the sequence are stored as arrays, and `False` if they are stored as a list of
+        Pose objects in the attribute :attr:`poses`.
+
+        .. versionadded:: 2.0
+
+        Returns
+        -------
+        bool
+            `True` if the poses of the sequence are stored as arrays.
+        """
+        return self._poses is None
+
+    def _set_arrays(self, timestamps, coordinates, joint_labels, none_mask=None, relative_timestamps=None):
+        """Stores the poses of the sequence as arrays, replacing any existing Pose object. This storage avoids the
+        creation of one Pose object per timestamp and one Joint object per joint and timestamp.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        ----------
+        timestamps: numpy.ndarray
+            The timestamps of the poses, with shape (n_poses,).
+
+        coordinates: numpy.ndarray
+            The coordinates of the joints, with shape (n_poses, n_joints, 3). Missing coordinates can be set on
+            ``numpy.nan``.
+
+        joint_labels: list(str)
+            The labels of the joints, in the same order as the second axis of ``coordinates``.
+
+        none_mask: numpy.ndarray or None, optional
+            A boolean array with the same shape as ``coordinates``, set on `True` for the coordinates that are
+            ``None``. If set on ``None`` (default), no coordinate is considered to be ``None``.
+
+        relative_timestamps: numpy.ndarray or None, optional
+            The relative timestamps of the poses, with shape (n_poses,). If set on ``None`` (default), the relative
+            timestamps will be calculated by :meth:`Sequence._calculate_relative_timestamps`.
+        """
+        self._poses = None
+        self._timestamps_array = timestamps
+        self._relative_timestamps_array = relative_timestamps
+        self._coordinates_array = coordinates
+        if none_mask is None:
+            none_mask = np.zeros(coordinates.shape, dtype=bool)
+        self._none_mask = none_mask
+        self._array_joint_labels = list(joint_labels)
+
+    def _get_timestamps_array(self, relative=False):
+        """Returns the timestamps of the poses as an array, without creating the Pose objects if the sequence is stored
+        as arrays.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        ----------
+        relative: bool, optional
+            If set on `True`, returns the relative timestamps instead of the original timestamps.
+
+        Returns
+        -------
+        numpy.ndarray
+            The timestamps of the poses, with shape (n_poses,).
+        """
+        if self._is_stored_as_arrays():
+            if relative:
+                return self._relative_timestamps_array
+            return self._timestamps_array
+
+        if relative:
+            return np.array([pose.relative_timestamp for pose in self._poses], dtype=float)
+        return np.array([pose.timestamp for pose in self._poses], dtype=float)
+
+    def _get_coordinates_array(self, joint_labels=None):
+        """Returns the coordinates of the joints as an array, without creating the Pose objects if the sequence is
+        stored as arrays. The coordinates equal to ``None`` are returned as ``numpy.nan``.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        ----------
+        joint_labels: list(str)|None, optional
+            The joint labels to return the coordinates from, in the order of the second axis of the returned array. If
+            set on ``None`` (default), all the joint labels of the sequence are returned, in the order of the
+            attribute :attr:`joint_labels`.
+
+        Returns
+        -------
+        numpy.ndarray
+            The coordinates of the joints, with shape (n_poses, n_joints, 3).
+
+        Warning
+        -------
+        If the sequence is stored as arrays, the returned array may share its memory with the sequence, and should not
+        be modified.
+        """
+        if joint_labels is None:
+            joint_labels = self.joint_labels
+
+        if self._is_stored_as_arrays():
+            if joint_labels == self._array_joint_labels:
+                return self._coordinates_array
+            label_indices = {label: j for j, label in enumerate(self._array_joint_labels)}
+            return self._coordinates_array[:, [label_indices[label] for label in joint_labels]]
+
+        coordinates = [[(None, None, None) if pose.joints[label] is None else
+                        (pose.joints[label].x, pose.joints[label].y, pose.joints[label].z) for label in joint_labels]
+                       for pose in self._poses]
+        return np.array(coordinates, dtype=float).reshape((len(self._poses), len(joint_labels), 3))
+
+    def _get_none_mask_array(self, joint_labels=None):
+        """Returns a boolean array set on `True` for the coordinates of the joints that are ``None``, without creating the
+        Pose objects if the sequence is stored as arrays.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        ----------
+        joint_labels: list(str)|None, optional
+            The joint labels to return the mask from, in the order of the second axis of the returned array. If set on
+            ``None`` (default), all the joint labels of the sequence are returned, in the order of the attribute
+            :attr:`joint_labels`.
+
+        Returns
+        -------
+        numpy.ndarray
+            A boolean array with shape (n_poses, n_joints, 3).
+        """
+        if joint_labels is None:
+            joint_labels = self.joint_labels
+
+        if self._is_stored_as_arrays():
+            if joint_labels == self._array_joint_labels:
+                return self._none_mask
+            label_indices = {label: j for j, label in enumerate(self._array_joint_labels)}
+            return self._none_mask[:, [label_indices[label] for label in joint_labels]]
+
+        none_mask = [[(True, True, True) if pose.joints[label] is None else
+                      (pose.joints[label].x is None, pose.joints[label].y is None, pose.joints[label].z is None)
+                      for label in joint_labels] for pose in self._poses]
+        return np.array(none_mask, dtype=bool).reshape((len(self._poses), len(joint_labels), 3))
+
+    def _create_poses_from_arrays(self):
+        """Creates the Pose and Joint objects from the arrays storing the sequence, sets them in the attribute
+        :attr:`poses`, and discards the arrays.
+
+        .. versionadded:: 2.0
+        """
+        timestamps = self._timestamps_array.tolist()
+        if self._relative_timestamps_array is None:
+            relative_timestamps = [None] * len(timestamps)
+        else:
+            relative_timestamps = self._relative_timestamps_array.tolist()
+        coordinates = self._coordinates_array.astype(object)
+        coordinates[self._none_mask] = None
+        coordinates = coordinates.tolist()
+        joint_labels = self._array_joint_labels
+
+        poses = []
+        for p in range(len(timestamps)):
+            pose = Pose(timestamps[p])
+            pose.relative_timestamp = relative_timestamps[p]
+            for j in range(len(joint_labels)):
+                pose.joints[joint_labels[j]] = Joint(joint_labels[j], *coordinates[p][j])
+            poses.append(pose)
+
+        self.poses = poses
+
     # === Name and setter functions ===
     def set_name(self, name):
         """Sets the :py:attr:`name` attribute of the Sequence instance. This name can be used as display functions or as
@@ -261,6 +476,12 @@ class Sequence(TimeSeries):
         >>> seq11.get_timestamps()
         [4.8, 4.9, 5.0]
         """
+        if self._is_stored_as_arrays():
+            time_difference = (convert_timestamp_to_seconds(first_timestamp, time_unit) -
+                               float(self._timestamps_array[0]))
+            self._timestamps_array = self._timestamps_array + time_difference
+            return
+
         original_starting_timestamp = self.poses[0].get_timestamp()
         time_difference = convert_timestamp_to_seconds(first_timestamp, time_unit) - original_starting_timestamp
 
@@ -406,17 +627,18 @@ class Sequence(TimeSeries):
         ``"10ns"``, ``"100ns"``, ``"µs"``, ``"1µs"``, ``"10µs"``, ``"100µs"``, ``"ms"``, ``"1ms"``, ``"10ms"``,
         ``"100ms"``, ``"s"``, ``"sec"``, ``"1s"``, ``"min"``, ``"mn"``, ``"h"``, ``"hr"``, ``"d"``, ``"day"``."""
         if self.time_unit == "auto":
-            if len(self.poses) > 1:
-                if self.poses[1].get_timestamp() - self.poses[0].get_timestamp() >= 1000:
+            if self.get_number_of_poses() > 1:
+                timestamps = self._get_timestamps_array()
+                if timestamps[1] - timestamps[0] >= 1000:
                     self.time_unit = "100ns"
-                elif self.poses[1].get_timestamp() - self.poses[0].get_timestamp() >= 1:
+                elif timestamps[1] - timestamps[0] >= 1:
                     self.time_unit = "ms"
                 else:
                     self.time_unit = "s"
             else:
                 self.time_unit = "s"
 
-    def _load_from_path(self, verbosity=1):
+    def _load_from_path(self, max_poses=None, verbosity=1):
         """Loads the sequence data from the :attr:`path` provided during the initialization, and calculates the relative
         timestamps from the first pose for each pose.
 
@@ -424,6 +646,10 @@ class Sequence(TimeSeries):
 
         Parameters
         ----------
+        max_poses: int or None, optional
+            If set, only the first ``max_poses`` poses are loaded. If set on ``None`` (default), all the poses are
+            loaded.
+
         verbosity: int, optional
             Sets how much feedback the code will provide in the console output:
 
@@ -436,14 +662,14 @@ class Sequence(TimeSeries):
 
         super()._load_from_path(verbosity)
 
-        self._load_poses(verbosity)  # Loads the files into poses
+        self._load_poses(max_poses, verbosity)  # Loads the files into poses
 
-        if len(self.poses) == 0:
+        if self.get_number_of_poses() == 0:
             raise EmptyInstanceException("Sequence")
 
         self._load_date_recording(verbosity)
 
-    def _load_poses(self, verbosity=1):
+    def _load_poses(self, max_poses=None, verbosity=1):
         """Loads the single pose files or the global file containing all the poses. Depending on the input, this
         function calls either :meth:`Sequence._load_single_pose_file` or :meth:`Sequence._load_sequence_file`.
 
@@ -451,6 +677,10 @@ class Sequence(TimeSeries):
 
         Parameters
         ----------
+        max_poses: int or None, optional
+            If set, only the first ``max_poses`` poses are loaded. If set on ``None`` (default), all the poses are
+            loaded.
+
         verbosity: int, optional
             Sets how much feedback the code will provide in the console output:
 
@@ -471,6 +701,9 @@ class Sequence(TimeSeries):
         # If the path is a folder, we load every single file
         if op.isdir(self.path):
 
+            if max_poses is not None:
+                self.files = self.files[:max_poses]
+
             for i in range(len(self.files)):
 
                 if verbosity > 1:
@@ -490,7 +723,7 @@ class Sequence(TimeSeries):
 
         # Otherwise, we load the one file
         else:
-            self._load_sequence_file(verbosity)
+            self._load_sequence_file(max_poses, verbosity)
 
     def _load_single_pose_file(self, pose_index, path, verbosity=1):
         """Loads the content of a single pose file into a Pose object. Depending on the file type, this function
@@ -534,6 +767,16 @@ class Sequence(TimeSeries):
                 pose = pickle.load(f)
             self.poses.append(pose)
 
+        elif file_extension == ".npz":
+            data = read_npz(path, None)
+            pose = Pose(data["timestamps"][0].item())
+            coordinates = data["coordinates"][:, 0].astype(object)
+            if "none_mask" in data:
+                coordinates[data["none_mask"][:, 0]] = None
+            for joint_label, (x, y, z) in zip(data["joint_labels"].tolist(), coordinates.tolist()):
+                pose.add_joint(Joint(joint_label, x, y, z))
+            self.poses.append(pose)
+
         else:
             if os.path.splitext(self.path)[-1] not in [".csv", ".tsv", ".txt"]:
                 if verbosity > 0:
@@ -548,12 +791,17 @@ class Sequence(TimeSeries):
                 self.metadata.update(metadata)
             self._create_pose_from_table_row(data)
 
-    def _load_sequence_file(self, verbosity=1):
+    def _load_sequence_file(self, max_poses=None, verbosity=1):
         """Loads the content of a global sequence file containing individual poses into Pose objects.
         Depending on the file type, this function handles the content differently (see :doc:`../general/input`).
 
         Parameters
         ----------
+        max_poses: int or None, optional
+            If set, only the first ``max_poses`` poses are loaded. If set on ``None`` (default), all the poses are
+            loaded. For ``.json`` files, the file is read incrementally, and the reading stops after ``max_poses``
+            poses.
+
         verbosity: int, optional
             Sets how much feedback the code will provide in the console output:
 
@@ -565,33 +813,31 @@ class Sequence(TimeSeries):
 
         """
 
-        perc = 10  # Used for the progression percentage
-
         file_extension = op.splitext(self.path)[-1]
 
-        # JSON file
+        # JSON file: the poses are read one by one, and stored in the arrays as they are read, without loading the
+        # whole file in memory
         if file_extension == ".json":
+            metadata = {}
 
-            # Open the file and read the data
-            data = read_json(self.path)
-
-            if len(data) == 0:
-                raise EmptyInstanceException("Sequence")
-
-            self._load_json_metadata(data, verbosity)
+            def read_poses():
+                for key, value in read_json_stream(self.path, "Poses"):
+                    if key != "Poses":
+                        metadata[key] = value
+                    else:
+                        yield value
 
-            for p in range(len(data["Poses"])):
-                if verbosity > 1:
-                    print("Loading pose " + str(p) + " of " + str(len(data["Poses"])) + "...", end=" ")
+            poses = read_poses()
+            self._create_arrays_from_json(poses, max_poses, verbosity)
 
-                # Show percentage if verbosity
-                perc = show_progression(verbosity, p, len(data["Poses"]), perc)
+            # With max_poses, the top-level keys placed after the poses are still read, and the other poses discarded
+            for _ in poses:
+                pass
 
-                # Create the Pose object, passes as parameter the index and the data
-                self._create_pose_from_json(data["Poses"][p])
+            if len(metadata) == 0 and len(self._timestamps_array) == 0:
+                raise EmptyInstanceException("Sequence")
 
-                if verbosity > 1:
-                    print("OK.")
+            self._load_json_metadata(metadata, verbosity)
 
         # Excel file
         elif file_extension == ".xlsx":
@@ -599,17 +845,7 @@ class Sequence(TimeSeries):
             if "processing_steps" in metadata.keys():
                 metadata["processing_steps"] = json.loads(metadata["processing_steps"])
             self.metadata.update(metadata)
-
-            # For each pose
-            for p in range(len(data) - 1):
-
-                if verbosity > 1:
-                    print("Loading pose " + str(p) + " of " + str(len(data)) + "...", end=" ")
-
-                self._create_pose_from_table_row(data, p + 1)
-
-                if verbosity > 1:
-                    print("OK.")
+            self._create_arrays_from_table(data, verbosity)
 
         # Pickle file
         elif file_extension == ".pkl":
@@ -621,6 +857,17 @@ class Sequence(TimeSeries):
                 elif attr not in ["name", "path", "files"]:
                     self.__setattr__(attr, audio.__dict__[attr])
 
+        # Binary file: the arrays are memory-mapped, and only read from the disk when accessed
+        elif file_extension == ".npz":
+            data = read_npz(self.path)
+            if "metadata" in data:
+                self.metadata.update(json.loads(data["metadata"].item()))
+
+            # The coordinates are saved joint by joint, we swap the axes to get the shape (n_poses, n_joints, 3)
+            coordinates = data["coordinates"].transpose((1, 0, 2))
+            none_mask = data["none_mask"].transpose((1, 0, 2)) if "none_mask" in data else None
+            self._set_arrays(data["timestamps"], coordinates, data["joint_labels"].tolist(), none_mask)
+
         # Mat file
         elif file_extension == ".mat":
             with open(self.path, "rb") as f:
@@ -630,16 +877,7 @@ class Sequence(TimeSeries):
                 if key == "Poses":
                     values = pd.DataFrame(data["data"]["Poses"]).values.tolist()
                     table = [[key for key in data["data"]["Poses"]]] + [row for row in values]
-
-                    for p in range(len(values)):
-
-                        if verbosity > 1:
-                            print("Loading pose " + str(p) + " of " + str(len(data) - 1) + "...", end=" ")
-
-                        self._create_pose_from_table_row(table, p + 1)
-
-                        if verbosity > 1:
-                            print("OK.")
+                    self._create_arrays_from_table(table, verbosity)
 
                 elif key == "processing_steps":
                     if len(data["data"]["processing_steps"]) == 0:
@@ -661,23 +899,26 @@ class Sequence(TimeSeries):
                 if verbosity > 0:
                     print(f"Loading from non-standard extension {file_extension} as text...")
 
-            if self.system == "qualisys":
-                data, metadata = read_text_table(self.path, standardize_labels=False, verbosity=verbosity)
+            standardize_labels = self.system != "qualisys"
+
+            # The numerical body of the table is parsed at once; tables that contain other values are read cell by cell
+            try:
+                header, values, metadata = read_text_table_array(self.path, standardize_labels=standardize_labels,
+                                                                 verbosity=verbosity)
+            except ValueError:
+                data, metadata = read_text_table(self.path, standardize_labels=standardize_labels, verbosity=verbosity)
                 self.metadata.update(metadata)
+                self._create_arrays_from_table(data, verbosity)
             else:
-                data, metadata = read_text_table(self.path, standardize_labels=True, verbosity=verbosity)
                 self.metadata.update(metadata)
+                self._create_arrays_from_array(header, values, verbosity)
 
-            # For each pose
-            for p in range(len(data) - 1):
-
-                if verbosity > 1:
-                    print(f"Loading pose {p} of {len(data) - 1}...", end=" ")
-
-                self._create_pose_from_table_row(data, p + 1)
-
-                if verbosity > 1:
-                    print("OK.")
+        if max_poses is not None and self.get_number_of_poses() > max_poses:
+            if self._is_stored_as_arrays():
+                self._set_arrays(self._timestamps_array[:max_poses], self._coordinates_array[:max_poses],
+                                 self._array_joint_labels, self._none_mask[:max_poses])
+            else:
+                self.poses = self.poses[:max_poses]
 
         if verbosity:
             print("100% - Done.")
@@ -713,6 +954,164 @@ class Sequence(TimeSeries):
 
         self.poses.append(pose)
 
+    def _create_arrays_from_table(self, table, verbosity=1):
+        """Reads the content of a table, considering the first row as containing headers, and stores the timestamps and
+        the coordinates of the joints of all the rows as arrays, without creating Pose and Joint objects.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        ----------
+        table: list(list)
+            A table, where the first elements are the headers.
+
+        verbosity: int, optional
+            Sets how much feedback the code will provide in the console output:
+
+            • *0: Silent mode.* The code won’t provide any feedback, apart from error messages.
+            • *1: Normal mode* (default). The code will provide essential feedback such as progression markers and
+              current steps.
+            • *2: Chatty mode.* The code will provide all possible information on the events happening. Note that this
+              may clutter the output and slow down the execution.
+
+        Raises
+        ------
+        JointLabelAlreadyExistsException
+            If the same joint label appears more than once in the headers.
+        """
+
+        headers = table[0]
+        values = np.array(table[1:], dtype=object).reshape((len(table) - 1, len(headers)))
+        self._create_arrays_from_array(headers, values, verbosity)
+
+    def _create_arrays_from_array(self, headers, values, verbosity=1):
+        """Stores the timestamps and the coordinates of the joints from the values of a table as arrays, without
+        creating Pose and Joint objects.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        ----------
+        headers: list(str)
+            The headers of the table: ``"Timestamp"``, and the labels of the joints followed by ``"_X"``, ``"_Y"`` and
+            ``"_Z"``.
+
+        values: numpy.ndarray
+            The values of the table, with one row per pose and one column per header.
+
+        verbosity: int, optional
+            Sets how much feedback the code will provide in the console output:
+
+            • *0: Silent mode.* The code won’t provide any feedback, apart from error messages.
+            • *1: Normal mode* (default). The code will provide essential feedback such as progression markers and
+              current steps.
+            • *2: Chatty mode.* The code will provide all possible information on the events happening. Note that this
+              may clutter the output and slow down the execution.
+
+        Raises
+        ------
+        JointLabelAlreadyExistsException
+            If the same joint label appears more than once in the headers.
+        """
+
+        columns = {headers[i]: i for i in range(len(headers))}
+
+        joint_labels = []
+        indices = [columns["Timestamp"]]
+        for value in headers:
+            if value[-2:] == "_X":
+                label = value[:-2]
+                if label in joint_labels:
+                    raise JointLabelAlreadyExistsException(label)
+                joint_labels.append(label)
+                indices += [columns[label + "_X"], columns[label + "_Y"], columns[label + "_Z"]]
+
+        if verbosity > 1:
+            print(f"Loading {len(values)} poses with {len(joint_labels)} joints...", end=" ")
+
+        values = values[:, indices].astype(float, copy=False)
+
+        self._set_arrays(values[:, 0], values[:, 1:].reshape((len(values), len(joint_labels), 3)), joint_labels)
+
+        if verbosity > 1:
+            print("OK.")
+
+    def _create_arrays_from_json(self, poses, max_poses=None, verbosity=1):
+        """Reads the poses of a json file one at a time, and stores the timestamps and the coordinates of the joints
+        as arrays, without creating Pose and Joint objects. Each pose is written in the arrays as it is read, so that
+        the poses can come from a generator without being kept in memory. The joints missing from a pose are set on
+        ``None``.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        ----------
+        poses: iterable(dict)
+            The poses from the content of a json file (e.g. a list, or a generator reading the file).
+
+        max_poses: int or None, optional
+            If set, only the first ``max_poses`` poses are read from ``poses``. If set on ``None`` (default), all the
+            poses are read.
+
+        verbosity: int, optional
+            Sets how much feedback the code will provide in the console output:
+
+            • *0: Silent mode.* The code won’t provide any feedback, apart from error messages.
+            • *1: Normal mode* (default). The code will provide essential feedback such as progression markers and
+              current steps.
+            • *2: Chatty mode.* The code will provide all possible information on the events happening. Note that this
+              may clutter the output and slow down the execution.
+        """
+
+        joint_indices = OrderedDict()
+        timestamps = []
+        coordinates = np.full((0, 0, 3), np.nan)
+        none_mask = np.ones((0, 0, 3), dtype=bool)
+        number_of_poses = 0
+
+        for pose in poses:
+            if max_poses is not None and number_of_poses >= max_poses:
+                break
+
+            if verbosity > 1:
+                print("Loading pose " + str(number_of_poses) + "...", end=" ")
+
+            joints = pose["Bodies"][0]["Joints"] if len(pose["Bodies"]) != 0 else []
+            for j in joints:
+                if j["JointType"] not in joint_indices:
+                    joint_indices[j["JointType"]] = len(joint_indices)
+
+            # The arrays grow geometrically with the number of poses, and when new joints appear
+            if number_of_poses == coordinates.shape[0] or len(joint_indices) > coordinates.shape[1]:
+                capacity = max(2 * coordinates.shape[0], 64) if number_of_poses == coordinates.shape[0] \
+                    else coordinates.shape[0]
+                new_coordinates = np.full((capacity, len(joint_indices), 3), np.nan)
+                new_none_mask = np.ones((capacity, len(joint_indices), 3), dtype=bool)
+                new_coordinates[:coordinates.shape[0], :coordinates.shape[1]] = coordinates
+                new_none_mask[:none_mask.shape[0], :none_mask.shape[1]] = none_mask
+                coordinates, none_mask = new_coordinates, new_none_mask
+
+            for j in joints:
+                position = (j["Position"]["X"], j["Position"]["Y"], j["Position"]["Z"])
+                for axis in range(3):
+                    if position[axis] is not None:
+                        coordinates[number_of_poses, joint_indices[j["JointType"]], axis] = position[axis]
+                        none_mask[number_of_poses, joint_indices[j["JointType"]], axis] = False
+
+            timestamps.append(pose["Timestamp"])
+            number_of_poses += 1
+
+            if verbosity > 1:
+                print("OK.")
+
+        if number_of_poses < coordinates.shape[0]:
+            coordinates = coordinates[:number_of_poses].copy()
+            none_mask = none_mask[:number_of_poses].copy()
+
+        # The timestamps are kept as Python numbers until their conversion to seconds, to preserve the precision of
+        # large integer timestamps (e.g. Kinect timestamps in 100 ns)
+        self._set_arrays(np.array(timestamps, dtype=object), coordinates, list(joint_indices.keys()), none_mask)
+
     def _create_pose_from_json(self, data, verbosity=1):
         """Reads the content of a json file containing a single pose, and converts the content of a specified pose index
         into a pose object.
@@ -761,6 +1160,10 @@ class Sequence(TimeSeries):
         .. versionadded:: 2.0
         """
 
+        if self._is_stored_as_arrays():
+            self._timestamps_array = np.array(self._timestamps_array / UNITS[self.time_unit], dtype=float)
+            return
+
         for pose in self.poses:
             pose.timestamp = pose.timestamp / UNITS[self.time_unit]
 
@@ -883,6 +1286,13 @@ class Sequence(TimeSeries):
         if verbosity > 1:
             print(f"{t}Scanning the joint labels...")
 
+        if self._is_stored_as_arrays():
+            if verbosity > 1:
+                print(f"{t}\t{len(self._array_joint_labels)} joint(s) found in each of the "
+                      f"{len(self._timestamps_array)} poses.")
+            self.joint_labels = list(self._array_joint_labels)
+            return
+
         joint_labels = {}
 
         for p in range(len(self.poses)):
@@ -937,6 +1347,23 @@ class Sequence(TimeSeries):
         if verbosity > 1:
             print(f"{t}Adding joint labels to the poses missing them...")
 
+        if self._is_stored_as_arrays():
+            missing_joint_labels = [label for label in self.joint_labels if label not in self._array_joint_labels]
+
+            if verbosity > 1:
+                print(f"{t}\t{len(missing_joint_labels)} joint label(s) missing from all the poses.")
+
+            if len(missing_joint_labels) > 0:
+                shape = (len(self._timestamps_array), len(missing_joint_labels), 3)
+                if default_value is None:
+                    new_coordinates = np.full(shape, np.nan)
+                else:
+                    new_coordinates = np.full(shape, float(default_value))
+                self._coordinates_array = np.concatenate((self._coordinates_array, new_coordinates), axis=1)
+                self._none_mask = np.concatenate((self._none_mask, np.full(shape, default_value is None)), axis=1)
+                self._array_joint_labels += missing_joint_labels
+            return
+
         for p in range(len(self.poses)):
             joint_labels_pose = self.poses[p].get_joint_labels()
 
@@ -1072,6 +1499,22 @@ class Sequence(TimeSeries):
         if self.time_unit not in units:
             raise Exception("Invalid time unit. Should be ns, µs, ms or s.")
 
+        if self._is_stored_as_arrays():
+            timestamps = self._timestamps_array.tolist()
+            if len(timestamps) > 0:
+                t = timestamps[0]
+                unordered = np.flatnonzero(np.diff(self._timestamps_array, prepend=t) < 0)
+                if len(unordered) > 0:
+                    p = int(unordered[0])
+                    if timestamps[p] - t < 0:
+                        raise ImpossibleTimeTravelException(p, 0, timestamps[p], t, len(timestamps), "pose")
+                    raise ImpossibleTimeTravelException(p, p - 1, timestamps[p], timestamps[p - 1], len(timestamps),
+                                                        "pose")
+                self._relative_timestamps_array = self._timestamps_array - t
+            else:
+                self._relative_timestamps_array = np.array([], dtype=float)
+            return
+
         if len(self.poses) > 0:
             t = self.poses[0].get_timestamp()
             for p in range(len(self.poses)):
@@ -1868,6 +2311,8 @@ class Sequence(TimeSeries):
         >>> sequence.get_number_of_poses()
         108
         """
+        if self._is_stored_as_arrays():
+            return len(self._timestamps_array)
         return len(self.poses)
 
     def get_timestamps(self, relative=False, timestamp_start=None, timestamp_end=None):
@@ -1903,6 +2348,16 @@ class Sequence(TimeSeries):
         [0.01, 0.015, 0.02]
         """
 
+        if self._is_stored_as_arrays():
+            timestamps = self._get_timestamps_array(relative)
+            if len(timestamps) == 0:
+                return []
+            if timestamp_start is None:
+                timestamp_start = timestamps[0]
+            if timestamp_end is None:
+                timestamp_end = timestamps[-1]
+            return timestamps[(timestamp_start <= timestamps) & (timestamps <= timestamp_end)].tolist()
+
         if len(self.poses) == 0:
             return []
 
@@ -1958,6 +2413,9 @@ class Sequence(TimeSeries):
         >>> sequence.get_time_between_poses(2, 5)
         1.5
         """
+        if self._is_stored_as_arrays():
+            return float(self._relative_timestamps_array[index_pose_2] - self._relative_timestamps_array[index_pose_1])
+
         timestamp1 = self.poses[index_pose_1].relative_timestamp
         timestamp2 = self.poses[index_pose_2].relative_timestamp
         return timestamp2 - timestamp1
@@ -1978,6 +2436,8 @@ class Sequence(TimeSeries):
         >>> sequence.get_duration()
         38.72
         """
+        if self._is_stored_as_arrays():
+            return float(self._relative_timestamps_array[-1])
         return self.poses[-1].relative_timestamp
 
     def get_sampling_rate(self):
@@ -2176,10 +2636,11 @@ class Sequence(TimeSeries):
                 raise InvalidJointLabelException(joint_label)
 
         # Timestamps
+        timestamps = self._get_timestamps_array(use_relative_timestamps)
         if timestamp_start is None:
-            timestamp_start = self.poses[0].get_timestamp()
+            timestamp_start = timestamps[0]
         if timestamp_end is None:
-            timestamp_end = self.poses[-1].get_timestamp()
+            timestamp_end = timestamps[-1]
 
         if timestamp_start > timestamp_end:
             raise Exception(f"The parameter timestamp_start ({timestamp_start}) must be lower than timestamp_end "
@@ -2188,7 +2649,7 @@ class Sequence(TimeSeries):
         # Measures
         if isinstance(measure, int):
             if 0 <= measure < 7:
-                measure = str(measure)
+                measure = CLEAN_DERIV_NAMES[str(measure)]
             else:
                 raise InvalidParameterValueException("measure", measure, ["x", "y", "z", "coordinates",
                                                  "distance", "velocity", "acceleration", "jerk", "snap", "crackle",
@@ -2213,58 +2674,41 @@ class Sequence(TimeSeries):
             else:
                 print(f"Getting the {measure} for {len(joint_labels)} joint label(s): {', '.join(joint_labels)}.")
 
-        # Find timestamp range indices
-        start_idx = None
-        end_idx = None
+        # Find timestamp range indices (the timestamps are in chronological order)
+        start_idx = np.searchsorted(timestamps, timestamp_start, "left")
+        end_idx = np.searchsorted(timestamps, timestamp_end, "right")
 
-        for i, pose in enumerate(self.poses):
-            timestamp = pose.get_relative_timestamp() if use_relative_timestamps else pose.get_timestamp()
-            if timestamp_start <= timestamp <= timestamp_end:
-                if start_idx is None:
-                    start_idx = i
-                end_idx = i + 1
-
-        if start_idx is None:
+        if start_idx >= end_idx:
             raise Exception(f"No poses found between timestamps {timestamp_start} and {timestamp_end}")
 
-        measures = {}
-
-        # Get the measures
-        for joint_label in joint_labels:
-
-            if verbosity > 1:
+        if verbosity > 1:
+            for joint_label in joint_labels:
                 print(f"\t{joint_label}")
 
-            if measure not in ["y", "z", "distance y", "distance z"]:
-                x_coords = np.array([pose.joints[joint_label].get_x() for pose in self.poses])
-            if measure not in ["x", "z", "distance x", "distance z"]:
-                y_coords = np.array([pose.joints[joint_label].get_y() for pose in self.poses])
-            if measure not in ["x", "y", "distance x", "distance y"]:
-                z_coords = np.array([pose.joints[joint_label].get_z() for pose in self.poses])
-
-            if measure == "x":
-                measures[joint_label] = x_coords[start_idx:end_idx]
-            elif measure == "y":
-                measures[joint_label] = y_coords[start_idx:end_idx]
-            elif measure == "z":
-                measures[joint_label] = z_coords[start_idx:end_idx]
-            elif measure == "coordinates":
-                measures[joint_label] = np.column_stack([x_coords, y_coords, z_coords])[start_idx:end_idx]
-            elif measure == "distance":
-                distances = np.sqrt(np.diff(x_coords) ** 2 + np.diff(y_coords) ** 2 + np.diff(z_coords) ** 2)
-                measures[joint_label] = distances[start_idx:end_idx]
-            elif measure == "distance x":
-                measures[joint_label] = np.abs(np.diff(x_coords))[start_idx:end_idx]
-            elif measure == "distance y":
-                measures[joint_label] = np.abs(np.diff(y_coords))[start_idx:end_idx]
-            elif measure == "distance z":
-                measures[joint_label] = np.abs(np.diff(z_coords))[start_idx:end_idx]
+        # Get the measures for all the joints at once, in an array of shape (n_joints, ...)
+        coordinates = self._get_coordinates_array(joint_labels)
+
+        if measure in ["x", "y", "z"]:
+            values = np.array(coordinates[start_idx:end_idx, :, "xyz".index(measure)].T)
+        elif measure == "coordinates":
+            values = np.array(coordinates[start_idx:end_idx].transpose((1, 0, 2)))
+        elif measure in ["distance", "distance x", "distance y", "distance z"]:
+            # Each distance is calculated between a pose and the next one, including the pose following the range
+            differences = np.diff(coordinates[start_idx:end_idx + 1], axis=0)
+            if measure == "distance":
+                values = np.sqrt(differences[:, :, 0] ** 2 + differences[:, :, 1] ** 2 + differences[:, :, 2] ** 2).T
             else:
-                freq = self.get_sampling_rate()
-                dx = calculate_derivative(x_coords, measure, window_length, poly_order, freq=freq, mode="nearest")
-                dy = calculate_derivative(y_coords, measure, window_length, poly_order, freq=freq, mode="nearest")
-                dz = calculate_derivative(z_coords, measure, window_length, poly_order, freq=freq, mode="nearest")
-                measures[joint_label] = np.sqrt(dx ** 2 + dy ** 2 + dz ** 2)[start_idx:end_idx]
+                values = np.abs(differences[:, :, "xyz".index(measure[-1])]).T
+        else:
+            freq = self.get_sampling_rate()
+            channels = coordinates.reshape((coordinates.shape[0], coordinates.shape[1] * 3))
+            derivatives = calculate_derivative(channels, measure, window_length, poly_order, freq=freq, mode="nearest",
+                                               axis=0)
+            derivatives = derivatives.reshape(coordinates.shape)[start_idx:end_idx]
+            values = np.sqrt(derivatives[:, :, 0] ** 2 + derivatives[:, :, 1] ** 2 + derivatives[:, :, 2] ** 2).T
+
+        values = np.ascontiguousarray(values)
+        measures = {joint_labels[j]: values[j] for j in range(len(joint_labels))}
 
         if len(measures.keys()) == 1:
             return measures[joint_labels[0]]
@@ -3329,36 +3773,29 @@ class Sequence(TimeSeries):
 
         tabs = add_tabs * "\t"
 
+        timestamps = self._get_timestamps_array(use_relative_timestamps)
+        first_timestamp, last_timestamp = float(timestamps[0]), float(timestamps[-1])
+
         if start is None:
             if use_relative_timestamps:
                 start = 0
             else:
-                start = self.poses[0].timestamp
+                start = first_timestamp
 
         if end is None:
             if use_relative_timestamps:
                 end = self.get_duration()
             else:
-                end = self.poses[-1].timestamp
+                end = last_timestamp
 
         if end < start:
             raise Exception("End timestamp should be inferior to beginning timestamp.")
 
         if error_if_out_of_bounds:
-            if use_relative_timestamps:
-                if not self.poses[0].get_relative_timestamp() <= start <= self.poses[-1].get_relative_timestamp():
-                    raise Exception(f"The start timestamp should be between {self.poses[0].get_relative_timestamp()} " +
-                                    f"and {self.poses[-1].get_relative_timestamp()}.")
-                elif not self.poses[0].get_relative_timestamp() <= end <= self.poses[-1].get_relative_timestamp():
-                    raise Exception(f"The end timestamp should be between {self.poses[0].get_relative_timestamp()} " +
-                                    f"and {self.poses[-1].get_relative_timestamp()}.")
-            else:
-                if not self.poses[0].get_timestamp() <= start <= self.poses[-1].get_timestamp():
-                    raise Exception(f"The start timestamp should be between {self.poses[0].get_timestamp()} " +
-                                    f"and {self.poses[-1].get_timestamp()}.")
-                elif not self.poses[0].get_timestamp() <= end <= self.poses[-1].get_timestamp():
-                    raise Exception(f"The end timestamp should be between {self.poses[0].get_timestamp()} " +
-                                    f"and {self.poses[-1].get_timestamp()}.")
+            if not first_timestamp <= start <= last_timestamp:
+                raise Exception(f"The start timestamp should be between {first_timestamp} and {last_timestamp}.")
+            elif not first_timestamp <= end <= last_timestamp:
+                raise Exception(f"The end timestamp should be between {first_timestamp} and {last_timestamp}.")
 
         if verbosity > 0:
             print(tabs + "Trimming the sequence:")
@@ -3376,29 +3813,21 @@ class Sequence(TimeSeries):
         else:
             new_sequence.name = name
 
-        # Define the percentage counter
-        perc = 10
-
-        for p in range(len(self.poses)):
+        preserved = (start - rtol <= timestamps) & (timestamps <= end + rtol)
 
-            if verbosity == 1:
-                perc = show_progression(verbosity, p, len(self.poses), perc)
-
-            if use_relative_timestamps:
-                t = self.poses[p].relative_timestamp
-            else:
-                t = self.poses[p].timestamp
+        if verbosity > 1:
+            for p in range(len(timestamps)):
+                print(tabs + "\t\tPose " + str(p + 1) + " of " + str(len(timestamps)) + ": " + str(timestamps[p]) +
+                      " " + ("Preserved." if preserved[p] else "Trimmed."))
 
-            if verbosity > 1:
-                print(tabs + "\t\tPose " + str(p + 1) + " of " + str(len(self.poses)) + ": " + str(t), end=" ")
+        # If the sequence is stored as arrays, the trimmed sequence is sliced from the arrays
+        if self._is_stored_as_arrays():
+            new_sequence._set_arrays(self._timestamps_array[preserved], self._coordinates_array[preserved],
+                                     self._array_joint_labels, self._none_mask[preserved])
 
-            if start - rtol <= t <= end + rtol:
-                pose = self.poses[p].copy()
-                new_sequence.poses.append(pose)
-                if verbosity > 1:
-                    print("Preserved.")
-            elif verbosity > 1:
-                print("Trimmed.")
+        else:
+            for p in np.flatnonzero(preserved):
+                new_sequence.poses.append(self.poses[p].copy())
 
         new_sequence._calculate_relative_timestamps()  # Sets the relative time from the first pose for each pose
 
@@ -3406,8 +3835,8 @@ class Sequence(TimeSeries):
             if verbosity == 1:
                 print("100% - Done.")
             print(tabs + "\tNew sequence duration: " + str(new_sequence.get_duration()) + " s.")
-            print(tabs + "\tOriginal number of poses: " + str(len(self.poses)), end=" · ")
-            print("New number of poses: " + str(len(new_sequence.poses)))
+            print(tabs + "\tOriginal number of poses: " + str(self.get_number_of_poses()), end=" · ")
+            print("New number of poses: " + str(new_sequence.get_number_of_poses()))
             print(tabs + "Trimming over.\n")
 
         new_sequence._set_attributes_from_other_sequence(self)
@@ -3747,32 +4176,13 @@ class Sequence(TimeSeries):
         else:
             new_sequence.name = name
 
-        # Define the percentage counter
-        perc = 10
-
-        # Define positions lists
-        x_points = OrderedDict()
-        y_points = OrderedDict()
-        z_points = OrderedDict()
-        time_points = self.get_timestamps(relative=True)
-
         # Turn timestamps into microsecond accuracy
-        time_points = np.round(np.array(time_points), 6)
-        number_of_poses = len(self.poses)
+        time_points = np.round(self._get_timestamps_array(relative=True), 6)
+        number_of_poses = len(time_points)
 
-        # Create vectors of position and time
-        for p in range(number_of_poses):
-
-            perc = show_progression(verbosity, p, len(self.poses), perc)
-
-            for joint_label in self.poses[p].joints.keys():
-                if p == 0:
-                    x_points[joint_label] = np.zeros(number_of_poses)
-                    y_points[joint_label] = np.zeros(number_of_poses)
-                    z_points[joint_label] = np.zeros(number_of_poses)
-                x_points[joint_label][p] = self.poses[p].joints[joint_label].x
-                y_points[joint_label][p] = self.poses[p].joints[joint_label].y
-                z_points[joint_label][p] = self.poses[p].joints[joint_label].z
+        # Create an array of shape (n_poses, n_joints * 3), with one channel per joint and axis
+        coordinates = self._get_coordinates_array()
+        channels = coordinates.reshape((number_of_poses, coordinates.shape[1] * 3))
 
         if verbosity > 0:
             print("100% - Done.")
@@ -3782,59 +4192,26 @@ class Sequence(TimeSeries):
         if verbosity > 1:
             print("\tPerforming the resampling...")
 
-        # Define the percentage counter
-        perc = 10
-
-        # Resample
-        new_x_points = OrderedDict()
-        new_y_points = OrderedDict()
-        new_z_points = OrderedDict()
-        new_time_points = []
-
-        no_joints = len(x_points.keys())
-        i = 0
-
         if window_size == 0 or window_size is None:
-            window_size = len(self.poses)
+            window_size = number_of_poses
 
-        for joint_label in x_points.keys():
-            if verbosity > 1:
-                print("\n\tJoint label: " + str(joint_label))
-            perc = show_progression(verbosity, i, no_joints, perc)
-            new_x_points[joint_label], new_time_points = resample_data(x_points[joint_label], time_points, frequency,
-                                                                       window_size, overlap_ratio, method=method,
-                                                                       time_unit=self.time_unit, verbosity=verbosity-1)
-            new_y_points[joint_label], new_time_points = resample_data(y_points[joint_label], time_points, frequency,
-                                                                       window_size, overlap_ratio, method=method,
-                                                                       time_unit=self.time_unit, verbosity=verbosity-1)
-            new_z_points[joint_label], new_time_points = resample_data(z_points[joint_label], time_points, frequency,
-                                                                       window_size, overlap_ratio, method=method,
-                                                                       time_unit=self.time_unit, verbosity=verbosity-1)
-            i += 1
+        # Resample all the joints and axes at once
+        new_channels, new_time_points = resample_data(channels, time_points, frequency, window_size, overlap_ratio,
+                                                      method=method, time_unit=self.time_unit, verbosity=verbosity-1)
 
-        # Define the percentage counter
         if verbosity > 0:
             print("100% - Done.")
             print("\tSaving the new sequence...", end=" ")
-        perc = 10
 
         # Save data
-        for p in range(len(new_time_points)):
-            perc = show_progression(verbosity, i, no_joints, perc)
-            pose = Pose(new_time_points[p])
-            for joint_label in new_x_points.keys():
-                x = new_x_points[joint_label][p]
-                y = new_y_points[joint_label][p]
-                z = new_z_points[joint_label][p]
-                j = Joint(joint_label, x, y, z)
-                j.joint_label = joint_label
-                pose.add_joint(j)
-            new_sequence.poses.append(pose)
+        new_sequence._set_arrays(np.array(new_time_points, dtype=float),
+                                 new_channels.reshape((len(new_time_points), coordinates.shape[1], 3)),
+                                 self.joint_labels)
 
         if verbosity > 0:
             print("100% - Done.")
-            print("\tOriginal sequence had " + str(len(self.poses)) + " poses.")
-            print("\tNew sequence has " + str(len(new_sequence.poses)) + " poses.\n")
+            print("\tOriginal sequence had " + str(number_of_poses) + " poses.")
+            print("\tNew sequence has " + str(new_sequence.get_number_of_poses()) + " poses.\n")
 
         new_sequence._calculate_relative_timestamps()  # Sets the relative time from the first pose for each pose
         new_sequence._set_attributes_from_other_sequence(self)
@@ -4382,6 +4759,23 @@ class Sequence(TimeSeries):
         [0.02, 108, 316, 815]]
         """
 
+        if self._is_stored_as_arrays():
+            if self.get_number_of_poses() == 0:
+                return []
+
+            labels = ["Timestamp"]
+            for joint_label in self._array_joint_labels:
+                labels += [joint_label + "_X", joint_label + "_Y", joint_label + "_Z"]
+
+            number_of_poses = self.get_number_of_poses()
+            values = np.empty((number_of_poses, len(labels)), dtype=object)
+            values[:, 0] = self._get_timestamps_array(use_relative_timestamps).tolist()
+            coordinates = self._coordinates_array.astype(object)
+            coordinates[self._none_mask] = None
+            values[:, 1:] = coordinates.reshape((number_of_poses, len(labels) - 1))
+
+            return [labels] + values.tolist()
+
         table = []
 
         # For each pose
@@ -4943,7 +5337,7 @@ class Sequence(TimeSeries):
 
         file_format: str or None, optional
             The file format in which to save the sequence. The file format must be ``"json"`` (default), ``"xlsx"``,
-            ``"txt"``, ``"csv"``, ``"tsv"``, ``"pkl"``, or, if you are a masochist, ``"mat"``. Notes:
+            ``"txt"``, ``"csv"``, ``"tsv"``, ``"pkl"``, ``"npz"``, or, if you are a masochist, ``"mat"``. Notes:
 
                 • ``"xls"`` will save the file with an ``.xlsx`` extension.
                 • Any string starting with a dot will be accepted (e.g. ``".csv"`` instead of ``"csv"``).
@@ -4951,6 +5345,8 @@ class Sequence(TimeSeries):
                   on ``,``. By default, the function will detect which separator the system uses.
                 • ``"txt"`` and ``"tsv"`` both separate the values by a tabulation.
                 • ``"pkl"`` or ``"pickle"`` will save the sequence using pickling.
+                • ``"npz"`` will save the sequence as binary arrays (see :meth:`Sequence.save_npz`), that can be
+                  memory-mapped when opening the sequence.
                 • Any other string will not return an error, but rather be used as a custom extension. The data will
                   be saved as in a text file (using tabulations as values separators).
 
@@ -4979,6 +5375,7 @@ class Sequence(TimeSeries):
                 • For ``xlsx`` files, the metadata is saved in a second sheet.
                 • For ``pkl`` files, the metadata will always be saved as the object is saved as-is - this parameter
                   is thus ignored.
+                • For ``npz`` files, the metadata is saved as a JSON string in a separate array.
                 • For all the other formats, the metadata is saved at the beginning of the file.
 
         use_relative_timestamps: bool, optional
@@ -5043,6 +5440,9 @@ class Sequence(TimeSeries):
         elif file_format in ["pickle", "pkl"]:
             self.save_pickle(folder_out, name, individual, verbosity)
 
+        elif file_format == "npz":
+            self.save_npz(folder_out, name, individual, include_metadata, use_relative_timestamps, verbosity)
+
         else:
             self.save_txt(folder_out, name, file_format, encoding, individual, include_metadata,
                           use_relative_timestamps, verbosity)
@@ -5510,6 +5910,110 @@ class Sequence(TimeSeries):
                 with open(op.join(folder_out, f"{name}_{p}.pkl"), "wb") as f:
                     pickle.dump(self.poses[p], f)
 
+    def save_npz(self, folder_out, name=None, individual=False, include_metadata=True, use_relative_timestamps=True,
+                 verbosity=1):
+        """Saves a sequence as a binary, uncompressed NumPy .npz file or files. This function is called by the
+        :meth:`Sequence.save` method, and saves the Sequence instance as ``folder_out/name.file_format``.
+
+        The file contains the following arrays:
+
+            • ``"timestamps"``: the timestamps of the poses, with shape (n_poses,).
+            • ``"joint_labels"``: the labels of the joints, with shape (n_joints,).
+            • ``"coordinates"``: the coordinates of the joints, with shape (n_joints, n_poses, 3). The coordinates are
+              saved joint by joint, so that the values of one joint are contiguous in the file. The coordinates equal
+              to ``None`` are saved as ``numpy.nan``.
+            • ``"none_mask"``: a boolean array with the same shape as ``"coordinates"``, set on `True` for the
+              coordinates equal to ``None``. This array is only saved if at least one coordinate is ``None``.
+            • ``"metadata"``: the attribute :attr:`metadata` as a JSON string, if ``include_metadata`` is `True`.
+
+        As the arrays are not compressed, opening the file memory-maps the coordinates: the sequence opens almost
+        instantly, and the coordinates of a joint are only read from the disk when they are accessed.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        ----------
+        folder_out: str
+            The path to the folder where to save the file or files, or the complete path to the file.
+            If one or more subfolders of the path do not exist, the function will create them.
+
+        name: str or None, optional
+            Defines the name of the file or files where to save the sequence. If set on ``None``, the name will be set
+            on ``"out"`` if individual is ``False``, or on ``"pose"`` if individual is ``True``. This parameter is
+            ignored if ``folder_out`` already contains the name of the file.
+
+        individual: bool, optional
+            If set on ``False`` (default), the function will save the sequence in a unique file.
+            If set on ``True``, the function will save each pose of the sequence in an individual file, appending an
+            underscore and the index of the pose (starting at 0) after the name.
+
+        include_metadata: bool, optional
+            Whether to include the metadata in the file (default: `True`). This parameter does not apply to
+            individually saved files.
+
+        use_relative_timestamps: bool, optional
+            Defines if the timestamps saved are absolute (``False``) or relative to the first pose (``True``).
+
+        verbosity: int, optional
+            Sets how much feedback the code will provide in the console output:
+
+            • *0: Silent mode.* The code won’t provide any feedback, apart from error messages.
+            • *1: Normal mode* (default). The code will provide essential feedback such as progression markers and
+              current steps.
+            • *2: Chatty mode.* The code will provide all possible information on the events happening. Note that this
+              may clutter the output and slow down the execution.
+
+        Example
+        -------
+        >>> sequence = Sequence("Mark Scout/sequence_7.tsv")
+        >>> sequence.save_npz("Mark Scout", "sequence_7")
+        >>> sequence.save_npz("Mark Scout/sequence_7.npz")
+        """
+        perc = 10  # Used for the progression percentage
+
+        path_out = None
+        subfolders = op.normpath(folder_out).split(os.sep)
+        if len(subfolders) != 0 and not individual:
+            if subfolders[-1].endswith(".npz"):
+                path_out = folder_out
+            else:
+                if name is None:
+                    name = "out"
+                if name.endswith(".npz"):
+                    path_out = op.join(folder_out, name)
+                else:
+                    path_out = op.join(folder_out, f"{name}.npz")
+
+        # Get the data
+        timestamps = np.array(self._get_timestamps_array(use_relative_timestamps), dtype=float)
+        joint_labels = np.array(self.joint_labels, dtype=str)
+        coordinates = np.ascontiguousarray(self._get_coordinates_array().transpose((1, 0, 2)))
+        none_mask = np.ascontiguousarray(self._get_none_mask_array().transpose((1, 0, 2)))
+
+        # Save the data
+        if not individual:
+            data = {"timestamps": timestamps, "joint_labels": joint_labels, "coordinates": coordinates}
+            if np.any(none_mask):
+                data["none_mask"] = none_mask
+            if include_metadata:
+                metadata = self.metadata.copy()
+                for key in metadata:
+                    if str(type(metadata[key])) == "<class 'datetime.datetime'>":
+                        metadata[key] = str(metadata[key])
+                data["metadata"] = np.array(json.dumps(metadata))
+            np.savez(path_out, **data)
+
+        else:
+            if name is None:
+                name = "pose"
+            for p in range(len(timestamps)):
+                perc = show_progression(verbosity, p, len(timestamps), perc)
+                data = {"timestamps": timestamps[p:p + 1], "joint_labels": joint_labels,
+                        "coordinates": coordinates[:, p:p + 1]}
+                if np.any(none_mask[:, p]):
+                    data["none_mask"] = none_mask[:, p:p + 1]
+                np.savez(op.join(folder_out, f"{name}_{p}.npz"), **data)
+
     def save_txt(self, folder_out, name=None, file_format="csv", encoding="utf-8", individual=False,
                  include_metadata=True, use_relative_timestamps=True, verbosity=1):
         """Saves a sequence as .txt, .csv, .tsv, or custom extension files or file. This function is called by the
@@ -5638,7 +6142,7 @@ class Sequence(TimeSeries):
         >>> len(sequence)
         802701
         """
-        return len(self.poses)
+        return self.get_number_of_poses()
 
     def __getitem__(self, index):
         """Returns the pose of index specified by the parameter ``index``.
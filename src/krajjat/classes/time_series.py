@@ -113,7 +113,8 @@ class TimeSeries(object):
             # If it is a directory
             if op.isdir(self.path):
                 self.files = sort_files_trailing_index(self.path,
-                                                       accepted_extensions=["json", "csv", "mat", "pkl", "tsv", "txt", "xlsx"],
+                                                       accepted_extensions=["json", "csv", "mat", "npz", "pkl", "tsv",
+                                                                            "txt", "xlsx"],
                                                        object_type=self.kind.lower(), verbosity=verbosity, add_tabs=1)
 
             else:
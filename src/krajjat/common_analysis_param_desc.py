@@ -22,6 +22,9 @@
               generally generated from :meth:`Experiment.get_dataframe()`.
             • The path of a file containing a pandas DataFrame, generally generated from
               :class:`Experiment.save_dataframe()`.
+            • A :class:`SegmentedDataframe` instance, generally generated from
+              :meth:`Experiment.get_segmented_dataframe()`. The segments are filtered before being converted to a
+              dataframe.
             • A list combining any of the above types. In that case, all the dataframes will be merged sequentially.
 
     analysis : str
@@ -31,8 +34,9 @@
         The method to use for the analysis. The values this parameter accepts depend on the value in ``analysis``:
 
             • For `"power spectrum"`: ``"fft"`` or ``"welch"``.
-            • For `"correlation"`: ``"pingouin"`` (alt: ``"pg"``,  or ``"numpy"``.
+            • For `"correlation"`: ``"pingouin"`` (alt: ``"pg"``,  ``"numpy"`` or ``"fft"``.
             • For `"coherence"`, this parameter is ignored.
+            • For `"mutual information"`: ``"ksg"`` or ``"sklearn"``.
 
     sampling_rate : int|str|float, optional
         Sampling rate of the signals. By default, this value is set on ``"auto"``: in that case, the sampling rate
@@ -232,4 +236,8 @@
             • ``p_values`` contains the p-values of the analysis, if ``return_type`` was set on ``z-scores``.
             • ``plot_dictionary`` contains the plot dictionary that can be directly passed to ``plot_silhouette`` or
               ``plot_body_graphs``.
+
+        The results are :class:`LabelledArray` instances, that can be indexed as nested dictionaries
+        (``averages[target_measure][measure][series_value][label][lag]``), and contain all the values in a single
+        array (``averages.values``), with one axis per dimension.
     """
\ No newline at end of file
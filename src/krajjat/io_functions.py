@@ -8,7 +8,7 @@ from krajjat.classes.audio import Audio
 
 # === Loading functions ===
 def load_sequences(input_folder, recursive=False, output_type="list", ignore_empty_sequences=True,
-                   ignore_loading_errors=False, ignore_folders=True, verbosity=1):
+                   ignore_loading_errors=False, ignore_folders=True, n_jobs=1, verbosity=1):
     """Loads multiple sequences and returns a list or a dict containing them.
 
     .. versionadded:: 2.0
@@ -47,6 +47,12 @@ def load_sequences(input_folder, recursive=False, output_type="list", ignore_emp
     ignore_folders: bool, optional
         If set on ``True`` (default), the function will not look for folders as containing individual sequence files.
 
+    n_jobs: int, optional
+        Max amount of jobs to run in parallel when loading the sequences. Each file is then parsed in a separate
+        process, which can drastically lower the loading time of large datasets. Set on -1 to use the maximum amount of
+        available cores (default: 1). The order of the output is the same, no matter the number of jobs. When running
+        more than one job, the feedback from the loading of each file is not printed.
+
     verbosity: int, optional
         Sets how much feedback the code will provide in the console output:
 
@@ -70,9 +76,6 @@ def load_sequences(input_folder, recursive=False, output_type="list", ignore_emp
     >>> load_sequences("Recordings/", recursive=True, output_type="dict")
     """
 
-    # Read the content of a folder
-    content = os.listdir(input_folder)
-
     # Output type
     if output_type.lower() == "list":
         sequences = []
@@ -82,53 +85,34 @@ def load_sequences(input_folder, recursive=False, output_type="list", ignore_emp
         raise InvalidParameterValueException("output_type", output_type, ["list", "dict"])
 
     # Going through the content
-    for element in content:
-
-        # Load sequences
-        try:
-            if verbosity > 0:
-                print("\n======= " + op.join(input_folder, element) + " =======")
-
-            if not (op.isdir(op.join(input_folder, element)) and ignore_folders):
-                sequence = Sequence(op.join(input_folder, element), name=element, verbosity=verbosity)
-
-                if output_type.lower() == "list":
-                    sequences.append(sequence)
+    for path, key, result in _load_instances("sequence", input_folder, recursive, ignore_folders, n_jobs, verbosity):
 
-                elif output_type.lower() == "dict":
-                    sequences[input_folder + "/" + element] = sequence
-
-            else:
-                if verbosity > 0:
-                    print("Ignoring folder.")
+        if result is None:
+            continue
 
         # Exceptions
-        except InvalidPathException as ex:
+        if isinstance(result, InvalidPathException):
             if ignore_loading_errors and verbosity > 0:
-                print(ex.message)
+                print(result.message)
             elif not ignore_loading_errors:
-                raise InvalidPathException(ex.path, "sequence", ex.reason)
-        except ImpossibleTimeTravelException as ex:
+                raise InvalidPathException(result.path, "sequence", result.reason)
+        elif isinstance(result, ImpossibleTimeTravelException):
             if ignore_loading_errors and verbosity > 0:
-                print(ex.message)
+                print(result.message)
             elif not ignore_loading_errors:
-                raise ImpossibleTimeTravelException(ex.index1, ex.index2, ex.timestamp1,
-                                                    ex.timestamp2, ex.number_of_timestamps, ex.object_type)
-        except EmptyInstanceException as ex:
+                raise ImpossibleTimeTravelException(result.index1, result.index2, result.timestamp1,
+                                                    result.timestamp2, result.number_of_timestamps, result.object_type)
+        elif isinstance(result, EmptyInstanceException):
             if ignore_empty_sequences and verbosity > 0:
-                print(ex.message)
+                print(result.message)
             elif not ignore_empty_sequences:
                 raise EmptyInstanceException("Sequence")
 
-        if recursive:
-            if os.path.isdir(op.join(input_folder, element)):
-                sequences_subdirectory = load_sequences(op.join(input_folder, element), True, output_type,
-                                                        ignore_empty_sequences, ignore_loading_errors, ignore_folders,
-                                                        verbosity)
-                if output_type.lower() == "list":
-                    sequences += sequences_subdirectory
-                elif output_type.lower() == "dict":
-                    sequences.update(sequences_subdirectory)
+        # Load sequences
+        elif output_type.lower() == "list":
+            sequences.append(result)
+        elif output_type.lower() == "dict":
+            sequences[key] = result
 
     if verbosity > 0:
         print(str(len(sequences)) + " sequence(s) have been loaded from the directory " + str(input_folder))
@@ -137,7 +121,7 @@ def load_sequences(input_folder, recursive=False, output_type="list", ignore_emp
 
 
 def load_audios(input_folder, recursive=False, output_type="list", ignore_empty_audios=True,
-                ignore_loading_errors=False, ignore_folders=True, verbosity=1):
+                ignore_loading_errors=False, ignore_folders=True, n_jobs=1, verbosity=1):
     """Loads multiple audio clips and returns a list or a dict containing them.
 
     .. versionadded:: 2.0
@@ -176,6 +160,12 @@ def load_audios(input_folder, recursive=False, output_type="list", ignore_empty_
     ignore_folders: bool, optional
         If set on ``True`` (default), the function will not look for folders as containing individual audio files.
 
+    n_jobs: int, optional
+        Max amount of jobs to run in parallel when loading the audio clips. Each file is then parsed in a separate
+        process, which can drastically lower the loading time of large datasets. Set on -1 to use the maximum amount of
+        available cores (default: 1). The order of the output is the same, no matter the number of jobs. When running
+        more than one job, the feedback from the loading of each file is not printed.
+
     verbosity: int, optional
         Sets how much feedback the code will provide in the console output:
 
@@ -199,8 +189,6 @@ def load_audios(input_folder, recursive=False, output_type="list", ignore_empty_
     >>> load_audios("Recordings/", recursive=True, output_type="dict")
     """
 
-    content = os.listdir(input_folder)
-
     # Output type
     if output_type.lower() == "list":
         audios = []
@@ -210,52 +198,34 @@ def load_audios(input_folder, recursive=False, output_type="list", ignore_empty_
         raise Exception('Wrong output type: "' + str(output_type) + '". The output type should be "list" or "dict".')
 
     # Going through the content
-    for element in content:
+    for path, key, result in _load_instances("audio", input_folder, recursive, ignore_folders, n_jobs, verbosity):
 
-        # Load sequences
-        try:
-            if verbosity > 0:
-                print("\n======= " + op.join(input_folder, element) + " =======")
-
-            if not (op.isdir(op.join(input_folder, element)) and ignore_folders):
-                audio = Audio(op.join(input_folder, element), name=element, verbosity=verbosity)
-
-                if output_type.lower() == "list":
-                    audios.append(audio)
-
-                elif output_type.lower() == "dict":
-                    audios[input_folder + "/" + element] = audio
-
-            else:
-                if verbosity > 0:
-                    print("Ignoring folder.")
+        if result is None:
+            continue
 
         # Exceptions
-        except InvalidPathException as ex:
+        if isinstance(result, InvalidPathException):
             if ignore_loading_errors and verbosity > 0:
-                print(ex.message)
+                print(result.message)
             elif not ignore_loading_errors:
-                raise InvalidPathException(ex.path, "audio clip", ex.reason)
-        except ImpossibleTimeTravelException as ex:
+                raise InvalidPathException(result.path, "audio clip", result.reason)
+        elif isinstance(result, ImpossibleTimeTravelException):
             if ignore_loading_errors and verbosity > 0:
-                print(ex.message)
+                print(result.message)
             elif not ignore_loading_errors:
-                raise ImpossibleTimeTravelException(ex.index1, ex.index2, ex.timestamp1,
-                                                    ex.timestamp2, ex.number_of_timestamps, ex.object_type)
-        except EmptyInstanceException as ex:
+                raise ImpossibleTimeTravelException(result.index1, result.index2, result.timestamp1,
+                                                    result.timestamp2, result.number_of_timestamps, result.object_type)
+        elif isinstance(result, EmptyInstanceException):
             if ignore_empty_audios and verbosity > 0:
-                print(ex.message)
+                print(result.message)
             elif not ignore_empty_audios:
                 raise EmptyInstanceException("Audio")
 
-        if recursive:
-            if os.path.isdir(op.join(input_folder, element)):
-                audios_subdirectory = load_audios(op.join(input_folder, element), True, output_type,
-                                                  ignore_empty_audios, ignore_loading_errors, ignore_folders, verbosity)
-                if output_type.lower() == "list":
-                    audios += audios_subdirectory
-                elif output_type.lower() == "dict":
-                    audios.update(audios_subdirectory)
+        # Load audios
+        elif output_type.lower() == "list":
+            audios.append(result)
+        elif output_type.lower() == "dict":
+            audios[key] = result
 
     if verbosity > 0:
         print(str(len(audios)) + " audio clip(s) have been loaded from the directory " + str(input_folder))
@@ -263,6 +233,150 @@ def load_audios(input_folder, recursive=False, output_type="list", ignore_empty_
     return audios
 
 
+def _list_paths_to_load(input_folder, recursive=False, ignore_folders=True):
+    """Returns the paths of the elements to load from a folder, in the order in which :func:`load_sequences` and
+    :func:`load_audios` load them.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    input_folder: str
+        The path of the directory in which to look for elements to load.
+
+    recursive: bool, optional
+        If set on ``True``, the subdirectories of the ``input_folder`` are also listed.
+
+    ignore_folders: bool, optional
+        If set on ``True`` (default), the folders are not considered as elements to load.
+
+    Returns
+    -------
+    list(tuple(str, str, str, bool))
+        For each element, a tuple containing the path of the element, the key of the element in a dict output, the
+        name of the element, and a boolean indicating if the element is a folder to ignore.
+    """
+    paths = []
+
+    for element in os.listdir(input_folder):
+        path = op.join(input_folder, element)
+        paths.append((path, input_folder + "/" + element, element, op.isdir(path) and ignore_folders))
+
+        if recursive and op.isdir(path):
+            paths += _list_paths_to_load(path, True, ignore_folders)
+
+    return paths
+
+
+def _load_instance(kind, path, name, verbosity=1):
+    """Loads and returns a Sequence or an Audio instance. If the loading raises an :class:`InvalidPathException`, an
+    :class:`ImpossibleTimeTravelException` or an :class:`EmptyInstanceException`, the exception is returned instead of
+    being raised, so that it can be handled by the calling function, even when running in a parallel job.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    kind: str
+        The kind of instance to load (``"sequence"`` or ``"audio"``).
+
+    path: str
+        The path of the instance.
+
+    name: str
+        The name to give to the instance.
+
+    verbosity: int, optional
+        Sets how much feedback the code will provide in the console output:
+
+        • *0: Silent mode.* The code won’t provide any feedback, apart from error messages.
+        • *1: Normal mode* (default). The code will provide essential feedback such as progression markers and
+          current steps.
+        • *2: Chatty mode.* The code will provide all possible information on the events happening. Note that this
+          may clutter the output and slow down the execution.
+
+    Returns
+    -------
+    Sequence|Audio|Exception
+        The loaded instance, or the exception raised during the loading.
+    """
+    try:
+        if kind == "sequence":
+            return Sequence(path, name=name, verbosity=verbosity)
+        else:
+            return Audio(path, name=name, verbosity=verbosity)
+    except (InvalidPathException, ImpossibleTimeTravelException, EmptyInstanceException) as ex:
+        return ex
+
+
+def _load_instances(kind, input_folder, recursive=False, ignore_folders=True, n_jobs=1, verbosity=1):
+    """Loads the Sequence or Audio instances contained in a folder, sequentially or in parallel, and yields them in
+    the order of :func:`_list_paths_to_load`.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    kind: str
+        The kind of instances to load (``"sequence"`` or ``"audio"``).
+
+    input_folder: str
+        The path of the directory in which to look for elements to load.
+
+    recursive: bool, optional
+        If set on ``True``, the subdirectories of the ``input_folder`` are also loaded.
+
+    ignore_folders: bool, optional
+        If set on ``True`` (default), the folders are not loaded as instances.
+
+    n_jobs: int, optional
+        Max amount of jobs to run in parallel (default: 1). Set on -1 to use the maximum amount of available cores.
+
+    verbosity: int, optional
+        Sets how much feedback the code will provide in the console output:
+
+        • *0: Silent mode.* The code won’t provide any feedback, apart from error messages.
+        • *1: Normal mode* (default). The code will provide essential feedback such as progression markers and
+          current steps.
+        • *2: Chatty mode.* The code will provide all possible information on the events happening. Note that this
+          may clutter the output and slow down the execution.
+
+    Yields
+    ------
+    tuple(str, str, Sequence|Audio|Exception|None)
+        The path of the element, the key of the element in a dict output, and the loaded instance, the exception
+        raised during the loading, or ``None`` if the element is an ignored folder.
+    """
+    paths = _list_paths_to_load(input_folder, recursive, ignore_folders)
+
+    if n_jobs == 1:
+        results = (_load_instance(kind, path, element, verbosity) if not ignored else None
+                   for path, key, element, ignored in paths)
+    else:
+        try:
+            from joblib import Parallel, delayed
+        except ImportError:
+            raise ModuleNotFoundException("joblib", "load files in parallel")
+
+        to_load = [(path, element) for path, key, element, ignored in paths if not ignored]
+        loaded = Parallel(n_jobs=n_jobs, return_as="generator")(
+            delayed(_load_instance)(kind, path, element, 0) for path, element in to_load)
+        results = (next(loaded) if not ignored else None for path, key, element, ignored in paths)
+
+    for p in range(len(paths)):
+        path, key, element, ignored = paths[p]
+
+        if verbosity > 0:
+            print("\n======= " + path + " =======")
+
+        result = next(results)
+
+        if verbosity > 0 and ignored:
+            print("Ignoring folder.")
+
+        yield path, key, result
+
+
 def load_audio_derivative(path, kind):
     """Loads an Audio or an AudioDerivative from a file and returns the corresponding object.
 
@@ -2,10 +2,13 @@
 import collections
 import datetime
 import glob
+import hashlib
 import numbers
 import os
 import os.path as op
 import random
+import struct
+import zipfile
 
 import math
 import json
@@ -838,6 +841,145 @@ def read_json(path):
     return json.loads(content)
 
 
+def _detect_encoding(path, chunk_size=1048576):
+    """Detects the encoding of a file. The file is read by chunks, and the reading stops as soon as the encoding is
+    detected with certainty, which avoids reading large files entirely.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    path: str
+        The path to a text file.
+    chunk_size: int, optional
+        The number of bytes read from the file at a time (default: 1048576).
+
+    Returns
+    -------
+    str|None
+        The detected encoding, or ``None`` if the file is empty.
+    """
+    detector = chardet.UniversalDetector()
+    with open(path, "rb") as f:
+        for raw_chunk in iter(lambda: f.read(chunk_size), b""):
+            detector.feed(raw_chunk)
+            if detector.done:
+                break
+    return detector.close()["encoding"]
+
+
+def read_json_stream(path, array_key="Poses", chunk_size=1048576):
+    """Reads the content of a `.json` file containing a dictionary incrementally, and yields its top-level keys and
+    values one at a time. The elements of the list under the key ``array_key`` are yielded one by one, without loading
+    the whole list in memory. This allows to read large files (e.g. Kinect recordings) with a limited memory footprint,
+    and to stop reading them at any point.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    path: str
+        The path to a json file containing a dictionary.
+    array_key: str, optional
+        The top-level key containing a list, of which the elements will be yielded one by one (default: ``"Poses"``).
+    chunk_size: int, optional
+        The number of characters read from the file at a time (default: 1048576).
+
+    Yields
+    ------
+    str
+        A top-level key of the dictionary.
+    any
+        The value of the key, or an element of the list if the key is ``array_key``.
+
+    Raises
+    ------
+    json.JSONDecodeError
+        If the file does not contain a valid json dictionary.
+
+    Example
+    -------
+    >>> for key, value in read_json_stream("plankton_census.json", "Counts"):
+    ...     print(key, value)
+    Location Bikini Bottom
+    Counts 1
+    Counts 0
+    """
+
+    encoding = _detect_encoding(path, chunk_size)
+    decoder = json.JSONDecoder()
+    whitespace = " \t\n\r"
+
+    with open(path, "r", encoding=encoding) as f:
+        buffer = ""
+        position = 0
+        end_of_file = False
+
+        def read_more():
+            nonlocal buffer, position, end_of_file
+            chunk = f.read(max(chunk_size, len(buffer) - position))  # Grows geometrically for long values
+            end_of_file = chunk == ""
+            buffer = buffer[position:] + chunk
+            position = 0
+
+        def next_character():
+            nonlocal position
+            while True:
+                while position < len(buffer) and buffer[position] in whitespace:
+                    position += 1
+                if position < len(buffer):
+                    return buffer[position]
+                if end_of_file:
+                    raise json.JSONDecodeError("Unexpected end of file", buffer, position)
+                read_more()
+
+        def expect(characters):
+            nonlocal position
+            character = next_character()
+            if character not in characters:
+                raise json.JSONDecodeError(f"Expecting one of {list(characters)}", buffer, position)
+            position += 1
+            return character
+
+        def next_value():
+            nonlocal position
+            next_character()
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, position)
+                    # A value ending with the buffer may be truncated (e.g. a number)
+                    if end < len(buffer) or end_of_file:
+                        position = end
+                        return value
+                except json.JSONDecodeError:
+                    if end_of_file:
+                        raise
+                read_more()
+
+        expect("{")
+        if next_character() == "}":
+            return
+
+        while True:
+            key = next_value()
+            expect(":")
+
+            if key == array_key and next_character() == "[":
+                expect("[")
+                if next_character() == "]":
+                    expect("]")
+                else:
+                    while True:
+                        yield key, next_value()
+                        if expect(",]") == "]":
+                            break
+            else:
+                yield key, next_value()
+
+            if expect(",}") == "}":
+                return
+
+
 def read_text_table(path, convert_strings=True, separator=None, read_metadata=True, standardize_labels="auto",
                     keyword_data_start="Timestamp", keyword_data_in_table=True, verbosity=1):
     """Detects the encoding, loads and returns the content of a `.csv`, `.tsv` or `.txt` file containing a table.
@@ -953,6 +1095,168 @@ def read_text_table(path, convert_strings=True, separator=None, read_metadata=Tr
     return new_data, metadata
 
 
+def read_text_table_array(path, separator=None, read_metadata=True, standardize_labels="auto",
+                          keyword_data_start="Timestamp", verbosity=1):
+    """Loads the content of a `.csv`, `.tsv` or `.txt` file containing a numerical table, and returns its header and
+    its values as a NumPy array. Contrary to :func:`read_text_table`, which converts the values cell by cell, this
+    function only reads the header and the metadata line by line, and parses the body of the table at once using the
+    C engine of :func:`pandas.read_csv`. Files exported from QTM (Qualisys) are detected and converted the same way as
+    :func:`convert_data_from_qtm` does.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    path: str
+        The path to a text file.
+    separator: str|None, optional
+        If `None`, the symbol separating each cell on a row in the file will be deduced from the extension, using
+        :func:`get_filetype_separator`. Otherwise, the value of this parameter will be used (e.g. ``"\\t"``, ``","``,
+        ``";"``).
+    read_metadata: bool, optional
+        If set on `True` (default), the function tries to find metadata leading the file, before the keyword
+        "Timestamps" starts a new line. If set on `False`, the first line of the file is considered as the header.
+    standardize_labels: bool|str, optional
+        If set on ``"auto"`` (default), renames the Qualisys labels (if ``"HeadR"`` is detected in the joint labels -
+        see :ref:`Qualisys to Kualisys conversion<qualisys_to_kualisys>`). Enforce the renaming by setting
+        this parameter on `True`.
+    keyword_data_start: str, optional
+        The keyword starting the header line, that marks when to stop saving metadata (default: ``"Timestamp"``).
+    verbosity: int, optional
+        Sets how much feedback the code will provide in the console output:
+
+        • *0: Silent mode.* The code won’t provide any feedback, apart from error messages.
+        • *1: Normal mode* (default). The code will provide essential feedback such as progression markers and
+          current steps.
+        • *2: Chatty mode.* The code will provide all possible information on the events happening. Note that this
+          may clutter the output and slow down the execution.
+
+    Returns
+    -------
+    list(str)
+        The header of the table.
+    numpy.ndarray
+        The values of the table, with shape (n_rows, n_columns). The empty cells and the cells containing ``"None"``
+        are converted to ``numpy.nan``.
+    dict
+        The metadata of the recording, if contained in the text file. This parameter will return an empty dictionary
+        if the file does not contain metadata.
+
+    Raises
+    ------
+    ValueError
+        If the keyword starting the header is not found, or if the body of the table contains non-numerical values.
+        In that case, the table can still be read with :func:`read_text_table`.
+
+    Example
+    -------
+    >>> header, values, metadata = read_text_table_array("marathon_splits.tsv")
+    >>> header
+    ["Timestamp", "Head_X", "Head_Y", "Head_Z"]
+    >>> values
+    array([[0., 0.2, 1.6, 0.4],
+           [0.1, 0.2, 1.7, 0.4]])
+    """
+
+    encoding = _detect_encoding(path)
+    extension = path.split(".")[-1]
+    if separator is None:
+        separator = get_filetype_separator(extension)
+
+    metadata = {}
+    with open(path, "r", encoding=encoding) as f:
+        first_line = f.readline().rstrip("\n")
+
+        # If the data is exported from QTM (Qualisys), the data starts at the first frame, after the marker names
+        if extension == "tsv" and first_line.split("\t")[0] == "NO_OF_FRAMES":
+            if verbosity > 0:
+                print("\n\tConverting data from Qualisys...")
+
+            metadata["ORIGIN"] = "Qualisys"
+            header = None
+            elements = first_line.split("\t")
+            while elements[0] != "MARKER_NAMES":
+                _read_qtm_metadata_line(elements, metadata)
+                line = f.readline()
+                if line == "":
+                    raise ValueError(f"No marker names found in {path}.")
+                elements = line.rstrip("\n").split("\t")
+            header = _get_qtm_header(elements[1:], standardize_labels, verbosity)
+
+            position = f.tell()
+            line = f.readline()
+            while line.split("\t")[0] != "1":
+                if line == "":
+                    raise ValueError(f"No data found in {path}.")
+                position = f.tell()
+                line = f.readline()
+            f.seek(position)
+
+            # The first column contains the frame numbers, and the coordinates are converted from mm to m
+            values = _read_table_body(f, "\t", len(header) + 1)[:, 1:]
+            values[:, 1:] /= 1000
+
+        else:
+            line = first_line
+            if read_metadata:
+                elements = line.split(separator)
+                while elements[0] != keyword_data_start:
+                    if len(elements) == 2:
+                        metadata[elements[0]] = elements[1]
+                    else:
+                        metadata[elements[0]] = elements[1:]
+                    line = f.readline()
+                    if line == "":
+                        raise ValueError(f"The keyword {keyword_data_start} was not found in {path}.")
+                    line = line.rstrip("\n")
+                    elements = line.split(separator)
+
+            header = line.split(separator)
+            values = _read_table_body(f, separator, len(header))
+
+            for key in metadata.keys():
+                try:
+                    metadata[key] = literal_eval(metadata[key])
+                except ValueError:
+                    pass
+                except SyntaxError:
+                    pass
+
+    if verbosity > 1:
+        print(f"Read a table of {values.shape[0]} rows and {values.shape[1]} columns.")
+
+    return header, values, metadata
+
+
+def _read_table_body(file, separator, number_of_columns):
+    """Parses the numerical body of a table from an open text file, starting from the current position of the file,
+    using the C engine of :func:`pandas.read_csv`.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    file: io.TextIOWrapper
+        A text file opened in reading mode, positioned at the beginning of the body of the table.
+    separator: str
+        The symbol separating each cell on a row.
+    number_of_columns: int
+        The number of columns of the table. Any extra column is ignored.
+
+    Returns
+    -------
+    numpy.ndarray
+        The values of the table, with shape (n_rows, number_of_columns).
+    """
+    try:
+        # The round-trip converter gives the same values as float(), unlike the faster default converter
+        table = pd.read_csv(file, sep=separator, header=None, usecols=range(number_of_columns), dtype=float,
+                            engine="c", float_precision="round_trip")
+    except pd.errors.EmptyDataError:
+        return np.zeros((0, number_of_columns))
+    return table.to_numpy()
+
+
 def read_xlsx(path, sheet=0, read_metadata=True, metadata_sheet=1, verbosity=1):
     """Loads and returns the content of a ``.xlsx`` (Excel) file.
 
@@ -1056,6 +1360,60 @@ def read_xlsx(path, sheet=0, read_metadata=True, metadata_sheet=1, verbosity=1):
     return table, metadata_dict
 
 
+def read_npz(path, mmap_mode="r"):
+    """Loads and returns the arrays contained in a ``.npz`` file. Unlike :func:`numpy.load`, which decompresses every
+    array of a ``.npz`` file in memory, this function memory-maps the arrays saved without compression (e.g. with
+    :func:`numpy.savez`): the data is then only read from the disk when it is accessed.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    path: str
+        The path to a ``.npz`` file.
+    mmap_mode: str|None, optional
+        The mode used to memory-map the arrays (``"r"``, ``"r+"``, ``"w+"`` or ``"c"``, see :class:`numpy.memmap`).
+        By default (``"r"``), the arrays are opened in read-only mode. If set on ``None``, the arrays are read in memory.
+        Compressed arrays, empty arrays, 0-dimensional arrays and arrays of objects are always read in memory.
+
+    Returns
+    -------
+    dict(str: numpy.ndarray)
+        The arrays of the file, with their names as keys.
+
+    Example
+    -------
+    >>> arrays = read_npz("tea_cups.npz")
+    >>> arrays["cups_per_day"]
+    memmap([3, 4, 2, 5, 3])
+    """
+
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as f:
+        for info in archive.infolist():
+            name = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+
+            if mmap_mode is not None and info.compress_type == zipfile.ZIP_STORED:
+                # The data of a stored member starts after its local header (30 bytes) and its variable fields
+                f.seek(info.header_offset + 26)
+                filename_length, extra_length = struct.unpack("<HH", f.read(4))
+                f.seek(info.header_offset + 30 + filename_length + extra_length)
+                version = np.lib.format.read_magic(f)
+                if version == (1, 0):
+                    shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+                else:
+                    shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+
+                if len(shape) != 0 and 0 not in shape and not dtype.hasobject:
+                    arrays[name] = np.memmap(path, dtype, mmap_mode, f.tell(), shape, "F" if fortran_order else "C")
+                    continue
+
+            with archive.open(info) as member:
+                arrays[name] = np.lib.format.read_array(member)
+
+    return arrays
+
+
 def read_pandas_dataframe(path, verbosity=1, add_tabs=0):
     """Reads a file, and turns it into a Pandas dataframe.
 
@@ -1178,8 +1536,6 @@ def convert_data_from_qtm(data, standardize_labels="auto", verbosity=1):
     if verbosity > 0:
         print("\n\tConverting data from Qualisys...")
 
-    joints_conversions = load_qualisys_joint_label_conversion()
-
     # First, we find where the data starts
     perc = 10
     for i in range(len(data)):
@@ -1187,58 +1543,10 @@ def convert_data_from_qtm(data, standardize_labels="auto", verbosity=1):
 
         if elements[0] == "MARKER_NAMES":
             save_metadata = False
-            header = ["Timestamp"]
-
-            if standardize_labels == "auto" and set(elements[1:]).issubset(set(joints_conversions.keys())):
-                standardize_labels = True
-            elif standardize_labels is not True:
-                standardize_labels = False
-
-            if standardize_labels:
-                if verbosity == 1:
-                    print("\t\tStandardizing joints labels...", end=" ")
-                elif verbosity > 1:
-                    print("\t\tStandardizing joints labels...")
-
-            for j in range(1, len(elements)):
-
-                if standardize_labels:
-                    # We remove the prefix by looking for a joint name in the label:
-                    if elements[j] not in joints_conversions.keys():
-                        for label in joints_conversions.keys():
-                            if label in elements[j]:
-                                if verbosity > 1:
-                                    print("\t\t\tChanging label name " + elements[j] + " to " +
-                                          joints_conversions[label] + ".")
-                                elements[j] = label
-                                break
-
-                    header.append(joints_conversions[elements[j]] + "_X")
-                    header.append(joints_conversions[elements[j]] + "_Y")
-                    header.append(joints_conversions[elements[j]] + "_Z")
-
-                else:
-                    header.append(elements[j] + "_X")
-                    header.append(elements[j] + "_Y")
-                    header.append(elements[j] + "_Z")
-
-            new_data.append(header)
-
-            if standardize_labels:
-                if verbosity > 0:
-                    print("\t\tLabels standardized.")
+            new_data.append(_get_qtm_header(elements[1:], standardize_labels, verbosity))
 
         if save_metadata:
-            if len(elements) == 2:
-                try:
-                    metadata[elements[0]] = literal_eval(elements[1])
-                except ValueError:
-                    pass
-                except SyntaxError:
-                    metadata[elements[0]] = elements[1]
-
-            else:
-                metadata[elements[0]] = elements[1:]
+            _read_qtm_metadata_line(elements, metadata)
 
         if elements[0] == "1":
             save_data = True
@@ -1268,6 +1576,101 @@ def convert_data_from_qtm(data, standardize_labels="auto", verbosity=1):
 
     return new_data, metadata
 
+def _get_qtm_header(marker_names, standardize_labels="auto", verbosity=1):
+    """Returns the header of a table from the marker names of a ``.tsv`` file produced by QTM, standardizing the names
+    of the joint labels if necessary. This function is called by :func:`convert_data_from_qtm` and
+    :func:`read_text_table_array`.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    marker_names: list(str)
+        The marker names, from the line starting with ``"MARKER_NAMES"`` of the QTM file.
+    standardize_labels: bool|str, optional
+        If set on ``"auto"`` (default), renames the labels if ``"HeadR"`` is detected in the joint labels
+        (see :ref:`Qualisys to Kualisys conversion<qualisys_to_kualisys>`). Enforce the renaming by setting
+        this parameter on `True`.
+    verbosity: int, optional
+        Sets how much feedback the code will provide in the console output:
+
+        • *0: Silent mode.* The code won’t provide any feedback, apart from error messages.
+        • *1: Normal mode* (default). The code will provide essential feedback such as progression markers and
+          current steps.
+        • *2: Chatty mode.* The code will provide all possible information on the events happening. Note that this
+          may clutter the output and slow down the execution.
+
+    Returns
+    -------
+    list(str)
+        The header of the table, starting with ``"Timestamp"``, followed by the X, Y and Z labels of each joint.
+    """
+    joints_conversions = load_qualisys_joint_label_conversion()
+    header = ["Timestamp"]
+
+    if standardize_labels == "auto" and set(marker_names).issubset(set(joints_conversions.keys())):
+        standardize_labels = True
+    elif standardize_labels is not True:
+        standardize_labels = False
+
+    if standardize_labels:
+        if verbosity == 1:
+            print("\t\tStandardizing joints labels...", end=" ")
+        elif verbosity > 1:
+            print("\t\tStandardizing joints labels...")
+
+    for marker_name in marker_names:
+
+        if standardize_labels:
+            # We remove the prefix by looking for a joint name in the label:
+            if marker_name not in joints_conversions.keys():
+                for label in joints_conversions.keys():
+                    if label in marker_name:
+                        if verbosity > 1:
+                            print("\t\t\tChanging label name " + marker_name + " to " +
+                                  joints_conversions[label] + ".")
+                        marker_name = label
+                        break
+
+            header.append(joints_conversions[marker_name] + "_X")
+            header.append(joints_conversions[marker_name] + "_Y")
+            header.append(joints_conversions[marker_name] + "_Z")
+
+        else:
+            header.append(marker_name + "_X")
+            header.append(marker_name + "_Y")
+            header.append(marker_name + "_Z")
+
+    if standardize_labels:
+        if verbosity > 0:
+            print("\t\tLabels standardized.")
+
+    return header
+
+
+def _read_qtm_metadata_line(elements, metadata):
+    """Adds the key and value(s) of a metadata line from a ``.tsv`` file produced by QTM to a metadata dictionary.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    elements: list(str)
+        The elements of a metadata line, the first one being the key.
+    metadata: dict
+        The dictionary in which to add the metadata.
+    """
+    if len(elements) == 2:
+        try:
+            metadata[elements[0]] = literal_eval(elements[1])
+        except ValueError:
+            pass
+        except SyntaxError:
+            metadata[elements[0]] = elements[1]
+
+    else:
+        metadata[elements[0]] = elements[1:]
+
 
 # === File saving functions ===
 def write_text_table(table, separator, path, metadata=None, separator_metadata=None, encoding="utf-8", verbosity=1):
@@ -1451,7 +1854,9 @@ def resample_data(array, original_timestamps, resampling_frequency, window_size=
     Parameters
     ----------
     array: list or np.ndarray
-        An array of samples.
+        An array of samples. If the array has two dimensions, the first dimension is considered as the samples, and
+        the second as the channels: all the channels are then resampled at once, sharing the same resampled timestamps,
+        windows and interpolation setup.
 
     original_timestamps: list(float) or numpy.ndarray(float)
         A list or an array of the time points corresponding to the values of the data.
@@ -1515,7 +1920,7 @@ def resample_data(array, original_timestamps, resampling_frequency, window_size=
     Returns
     -------
     numpy.ndarray(float)
-        The resampled values.
+        The resampled values. If ``array`` has two dimensions, the resampled array has the same number of columns.
     numpy.ndarray(float)
         The resampled time points, at a fixed frequency.
 
@@ -1570,7 +1975,7 @@ def resample_data(array, original_timestamps, resampling_frequency, window_size=
               " samples, with a " + str(round(overlap_ratio * 100, 2)) + " % overlap (" + str(overlap) +
               " samples).")
 
-    resampled_array = np.zeros(np.size(resampled_timestamps))
+    resampled_array = np.zeros((np.size(resampled_timestamps),) + np.shape(array)[1:])
     j = 0
     next_percentage = 10
 
@@ -1594,7 +1999,7 @@ def resample_data(array, original_timestamps, resampling_frequency, window_size=
                                            method, verbosity)
 
         if verbosity > 1:
-            print("Done.\n\t\t\t\tThe resampled window contains " + str(np.size(resampled_window)) + " sample(s).")
+            print("Done.\n\t\t\t\tThe resampled window contains " + str(len(resampled_window)) + " sample(s).")
 
         # Keep only the center values
         if i == 0:
@@ -1640,7 +2045,8 @@ def resample_window(array, original_timestamps, resampled_timestamps, index_star
     Parameters
     ----------
     array: list or np.ndarray
-        An array of samples.
+        An array of samples. If the array has two dimensions, the first dimension is considered as the samples, and
+        the second as the channels.
 
     original_timestamps: list or np.ndarray
         An array containing the timestamps for each sample of the original array.
@@ -1712,10 +2118,13 @@ def resample_window(array, original_timestamps, resampled_timestamps, index_star
               str(resampled_timestamps_window[-1]) + ").")
         print("\t\t\t\tInterpolating the data...", end=" ")
 
-    if np.size(array_window) == 1:
+    if len(array_window) == 1:
         raise Exception("Only one sample is present in the current window. Please select a larger window size.")
 
     if method == "linear":
+        if np.ndim(array_window) == 2:
+            return np.column_stack([np.interp(resampled_timestamps_window, original_timestamps_window,
+                                              array_window[:, channel]) for channel in range(np.shape(array)[1])])
         return np.interp(resampled_timestamps_window, original_timestamps_window, array_window)
     elif method == "cubic":
         interp = CubicSpline(original_timestamps_window, array_window)
@@ -1727,7 +2136,7 @@ def resample_window(array, original_timestamps, resampled_timestamps, index_star
         interp = Akima1DInterpolator(original_timestamps_window, array_window)
         return interp(resampled_timestamps_window)
     elif method.startswith("interp1d"):
-        interp = interp1d(original_timestamps, array, kind=method.split("_")[1])
+        interp = interp1d(original_timestamps, array, kind=method.split("_")[1], axis=0)
         return interp(resampled_timestamps_window)
     else:
         raise Exception("Invalid resampling method: " + str(method) + ".")
@@ -2032,7 +2441,8 @@ def calculate_euclidian_distances(x_array, y_array, z_array=None):
         distances_z = np.power(calculate_consecutive_distances(z_array), 2)
         return np.sqrt(distances_x + distances_y + distances_z)
 
-def calculate_derivative(array, derivative="velocity", window_length="auto", poly_order="auto", freq=1, mode="interp"):
+def calculate_derivative(array, derivative="velocity", window_length="auto", poly_order="auto", freq=1, mode="interp",
+                         axis=-1):
     """
     Using a Savitzky-Golay filter, calculates the derivative of a given array.
 
@@ -2073,6 +2483,11 @@ def calculate_derivative(array, derivative="velocity", window_length="auto", pol
     mode: str, optional
         The type of extension for the padded signal, must be one of the values accepted by the function
         scipy.signal.savgol_filter <https://docs.scipy.org/doc/scipy/reference/generated/scipy.signal.savgol_filter.html>`_
+
+    axis: int, optional
+        The axis of the array along which to calculate the derivative (default: -1). For a 2-dimensional array with
+        the samples on the first axis and one channel per column, setting this parameter on 0 calculates the
+        derivatives of all the channels in one call.
     """
 
     derivatives = {"distance": 0, "velocity": 1, "speed": 1, "acceleration": 2, "jerk": 3, "jounce": 4, "snap": 4,
@@ -2103,7 +2518,7 @@ def calculate_derivative(array, derivative="velocity", window_length="auto", pol
     if poly_order > window_length:
         raise Exception("The order of the polynomial must be lower than the window length.")
 
-    result = savgol_filter(array, window_length, poly_order, derivative, 1 / freq, mode=mode)
+    result = savgol_filter(array, window_length, poly_order, derivative, 1 / freq, axis=axis, mode=mode)
     if np.iscomplexobj(result):
         result = np.real(result)
     return result.astype(np.float64)
@@ -2996,6 +3411,176 @@ def remove_average(array):
 
     return array - np.mean(array)
 
+# === Cache functions ===
+def set_cache_folder(folder=None, max_size=1e9):
+    """Enables the on-disk cache of the audio derivatives (envelope, pitch, intensity and formants), or disables it if
+    ``folder`` is set on ``None``. Once enabled, the samples of each audio derivative calculated by the toolbox are
+    saved in the cache folder, and reused when the same derivative is requested on the same audio samples with the same
+    parameters - including in other Python sessions.
+
+    The cache settings are stored in the environment variables ``KRAJJAT_CACHE_FOLDER`` and
+    ``KRAJJAT_CACHE_MAX_SIZE``. They are thus shared with the parallel workers started after calling this function,
+    and can also be defined before starting Python.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    folder: str|None, optional
+        The path to the folder where to store the cached derivatives. If the folder does not exist, it is created. If
+        set on ``None`` (default), the cache is disabled - the files already present in the cache are not deleted.
+    max_size: int|float, optional
+        The maximum size of the cache, in bytes (default: 1e9, i.e. 1 GB). When the cache exceeds this size, the least
+        recently used derivatives are deleted.
+
+    Example
+    -------
+    >>> set_cache_folder("C:/Users/Homer/cache", max_size=5e9)
+    """
+    if folder is None:
+        os.environ.pop("KRAJJAT_CACHE_FOLDER", None)
+    else:
+        os.makedirs(folder, exist_ok=True)
+        os.environ["KRAJJAT_CACHE_FOLDER"] = op.abspath(folder)
+        os.environ["KRAJJAT_CACHE_MAX_SIZE"] = str(int(max_size))
+
+
+def get_cache_folder():
+    """Returns the path to the folder of the on-disk cache of the audio derivatives, or ``None`` if the cache is
+    disabled (see :func:`set_cache_folder`).
+
+    .. versionadded:: 2.0
+
+    Returns
+    -------
+    str|None
+        The path to the cache folder, or ``None``.
+    """
+    return os.environ.get("KRAJJAT_CACHE_FOLDER")
+
+
+def clear_cache():
+    """Deletes all the files from the cache folder (see :func:`set_cache_folder`). If the cache is disabled, this
+    function does nothing.
+
+    .. versionadded:: 2.0
+    """
+    folder = get_cache_folder()
+    if folder is not None:
+        for path in glob.glob(op.join(folder, "*.npy")):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+def get_cache_key(array, *parameters):
+    """Returns a key identifying an array and a series of parameters, made of the SHA-256 hash of the content of the
+    array and of the parameters.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    array: list|numpy.ndarray
+        An array (typically, the samples of an audio clip).
+    *parameters: any
+        Parameters that can be converted to JSON (or to a string) defining the operation performed on the array.
+
+    Returns
+    -------
+    str
+        A hexadecimal key of 64 characters.
+
+    Example
+    -------
+    >>> get_cache_key([1, 2, 3], "envelope", 1000000, 0.5)
+    'b7ff552d3fbbb112668b2996226744fcf770772f090c6f8b7d0205b1f43c3302'
+    """
+    array = np.ascontiguousarray(array)
+    hasher = hashlib.sha256()
+    hasher.update(f"{array.dtype.str}{array.shape}".encode())
+    hasher.update(array)
+    hasher.update(json.dumps(parameters, default=str).encode())
+    return hasher.hexdigest()
+
+
+def load_from_cache(key):
+    """Returns the array saved in the cache under a given key, or ``None`` if the cache is disabled or if the key is
+    not in the cache.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    key: str
+        A key, as returned by :func:`get_cache_key`.
+
+    Returns
+    -------
+    numpy.ndarray|None
+        The cached array, or ``None``.
+    """
+    folder = get_cache_folder()
+    if folder is None:
+        return None
+
+    path = op.join(folder, key + ".npy")
+    try:
+        array = np.load(path, allow_pickle=False)
+        os.utime(path)  # Marks the file as recently used
+    except (OSError, ValueError):
+        return None
+
+    return array
+
+
+def save_to_cache(key, array):
+    """Saves an array in the cache under a given key, then deletes the least recently used files of the cache if its
+    size exceeds the maximum size (see :func:`set_cache_folder`). If the cache is disabled, this function does nothing.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    key: str
+        A key, as returned by :func:`get_cache_key`.
+    array: numpy.ndarray
+        The array to save.
+    """
+    folder = get_cache_folder()
+    if folder is None:
+        return
+
+    os.makedirs(folder, exist_ok=True)
+    path = op.join(folder, key + ".npy")
+
+    # The file is written under a temporary name first, so that parallel workers never read an incomplete file
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "wb") as f:
+        np.save(f, np.asarray(array), allow_pickle=False)
+    os.replace(temporary_path, path)
+
+    max_size = float(os.environ.get("KRAJJAT_CACHE_MAX_SIZE", 1e9))
+    files = []
+    for file_path in glob.glob(op.join(folder, "*.npy")):
+        try:
+            stats = os.stat(file_path)
+        except FileNotFoundError:
+            continue
+        files.append((stats.st_mtime, stats.st_size, file_path))
+
+    total_size = sum(file[1] for file in files)
+    for _, size, file_path in sorted(files):
+        if total_size <= max_size:
+            break
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass
+        total_size -= size
+
+
 # === Joint labels functions ===
 def load_joint_labels(system="kinect", part="all", label_style="original"):
     """Loads and returns a list of joint labels from a file.
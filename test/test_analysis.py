@@ -1,14 +1,60 @@
 """Tests the Analysis functions from the toolbox."""
 
+import functools
+import json
 import unittest
 
-from krajjat import Experiment, Subject, Trial, Sequence, Audio, Envelope
+from krajjat import Experiment, Subject, Trial, Sequence, Audio, Envelope, Results, SegmentedDataframe
 from krajjat.analysis_functions import *
+from krajjat.analysis_functions import _compute_batch_perms, _compute_correlation_batch, _compute_correlation_lags, \
+    _compute_correlation_shifts, _compute_individual_coherences, _compute_individual_power_spectra, _compute_ksg, \
+    _compute_mutual_information_ksg, _compute_power_spectrum, _fit_spectral_background_lines, _get_data_matrix, \
+    _get_segment_arrays, _load_checkpoint, _phase_randomize, _phase_randomize_batch, _resolve_lower_freq, \
+    _save_checkpoint, _share_individual_arrays
+import os
 import os.path as op
+import tempfile
+import warnings
+from types import SimpleNamespace
+from unittest import mock
+
+from scipy import signal, stats
 
 from krajjat.display_functions import common_displayer
 
 
+@functools.lru_cache(maxsize=None)
+def load_test_experiment():
+    """Returns an experiment with two subjects of two trials, each trial containing 15 seconds of
+    test_sequences/sequence_ainhoa_trimmed.tsv, resampled at 20 Hz. The experiment is only created once, and must not be
+    modified by the tests."""
+    sequence = Sequence(op.join("test_sequences", "sequence_ainhoa_trimmed.tsv"), verbosity=0)
+    sequence = sequence.resample(20, verbosity=0)
+    experiment = Experiment("Test Experiment")
+    for s, subject_name in enumerate(["Alpha", "Beta"]):
+        subject = Subject(subject_name)
+        for t, trial_name in enumerate(["R001", "R002"]):
+            trial = Trial(trial_name)
+            trial.set_sequence(sequence.trim(30 * s + 15 * t, 30 * s + 15 * t + 15, verbosity=0))
+            subject.add_trial(trial, verbosity=0)
+        experiment.add_subject(subject)
+    return experiment
+
+
+@functools.lru_cache(maxsize=None)
+def load_test_dataframe():
+    """Returns the dataframe of the velocity of the experiment returned by load_test_experiment. The dataframe is only
+    created once, and must not be modified by the tests."""
+    return load_test_experiment().get_dataframe("velocity", None, verbosity=0)
+
+
+def get_test_values(label, subject="Alpha", trial="R001"):
+    """Returns the velocity of a joint in a trial of the dataframe returned by load_test_dataframe."""
+    dataframe = load_test_dataframe()
+    rows = (dataframe["subject"] == subject) & (dataframe["trial"] == trial) & (dataframe["label"] == label)
+    return dataframe.loc[rows, "value"].to_numpy(dtype=float)
+
+
 class TestsAnalysisFunctions(unittest.TestCase):
 
     def test_power_spectrum(self):
@@ -152,4 +198,705 @@ class TestsAnalysisFunctions(unittest.TestCase):
         # a, s, z, p = correlation(df, method="corr", include_randperm="whole", number_of_randperms=1000, random_seed=42,
         #                          verbosity=2)
         # print(z)
-        # print(p)
\ No newline at end of file
+        # print(p)
+
+    def test_mutual_information(self):
+        from sklearn.feature_selection import mutual_info_regression
+        from sklearn.feature_selection._mutual_info import _compute_mi_cc
+        from sklearn.preprocessing import MinMaxScaler, StandardScaler
+
+        labels = ["HandRight", "HandLeft", "ElbowRight", "Neck"]
+        measure_values = np.stack([get_test_values(label) for label in labels])
+        target = get_test_values("Head")
+
+        # The KSG estimator, against the one of scikit-learn, with values with and without ties
+        for x, y in [(measure_values, target), (np.round(measure_values, 2), np.round(target, 2))]:
+            for n_neighbors in [3, 5]:
+                expected = [_compute_mi_cc(row, y, n_neighbors) for row in x]
+                assert np.allclose(_compute_ksg(x, y, n_neighbors), expected, rtol=1e-12, atol=0)
+                assert np.allclose(_compute_ksg(y, x, n_neighbors), [_compute_mi_cc(y, row, n_neighbors) for row in x],
+                                   rtol=1e-12, atol=0)
+                assert np.allclose(_compute_ksg(x, x[::-1], n_neighbors),
+                                   [_compute_mi_cc(a, b, n_neighbors) for a, b in zip(x, x[::-1])], rtol=1e-12, atol=0)
+
+        # The mutual information of all the rows at once, against mutual_info_regression called row by row
+        scalers = {"standard": StandardScaler, "minmax": MinMaxScaler, None: None}
+        for scale, scaler in scalers.items():
+            def scaled(values):
+                if scaler is None:
+                    return values
+                return scaler().fit_transform(values.reshape(-1, 1)).reshape(-1)
+
+            for direction in ["target", "predictor", "both"]:
+                results = _compute_mutual_information_ksg(measure_values, target, 42, 3, scale, direction)
+                for row, result in zip(measure_values, results):
+                    x, y = scaled(row), scaled(target)
+                    mi_target = mutual_info_regression(x.reshape(-1, 1), y, n_neighbors=3, random_state=42)[0]
+                    mi_predictor = mutual_info_regression(y.reshape(-1, 1), x, n_neighbors=3, random_state=42)[0]
+                    expected = {"target": mi_target, "predictor": mi_predictor,
+                                "both": (mi_target + mi_predictor) / 2}[direction]
+                    assert np.isclose(result, expected, rtol=1e-12, atol=0)
+
+        # Fewer samples than neighbours
+        assert np.isnan(_compute_mutual_information_ksg(measure_values[:, :3], target[:3], 42, 3, None,
+                                                        "target")).all()
+
+        # In the analysis, the native estimator returns the same values as mutual_info_regression, with the same noise
+        parameters = {"sequence_measure": "velocity", "audio_measure": None, "regression_with": "Head",
+                      "average": "subject", "lags": [-0.5, 0, 0.25], "result_type": "z-scores",
+                      "permutation_method": "value", "number_of_randperms": 4, "random_seed": 42, "verbosity": 0,
+                      "show": False}
+        ksg = mutual_information(load_test_dataframe(), method="ksg", **parameters)
+        sklearn = mutual_information(load_test_dataframe(), method="sklearn", **parameters)
+        assert np.allclose(ksg.averages.values, sklearn.averages.values, rtol=1e-12, atol=0, equal_nan=True)
+        assert np.allclose(ksg.averages_perm.values, sklearn.averages_perm.values, rtol=1e-12, atol=0,
+                           equal_nan=True)
+        assert np.nanmin(ksg.averages.values) >= 0
+
+    def test_merge_shards(self):
+        parameters = {"sequence_measure": "velocity", "audio_measure": None, "coherence_with": "Head",
+                      "average": "subject", "result_type": "z-scores", "permutation_method": "value",
+                      "number_of_randperms": 6, "random_seed": 42, "specific_frequency": 1.5, "freq_atol": 0.2,
+                      "verbosity": 0, "show": False}
+
+        full = coherence(load_test_dataframe(), **parameters)
+        shards = [coherence(load_test_dataframe(), shard=(i, 3), **parameters) for i in range(3)]
+        shard_perms = [shard.randperm_values.values.copy() for shard in shards]
+
+        # Each shard computes its own part of the permutations of the analysis run as a single shard
+        single = coherence(load_test_dataframe(), shard=(0, 1), **parameters)
+        axis = single.randperm_values.filled.ndim
+        assert [perms.shape[axis] for perms in shard_perms] == [2, 2, 2]
+        assert np.allclose(np.concatenate(shard_perms, axis=axis), single.randperm_values.values, equal_nan=True)
+
+        # Merging does not modify the shards: they can be merged again, in any order
+        for order in [shards, shards[::-1]]:
+            merged = Results.merge(order, verbosity=0)
+            assert np.allclose(merged.averages.values, full.averages.values, equal_nan=True)
+            assert np.allclose(merged.averages_perm.values, full.averages_perm.values, equal_nan=True)
+            assert np.allclose(merged.stds_perm.values, full.stds_perm.values, equal_nan=True)
+            assert np.allclose(merged.z_scores.values, full.z_scores.values, equal_nan=True)
+            for shard, perms in zip(shards, shard_perms):
+                assert np.array_equal(shard.randperm_values.values, perms, equal_nan=True)
+
+        # The shards can be saved, and merged once loaded on another machine
+        with tempfile.TemporaryDirectory() as folder:
+            for i, shard in enumerate(shards):
+                shard.save(op.join(folder, f"shard_{i}.npz"))
+                shard.save(op.join(folder, f"shard_{i}.json"))
+            for extension in ["npz", "json"]:
+                loaded_shards = [Results.load(op.join(folder, f"shard_{i}.{extension}")) for i in range(3)]
+                merged = Results.merge(loaded_shards, verbosity=0)
+                assert np.allclose(merged.averages.values, full.averages.values, equal_nan=True)
+                assert np.allclose(merged.z_scores.values, full.z_scores.values, equal_nan=True)
+
+        # All the shards are needed, each once
+        self.assertRaises(ValueError, Results.merge, shards[:2], verbosity=0)
+        self.assertRaises(ValueError, Results.merge, shards + [shards[0]], verbosity=0)
+        self.assertRaises(ValueError, Results.merge, [full], verbosity=0)
+
+    def test_checkpoint_folder(self):
+        lags = [-0.5, 0, 0.5]
+        rng = np.random.default_rng(0)
+        results_by_lag = {lag: [rng.random(4) for _ in range(3)] for lag in lags}
+
+        with tempfile.TemporaryDirectory() as folder:
+            # Nothing saved yet
+            assert _load_checkpoint(folder, "key", lags) is None
+
+            # The permutations are saved and loaded lag by lag, without leaving a temporary file behind
+            _save_checkpoint(op.join(folder, "checkpoints"), "key", results_by_lag)
+            assert os.listdir(op.join(folder, "checkpoints")) == ["key.npz"]
+            loaded = _load_checkpoint(op.join(folder, "checkpoints"), "key", lags)
+            assert list(loaded.keys()) == lags
+            for lag in lags:
+                assert len(loaded[lag]) == 3
+                assert np.array_equal(np.array(loaded[lag]), np.array(results_by_lag[lag]))
+
+            # A file with fewer lags, or an incomplete file, is ignored
+            assert _load_checkpoint(op.join(folder, "checkpoints"), "key", lags + [1]) is None
+            with open(op.join(folder, "checkpoints", "incomplete.npz"), "wb") as f:
+                f.write(b"PK\x03\x04")
+            assert _load_checkpoint(op.join(folder, "checkpoints"), "incomplete", lags) is None
+
+        parameters = {"sequence_measure": "velocity", "audio_measure": None, "coherence_with": "Head",
+                      "average": "subject", "result_type": "z-scores", "permutation_method": "value",
+                      "number_of_randperms": 6, "specific_frequency": 1.5, "freq_atol": 0.2, "verbosity": 0,
+                      "show": False}
+
+        full = coherence(load_test_dataframe(), random_seed=42, **parameters)
+
+        with tempfile.TemporaryDirectory() as folder:
+            coherence(load_test_dataframe(), random_seed=42, checkpoint_folder=folder, **parameters)
+            checkpoints = sorted(os.listdir(folder))
+            assert len(checkpoints) > 1
+
+            # Interrupted run: only some of the permutations have been saved
+            for checkpoint in checkpoints[::2]:
+                os.remove(op.join(folder, checkpoint))
+
+            for _ in range(2):
+                resumed = coherence(load_test_dataframe(), random_seed=42, checkpoint_folder=folder, **parameters)
+                assert sorted(os.listdir(folder)) == checkpoints
+                assert np.allclose(resumed.averages.values, full.averages.values, equal_nan=True)
+                assert np.allclose(resumed.averages_perm.values, full.averages_perm.values, equal_nan=True)
+                assert np.allclose(resumed.z_scores.values, full.z_scores.values, equal_nan=True)
+
+            # The saved permutations are read instead of being computed again
+            for checkpoint in checkpoints:
+                with np.load(op.join(folder, checkpoint)) as content:
+                    arrays = {key: np.zeros_like(content[key]) for key in content.files}
+                np.savez(op.join(folder, checkpoint), **arrays)
+            zeros = coherence(load_test_dataframe(), random_seed=42, checkpoint_folder=folder, **parameters)
+            assert np.allclose(zeros.averages.values, full.averages.values, equal_nan=True)
+            assert np.allclose(zeros.averages_perm.values[~np.isnan(zeros.averages_perm.values)], 0)
+
+            # The permutations can only be resumed if they are reproducible
+            self.assertRaises(ValueError, coherence, load_test_dataframe(), random_seed=None,
+                              checkpoint_folder=folder, **parameters)
+
+    def test_results_save_load(self):
+        parameters = {"sequence_measure": "velocity", "audio_measure": None, "coherence_with": "Head",
+                      "average": "subject", "result_type": "z-scores", "permutation_method": "value",
+                      "number_of_randperms": 6, "random_seed": 42, "verbosity": 0, "show": False}
+        results = coherence(load_test_dataframe(), **parameters)
+
+        with tempfile.TemporaryDirectory() as folder:
+            path_npz = op.join(folder, "coherence.npz")
+            path_json = op.join(folder, "coherence.json")
+            results.save(path_npz)
+            results.save(path_json)
+
+            # The .npz file holds a JSON header, and the arrays stored natively, without pickling
+            with np.load(path_npz, allow_pickle=False) as content:
+                header = json.loads(str(content["header"]))
+                assert header["krajjat_results_version"] == 1
+                stored = [content[key] for key in content.files if key != "header"]
+            assert any(array.shape == results.z_scores.values.shape and
+                       np.array_equal(array, results.z_scores.values, equal_nan=True) for array in stored)
+            assert op.getsize(path_npz) < op.getsize(path_json)
+
+            for loaded in [Results.load(path_npz), Results.load(path_json)]:
+                assert loaded.analysis == results.analysis
+                assert loaded.labels == results.labels
+                assert loaded.number_of_randperms == results.number_of_randperms
+                assert loaded.timestamp == results.timestamp
+                assert loaded.duration == results.duration
+                assert np.array_equal(loaded.frequencies, results.frequencies)
+                assert loaded.plot_dictionary.keys() == results.plot_dictionary.keys()
+
+                for name in ["averages", "stds", "averages_perm", "stds_perm", "z_scores", "p_values"]:
+                    original = getattr(results, name)
+                    value = getattr(loaded, name)
+                    assert type(value) is type(original)
+                    assert value.keys() == original.keys()
+                    assert value.values.dtype == original.values.dtype
+                    assert np.array_equal(value.values, original.values, equal_nan=True)
+
+            # The results of a .npz file are only read when they are first accessed
+            loaded = Results.load(path_npz)
+            assert "z_scores" not in loaded.__dict__
+            z_scores = loaded.z_scores
+            assert "z_scores" in loaded.__dict__
+            assert loaded.z_scores is z_scores
+            assert np.array_equal(z_scores.values, results.z_scores.values, equal_nan=True)
+            self.assertRaises(AttributeError, getattr, loaded, "unknown_attribute")
+
+    def test_correlation_fft(self):
+        x = get_test_values("HandRight")
+        y = get_test_values("Head")
+        n = x.size
+
+        # Lag scan, against np.corrcoef on the arrays trimmed for each lag (lag by lag if there are NaN values)
+        lags = [-2, -0.5, -0.05, 0, 0.1, 1.35, 14.95, 15.05]
+        x_nan = x.copy()
+        x_nan[5] = np.nan
+        for measure_values in [x, x_nan]:
+            results = _compute_correlation_lags(measure_values, y, lags, 20)
+            for lag in lags:
+                sample = int(np.round(lag * 20))
+                if abs(sample) >= n - 1:
+                    assert np.isnan(results[lag])
+                elif sample >= 0:
+                    expected = np.corrcoef(measure_values[:n - sample], y[sample:])[0, 1]
+                    assert np.isclose(results[lag], expected, equal_nan=True)
+                else:
+                    expected = np.corrcoef(measure_values[-sample:], y[:n + sample])[0, 1]
+                    assert np.isclose(results[lag], expected, equal_nan=True)
+
+        # Circular shifts, against np.corrcoef on the rolled arrays
+        shifts = [1, 7, n // 2, n - 1]
+        assert np.allclose(_compute_correlation_shifts(x, y, shifts),
+                           [np.corrcoef(np.roll(x, shift), y)[0, 1] for shift in shifts])
+
+        # In the analysis, the FFT method returns the correlations of the numpy method
+        for permutation_method in ["shift", "value"]:
+            results = {}
+            for method in ["numpy", "fft"]:
+                results[method] = correlation(
+                    load_test_dataframe(), method=method, sequence_measure="velocity", audio_measure=None,
+                    correlation_with="Head", average="trial", lags=[-0.5, -0.1, 0, 0.05, 0.3], result_type="z-scores",
+                    permutation_method=permutation_method, number_of_randperms=8, random_seed=42, verbosity=0,
+                    show=False)
+            assert np.allclose(results["fft"].averages.values, results["numpy"].averages.values, equal_nan=True)
+            assert np.allclose(results["fft"].averages_perm.values, results["numpy"].averages_perm.values,
+                               equal_nan=True)
+
+    def test_phase_surrogates(self):
+        seeds = [3, 17, 123456]
+
+        # Signals of odd (301 samples) and even (300 samples) lengths
+        for x in [get_test_values("HandRight"), get_test_values("HandRight")[1:]]:
+            spectrum = np.fft.rfft(x)
+            surrogates = _phase_randomize_batch(spectrum, x.size, seeds)
+            assert surrogates.shape == (len(seeds), x.size)
+
+            for seed, surrogate in zip(seeds, surrogates):
+                # Same surrogate as the one generated alone from the seed
+                assert np.allclose(surrogate, _phase_randomize(x, np.random.default_rng(seed)))
+
+                # Same amplitude spectrum and mean as the signal, but different values
+                assert np.allclose(np.abs(np.fft.rfft(surrogate)), np.abs(spectrum))
+                assert np.isclose(np.mean(surrogate), np.mean(x))
+                assert not np.allclose(surrogate, x)
+
+        # In the analyses, the surrogates generated in blocks give the same results as the loop
+        for analysis, target in [(power_spectrum, {}), (coherence, {"coherence_with": "Head", "lags": [0, 0.05]})]:
+            results = {}
+            for permutation_engine in ["loop", "batch"]:
+                results[permutation_engine] = analysis(
+                    load_test_dataframe(), sequence_measure="velocity", audio_measure=None, average="subject",
+                    result_type="z-scores", permutation_method="phase", number_of_randperms=8, random_seed=42,
+                    permutation_engine=permutation_engine, verbosity=0, show=False, **target)
+            assert np.array_equal(results["batch"].frequencies, results["loop"].frequencies)
+            assert np.allclose(results["batch"].averages_perm.values, results["loop"].averages_perm.values,
+                               equal_nan=True)
+            assert np.allclose(results["batch"].stds_perm.values, results["loop"].stds_perm.values, equal_nan=True)
+
+    def test_parallel_processes(self):
+        label_arrays = {"HandRight": get_test_values("HandRight"), "HandLeft": get_test_values("HandLeft")[:200]}
+        target_values = get_test_values("Head")
+
+        # The shared arrays are read-only views on a single memory-mapped file, with the same values as the inputs
+        with tempfile.TemporaryDirectory() as folder:
+            shared_arrays, shared_target = _share_individual_arrays(label_arrays, target_values, folder)
+            assert len(os.listdir(folder)) == 1
+            assert list(shared_arrays.keys()) == list(label_arrays.keys())
+            for label in label_arrays:
+                assert isinstance(shared_arrays[label].base, np.memmap)
+                assert not shared_arrays[label].flags.writeable
+                assert np.array_equal(shared_arrays[label], label_arrays[label])
+            assert isinstance(shared_target.base, np.memmap)
+            assert np.array_equal(shared_target, target_values)
+
+            shared_arrays, shared_target = _share_individual_arrays(label_arrays, None, folder)
+            assert shared_target is None
+            assert np.array_equal(shared_arrays["HandLeft"], label_arrays["HandLeft"])
+
+            # Empty arrays are returned as they are
+            empty_arrays = {"HandRight": np.array([])}
+            shared_arrays, shared_target = _share_individual_arrays(empty_arrays, np.array([]), folder)
+            assert shared_arrays is empty_arrays
+            assert len(os.listdir(folder)) == 2
+            del shared_arrays, shared_target
+
+        parameters = {"sequence_measure": "velocity", "audio_measure": None, "average": "subject",
+                      "result_type": "z-scores", "number_of_randperms": 6, "random_seed": 42, "verbosity": 0,
+                      "show": False}
+
+        # The worker processes receive the signals through memory-mapped files, and return the same results
+        for analysis, permutation_method, target in [(correlation, "value", {"correlation_with": "Head"}),
+                                                     (coherence, "label", {"coherence_with": "Head"}),
+                                                     (power_spectrum, "phase", {})]:
+            sequential = analysis(load_test_dataframe(), permutation_method=permutation_method, n_jobs=1,
+                                  **target, **parameters)
+            processes = analysis(load_test_dataframe(), permutation_method=permutation_method, n_jobs=2,
+                                 parallel_prefer="processes", **target, **parameters)
+            assert np.allclose(processes.averages.values, sequential.averages.values, equal_nan=True)
+            assert np.allclose(processes.averages_perm.values, sequential.averages_perm.values, equal_nan=True)
+            assert np.allclose(processes.z_scores.values, sequential.z_scores.values, equal_nan=True)
+
+    def test_pca_batch_size(self):
+        sequence = Sequence(op.join("test_sequences", "sequence_ainhoa_trimmed.tsv"), verbosity=0)
+        sequence = sequence.resample(20, verbosity=0)
+        experiment = Experiment("Test Experiment")
+        for name in ["Alpha", "Beta"]:
+            subject = Subject(name)
+            trial = Trial("R001")
+            trial.set_sequence(sequence.copy())
+            subject.add_trial(trial, verbosity=0)
+            experiment.add_subject(subject)
+
+        parameters = {"sequence_measure": "velocity", "audio_measure": None, "verbosity": 0, "show": False}
+
+        # The incremental PCA is close to the PCA of the whole matrix for the leading components
+        for data in [sequence, experiment]:
+            result, components, explained_variance = pca(data, n_components=5, random_seed=0, **parameters)
+            result_batch, components_batch, explained_variance_batch = pca(data, n_components=5, batch_size=200,
+                                                                           **parameters)
+            assert result_batch.shape == result.shape
+            assert np.allclose(explained_variance_batch[:3], explained_variance[:3], atol=2e-3)
+            for component, component_batch in zip(components[:3], components_batch[:3]):
+                assert list(component_batch.keys()) == list(component.keys())
+                a = np.array(list(component.values()))
+                b = np.array(list(component_batch.values()))
+                assert abs(np.dot(a, b)) / (np.linalg.norm(a) * np.linalg.norm(b)) > 0.999
+
+        # Same number of components for a proportion of explained variance
+        _, components, _ = pca(sequence, n_components=0.9, **parameters)
+        _, components_batch, _ = pca(sequence, n_components=0.9, batch_size=200, **parameters)
+        assert len(components_batch) == len(components)
+
+        self.assertRaises(ValueError, pca, sequence, n_components="mle", batch_size=200, **parameters)
+        self.assertRaises(ValueError, pca, experiment, n_components=5, batch_size=200, level="trial", **parameters)
+
+    def test_pca_nan_behaviour(self):
+        sequence = Sequence(op.join("test_sequences", "sequence_ainhoa_trimmed.tsv"), verbosity=0)
+        sequence = sequence.resample(20, verbosity=0)
+
+        # Neck has no value, Head has NaN values on 15% of the poses, and HandRight on a single pose
+        for p in range(sequence.get_number_of_poses()):
+            sequence.poses[p].joints["Neck"].set_position(np.nan, np.nan, np.nan)
+        for p in range(200, 400):
+            sequence.poses[p].joints["Head"].set_position(np.nan, np.nan, np.nan)
+        sequence.poses[800].joints["HandRight"].set_position(np.nan, np.nan, np.nan)
+
+        parameters = {"n_components": 3, "sequence_measure": "velocity", "audio_measure": None, "verbosity": 0,
+                      "show": False}
+        result, components, _ = pca(sequence, nan_behaviour="zero", **parameters)
+        all_labels = list(components[0].keys()) + ["Neck"]
+        number_rows = len(result)
+
+        # Labels dropped and rows kept for each behaviour
+        expected = {0.1: (["Head", "Neck"], False), 0.5: (["Neck"], False),
+                    "drop_labels": (["HandRight", "Head", "Neck"], True), "drop_timestamps": (["Neck"], False),
+                    "zero": (["Neck"], True)}
+
+        for batch_size in [None, 200]:
+            for nan_behaviour, (dropped_labels, all_rows) in expected.items():
+                result, components, _ = pca(sequence, nan_behaviour=nan_behaviour, batch_size=batch_size,
+                                            **parameters)
+                labels = list(components[0].keys())
+                assert sorted(set(all_labels) - set(labels)) == sorted(dropped_labels)
+                assert (len(result) == number_rows) == all_rows
+                assert not np.isnan(result).any()
+
+            self.assertRaises(ValueError, pca, sequence, nan_behaviour=1.5, batch_size=batch_size, **parameters)
+            self.assertRaises(ValueError, pca, sequence, nan_behaviour="remove", batch_size=batch_size, **parameters)
+
+    def test_segmented_dataframe(self):
+        dataframe = load_test_dataframe()
+        segmented = load_test_experiment().get_segmented_dataframe("velocity", None, verbosity=0)
+
+        # Same data as the long dataframe
+        assert len(segmented) == len(dataframe)
+        pd.testing.assert_frame_equal(segmented.to_dataframe(), dataframe)
+
+        # The values of the labels of an individual, against the values of its trials in the long dataframe
+        segments = segmented.segments
+        segments_beta = segments.loc[segments["subject"] == "Beta"]
+        label_arrays, target_values = _get_segment_arrays(segmented, segments_beta, ["HandRight", "Neck", "Unknown"])
+        assert target_values is None
+        for label in ["HandRight", "Neck"]:
+            expected = np.concatenate([get_test_values(label, "Beta", trial) for trial in ["R001", "R002"]])
+            assert np.array_equal(label_arrays[label], expected)
+        assert label_arrays["Unknown"].size == 0
+
+        # With a target, only the timestamps present in both the measure and the target of a trial are kept
+        dataframe_target = dataframe.loc[(dataframe["label"] != "Head") | (dataframe["timestamp"] > 1)]
+        dataframe_target = dataframe_target.reset_index(drop=True)
+        columns = ["subject", "trial", "modality", "label", "measure"]
+        segments = dataframe_target[columns].drop_duplicates().reset_index(drop=True)
+        segments["length"] = dataframe_target.groupby(columns, sort=False, observed=True).size().to_numpy()
+        segments["offset"] = np.cumsum(segments["length"]) - segments["length"]
+        segmented_target = SegmentedDataframe(segments, dataframe_target["timestamp"].to_numpy(),
+                                              dataframe_target["value"].to_numpy())
+        segments_beta = segments.loc[segments["subject"] == "Beta"]
+        label_arrays, target_values = _get_segment_arrays(segmented_target, segments_beta, ["HandRight"],
+                                                          segments_beta.loc[segments_beta["label"] == "Head"])
+        merged = pd.merge(dataframe_target.loc[(dataframe_target["subject"] == "Beta") &
+                                               (dataframe_target["label"] == "HandRight")],
+                          dataframe_target.loc[(dataframe_target["subject"] == "Beta") &
+                                               (dataframe_target["label"] == "Head")],
+                          on=["subject", "trial", "timestamp"], how="inner")
+        assert np.array_equal(label_arrays["HandRight"], merged["value_x"].to_numpy())
+        assert np.array_equal(target_values, merged["value_y"].to_numpy())
+
+        parameters = {"sequence_measure": "velocity", "audio_measure": None, "result_type": "z-scores",
+                      "permutation_method": "value", "number_of_randperms": 4, "random_seed": 42, "verbosity": 0,
+                      "show": False}
+
+        # The values of the individuals are read from the segments, without creating the long dataframe
+        with mock.patch.object(SegmentedDataframe, "to_dataframe", side_effect=AssertionError):
+            for analysis, options in [(correlation, {"correlation_with": "Head", "average": "subject"}),
+                                      (coherence, {"coherence_with": "Head", "average": "trial"}),
+                                      (power_spectrum, {"average": None, "subjects": "Beta"})]:
+                for data, data_segmented in [(dataframe, segmented), (dataframe_target, segmented_target)]:
+                    expected = analysis(data, **options, **parameters)
+                    results = analysis(data_segmented, **options, **parameters)
+                    assert list(results.individuals) == list(expected.individuals)
+                    assert np.array_equal(results.averages.values, expected.averages.values, equal_nan=True)
+                    assert np.array_equal(results.averages_perm.values, expected.averages_perm.values,
+                                          equal_nan=True)
+
+    def test_batch_permutations(self):
+        x = get_test_values("HandRight")
+        y = get_test_values("Head")
+        seeds = np.random.default_rng(0).integers(0, 2 ** 31, size=12)
+
+        # Correlations of the rows of a matrix, against np.corrcoef and scipy.stats.pearsonr (without the NaN pairs)
+        rows = np.stack([np.roll(x, shift) for shift in range(0, 60, 5)])
+        expected = [np.corrcoef(row, y)[0, 1] for row in rows]
+        assert np.allclose(_compute_correlation_batch("numpy", rows, y), expected)
+        rows[::3, 10:20] = np.nan
+        expected = [abs(stats.pearsonr(row[~np.isnan(row)], y[~np.isnan(row)])[0]) for row in rows]
+        assert np.allclose(_compute_correlation_batch("pingouin", rows, y), expected)
+
+        # Correlations of the surrogates of each permutation method, generated from the seeds
+        surrogates = {"value": [np.random.default_rng(seed).permutation(x) for seed in seeds],
+                      "shift": [np.roll(x, np.random.default_rng(seed).integers(1, x.size)) for seed in seeds],
+                      "phase": [_phase_randomize(x, np.random.default_rng(seed)) for seed in seeds],
+                      "label": [get_test_values(label) for label in ["Neck", "HandLeft", "SpineMid", "KneeRight"]]}
+        for permutation_method, perms in surrogates.items():
+            precomputed_perms = perms if permutation_method == "label" else None
+            results = _compute_batch_perms(seeds[:len(perms)], x, y, permutation_method, "correlation", "numpy", 20,
+                                           None, None, precomputed_perms)
+            assert np.allclose(results, [np.corrcoef(perm, y)[0, 1] for perm in perms])
+
+        # The batch engine returns the same results as the loop engine
+        for permutation_method in ["value", "shift", "phase", "label"]:
+            results = {}
+            for permutation_engine in ["loop", "batch"]:
+                results[permutation_engine] = correlation(
+                    load_test_dataframe(), method="numpy", sequence_measure="velocity", audio_measure=None,
+                    correlation_with="Head", average="subject", lags=[-0.1, 0, 0.2], result_type="z-scores",
+                    permutation_method=permutation_method, number_of_randperms=8, random_seed=42,
+                    permutation_engine=permutation_engine, verbosity=0, show=False)
+            assert np.allclose(results["batch"].averages_perm.values, results["loop"].averages_perm.values,
+                               equal_nan=True)
+            assert np.allclose(results["batch"].z_scores.values, results["loop"].z_scores.values, equal_nan=True)
+
+        self.assertRaises(ValueError, correlation, load_test_dataframe(), sequence_measure="velocity",
+                          audio_measure=None, correlation_with="Head", permutation_method="value",
+                          number_of_randperms=8, permutation_engine="vectorized", verbosity=0)
+
+    def test_individual_power_spectra(self):
+        sampling_rate = 20
+        hand_left = get_test_values("HandLeft", "Beta", "R002")[:280].copy()
+        hand_left[40] = np.nan
+        label_arrays = {"HandRight": get_test_values("HandRight"), "HandLeft": hand_left,
+                        "Head": get_test_values("Head"), "Neck": get_test_values("Neck")[:280]}
+        lags = [-1, -0.05, 0, 0.5]
+
+        # The spectra computed for the labels stacked by length are those of each label computed on its own
+        for method in ["welch", "fft"]:
+            frequencies, results_by_label = _compute_individual_power_spectra(label_arrays, lags, sampling_rate,
+                                                                              method)
+            assert list(results_by_label.keys()) == list(label_arrays.keys())
+
+            for label, values in label_arrays.items():
+                assert list(results_by_label[label].keys()) == lags
+                for lag in lags:
+                    sample = int(np.round(lag * sampling_rate))
+                    values_lag = values[:values.size - sample] if sample >= 0 else values[-sample:]
+                    expected_frequencies, expected = _compute_power_spectrum(method, values_lag, None, sampling_rate)
+                    assert np.array_equal(frequencies, expected_frequencies)
+                    assert results_by_label[label][lag].shape == expected.shape
+                    assert np.allclose(results_by_label[label][lag], expected, equal_nan=True)
+
+            # The missing value only affects its own label
+            assert np.isnan(results_by_label["HandLeft"][0]).all()
+            assert not np.isnan(results_by_label["Neck"][0]).any()
+
+    def test_coherence_engine(self):
+        sampling_rate = 20
+        labels = ["HandRight", "HandLeft", "ElbowRight", "Neck"]
+        label_arrays = {label: get_test_values(label) for label in labels}
+        target = get_test_values("Head")
+        n = target.size  # Odd number of samples (301)
+        lags = [-1.05, -0.05, 0, 0.1, 2.5]
+        seeds = [5, 11, 2024]
+
+        def reference_coherence(x, y, nperseg):
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", UserWarning)  # nperseg greater than the input length
+                return signal.coherence(x, y, fs=sampling_rate, nperseg=int(nperseg))
+
+        # Segments shorter than the signals, and longer (one segment of the length of the signal)
+        for nperseg in [80.0, 400]:
+            frequencies, results_by_label = _compute_individual_coherences(label_arrays, target, lags, sampling_rate,
+                                                                           nperseg)
+
+            for lag in lags:
+                sample = int(np.round(lag * sampling_rate))
+                if sample >= 0:
+                    measure_slice, target_lag = slice(None, n - sample), target[sample:]
+                else:
+                    measure_slice, target_lag = slice(-sample, None), target[:n + sample]
+
+                # The coherence of each label, calculated on the stacked labels
+                for label in labels:
+                    expected_frequencies, expected = reference_coherence(label_arrays[label][measure_slice],
+                                                                         target_lag, nperseg)
+                    assert np.allclose(results_by_label[label][lag], expected)
+                if lag == lags[0]:
+                    assert np.array_equal(frequencies, expected_frequencies)
+
+                # The coherence of the shift and label permutations, against signal.coherence on the same surrogates
+                x = label_arrays["HandRight"][measure_slice]
+                shift_perms = _compute_batch_perms(seeds, x, target_lag, "shift", "coherence", None, sampling_rate,
+                                                   nperseg, expected_frequencies)
+                label_perms = [label_arrays[label][measure_slice] for label in labels[1:]]
+                label_perms_values = _compute_batch_perms(seeds, x, target_lag, "label", "coherence", None,
+                                                          sampling_rate, nperseg, expected_frequencies,
+                                                          precomputed_perms=label_perms)
+                for p, seed in enumerate(seeds):
+                    shift = np.random.default_rng(seed).integers(1, x.size)
+                    assert np.allclose(shift_perms[p], reference_coherence(np.roll(x, shift), target_lag, nperseg)[1])
+                    assert np.allclose(label_perms_values[p], reference_coherence(label_perms[p], target_lag,
+                                                                                  nperseg)[1])
+
+    def test_spectral_background(self):
+        sampling_rate = 20
+        individuals = ["Alpha", "Beta"]
+        labels = ["HandRight", "HandLeft", "Head", "Neck"]
+        spectra = {}
+        for individual in individuals:
+            for label in labels:
+                frequencies, spectra[individual, label] = signal.welch(get_test_values(label, individual),
+                                                                       fs=sampling_rate)
+
+        # Zero-power bins, including the bin after the peak, and peaks at the last valid bin
+        spectra["Alpha", "HandLeft"][[5, 6, 40]] = 0
+        spectra["Alpha", "HandLeft"][4] = 10 * np.max(spectra["Alpha", "HandLeft"])
+        spectra["Beta", "HandRight"][-2] = 10 * np.max(spectra["Beta", "HandRight"])
+        spectra["Beta", "Head"][-2] = 0
+        spectra["Beta", "Head"][-3] = 10 * np.max(spectra["Beta", "Head"])
+
+        def old_resolve_lower_freq(spectra_modality):
+            # Loop on the spectra, as _resolve_lower_freq did before it inspected all the spectra at once
+            peak_indices = []
+            for spectrum in spectra_modality:
+                valid = np.ones(len(frequencies), dtype=bool)
+                valid[0] = False
+                valid[-1] = False
+                valid[spectrum == 0] = False
+                valid_indices = np.where(valid)[0]
+                peak_in_valid = np.argmax(spectrum[valid])
+                lower_in_valid = min(peak_in_valid + 1, len(valid_indices) - 2)
+                peak_indices.append(valid_indices[lower_in_valid])
+            return frequencies[max(peak_indices)], max(peak_indices) - min(peak_indices)
+
+        analysis_values = LabelledArray(["target", "measure", "series", "individual", "label", "lag"],
+                                        [["Power spectrum"], ["velocity"], [None], individuals, labels, [0]])
+        for (individual, label), spectrum in spectra.items():
+            analysis_values.set_value(["Power spectrum", "velocity", None, individual, label, 0], spectrum)
+        params = SimpleNamespace(background_lower_freq=None, background_lower_freq_warn_bins=len(frequencies),
+                                 average=None, series=None, individuals=individuals)
+
+        # The lower bound, against the one of the loop, for subsets of the labels
+        for labels_modality in [labels, ["HandRight"], ["HandLeft", "Neck"], ["Head", "Neck"], ["Neck"]]:
+            expected, range_in_bins = old_resolve_lower_freq([spectra[individual, label] for label in labels_modality
+                                                              for individual in individuals])
+            lower_freq = _resolve_lower_freq(frequencies, analysis_values, params, "Power spectrum", "velocity", None,
+                                             labels_modality, 0)
+            assert lower_freq == expected
+
+            # Warning if the lower bounds of the spectra are too far apart
+            params.background_lower_freq_warn_bins = range_in_bins - 1
+            self.assertWarns(UserWarning, _resolve_lower_freq, frequencies, analysis_values, params, "Power spectrum",
+                             "velocity", None, labels_modality, 0)
+            params.background_lower_freq_warn_bins = len(frequencies)
+
+        # A lower bound set in the parameters is returned as it is
+        params.background_lower_freq = 0.5
+        assert _resolve_lower_freq(frequencies, analysis_values, params, "Power spectrum", "velocity", None, labels,
+                                   0) == 0.5
+
+        # The lines, against np.polyfit on the valid bins above the lower bound of each spectrum
+        powers = np.stack(list(spectra.values()))
+        lower_freqs = [0, 0.5, 1.25, 3, 0.1, 9.8, 9.9, 10]
+        slopes, intercepts = _fit_spectral_background_lines(frequencies, powers, lower_freqs)
+        for power, lower_freq, slope, intercept in zip(powers, lower_freqs, slopes, intercepts):
+            mask = (power > 0) & (frequencies >= lower_freq)
+            mask[[0, -1]] = False
+            if np.sum(mask) < 2:
+                assert np.isnan(slope) and np.isnan(intercept)
+            else:
+                expected_slope, expected_intercept = np.polyfit(np.log10(frequencies[mask]), np.log10(power[mask]), 1)
+                assert np.isclose(slope, expected_slope)
+                assert np.isclose(intercept, expected_intercept)
+        assert np.isnan(slopes[-2:]).all() and not np.isnan(slopes[:-2]).any()
+
+    def test_data_matrix(self):
+        from sklearn.decomposition import FastICA
+
+        sequence = Sequence(op.join("test_sequences", "sequence_ainhoa_trimmed.tsv"), verbosity=0)
+        sequence = sequence.resample(20, verbosity=0)
+        sequences = [sequence.trim(0, 2, verbosity=0), sequence.trim(2, 3.5, verbosity=0)]
+        sequences[1].poses[5].get_joint("HandLeft").set_to_none()
+        audio = Audio(op.join("test_audios", "test_audio_1.wav"), verbosity=0)
+        envelope = Envelope(op.join("test_envelopes", "test_audio_1_envelope.tsv"), verbosity=0)
+        envelope = envelope.resample(20, verbosity=0)
+
+        def make_subject(name, audio_trials):
+            subject = Subject(name)
+            for trial_id, (sequence_trial, audio_trial) in enumerate(zip(sequences, audio_trials)):
+                subject.add_trial(Trial(f"R00{trial_id + 1}", None, sequence_trial, audio_trial), verbosity=0)
+            return subject
+
+        def pivot(dataframe, level):
+            dataframe = dataframe.fillna({"subject": "_single_subject", "trial": "_single_trial"})
+            index = ["subject", "trial", "timestamp"] if level == "timestamp" else ["subject", "trial"]
+            return dataframe.pivot_table(index=index, columns="label", values="value", aggfunc="mean",
+                                         observed=True).sort_index()
+
+        subject = make_subject("Alpha", [envelope, envelope])
+        subject_dataframe = pd.concat([dataframe for trial in subject.trials.values() for dataframe in [
+            trial.sequence.to_analysis_dataframe(measure="velocity", subject="Alpha", trial=trial.trial_id),
+            trial.audio.to_analysis_dataframe(subject="Alpha", trial=trial.trial_id)]], ignore_index=True)
+        experiment = Experiment("Test Experiment")
+        experiment.add_subjects(make_subject("Alpha", [audio, audio]), make_subject("Beta", [audio, audio]))
+
+        # The matrices built from the arrays, against the pivot tables of the dataframes
+        for data, audio_measure, dataframe in [
+                (sequences[0], "envelope", sequences[0].to_analysis_dataframe(measure="velocity")),
+                (subject, "envelope", subject_dataframe),
+                (subject, "auto", subject_dataframe),
+                (experiment, "envelope", experiment.get_dataframe("velocity", "envelope", verbosity=0)),
+                (experiment, None, experiment.get_dataframe("velocity", None, verbosity=0))]:
+            for level in ["timestamp", "trial"]:
+                expected = pivot(dataframe, level)
+                matrix, labels = _get_data_matrix(data, "all", "velocity", audio_measure, level=level)
+                assert labels == list(expected.columns)
+                assert np.allclose(matrix, expected.to_numpy(), equal_nan=True)
+
+        # With audio_measure="auto", the audio is ignored if it is an Audio instance
+        matrix, labels = _get_data_matrix(experiment, "all", "velocity", "auto")
+        expected = pivot(experiment.get_dataframe("velocity", None, verbosity=0), "timestamp")
+        assert labels == list(expected.columns) and "Audio" not in labels
+        assert np.allclose(matrix, expected.to_numpy(), equal_nan=True)
+
+        # ... and used as-is if it is an AudioDerivative
+        result, components, _ = pca(subject, n_components=3, sequence_measure="velocity", audio_measure="auto",
+                                    nan_behaviour="drop_timestamps", verbosity=0, show=False)
+        assert "Audio" in components[0]
+        assert len(result) == len(pivot(subject_dataframe, "timestamp").dropna())
+
+        # With nan_behaviour="zero", the NaN values of the ICA matrix are replaced by zeros; with "ignore", the labels
+        # containing NaN values are removed
+        expected = pivot(pd.concat([trial.sequence.to_analysis_dataframe(measure="velocity", subject="Alpha",
+                                                                         trial=trial.trial_id)
+                                    for trial in subject.trials.values()], ignore_index=True), "timestamp")
+        assert expected["HandLeft"].hasnans
+        fit_transform = FastICA.fit_transform
+        for nan_behaviour, expected_matrix in [("zero", expected.fillna(0)),
+                                               ("ignore", expected.dropna(axis=1))]:
+            with mock.patch.object(FastICA, "fit_transform", autospec=True, side_effect=fit_transform) as fit:
+                result = ica(subject, 3, sequence_measure="velocity", show_graph=False, nan_behaviour=nan_behaviour,
+                             verbosity=0)
+            matrix = fit.call_args[0][1]
+            assert matrix.shape == expected_matrix.shape
+            assert np.allclose(matrix, expected_matrix.to_numpy())
+            assert result.shape == (len(expected_matrix), 3)
+            assert not np.isnan(result).any()
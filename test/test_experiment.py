@@ -199,6 +199,36 @@ class TestsExperimentMethods(unittest.TestCase):
         assert df.shape == (36, 8)
         assert sorted(df["subject"].unique()) == ["Alice", "Bob"]
 
+        df_parallel = experiment.get_dataframe("distance", "envelope", 1000, exclude_columns=["group", "condition"],
+                                               include_columns=["visit"], n_jobs=2, verbosity=0)
+        assert df_parallel.equals(df)
+        assert list(df_parallel.dtypes) == list(df.dtypes)
+
+    def test_get_segmented_dataframe(self):
+        seq1 = Sequence("test_sequences/test_sequence_1.tsv", verbosity=0)
+        aud1 = Envelope([4, 8, 15], 1000, verbosity=0)
+        trial1 = Trial(1, "English", seq1, aud1)
+
+        seq2 = Sequence("test_sequences/test_sequence_2.tsv", verbosity=0)
+        aud2 = Envelope([16, 23, 42], 1000, verbosity=0)
+        trial2 = Trial(2, "Spanish", seq2, aud2)
+
+        subject1 = Subject("Alice", 1, "F", 20)
+        subject1.add_trials(trial1, trial2, verbosity=0)
+
+        experiment = Experiment("BodyLingual")
+        experiment.add_subject(subject1)
+
+        segmented = experiment.get_segmented_dataframe("distance", "envelope", 1000, verbosity=0)
+        assert len(segmented.segments) == 8
+        assert len(segmented) == 18
+        assert list(segmented.segments["label"])[-1] == "Audio"
+        assert list(segmented.get_segment(3)[1]) == [4, 8, 15]
+
+        df = experiment.get_dataframe("distance", "envelope", 1000, verbosity=0)
+        assert segmented.to_dataframe().equals(df)
+        assert df.shape == (18, 9)
+
     def test_save_dataframe(self):
         seq1 = Sequence("test_sequences/test_sequence_1.tsv", verbosity=0)
         aud1 = Envelope([4, 8, 15], 1000, verbosity=0)
@@ -19,6 +19,15 @@ class TestsIOFunctions(unittest.TestCase):
 
         assert len(out) == 9
 
+    def test_load_sequences_parallel(self):
+        out = load_sequences(op.join("test_sequences", "recursive"), True, "dict", True,
+                             False, verbosity=0)
+        out_parallel = load_sequences(op.join("test_sequences", "recursive"), True, "dict", True,
+                                      False, n_jobs=2, verbosity=0)
+        assert list(out_parallel.keys()) == list(out.keys())
+        for key in out:
+            assert out_parallel[key] == out[key]
+
     def test_load_audios(self):
         out = load_audios("test_audios", verbosity=0)
         number_of_files = len([file for file in os.listdir("test_audios") if op.isfile(op.join("test_audios", file))])
@@ -33,6 +42,18 @@ class TestsIOFunctions(unittest.TestCase):
 
         assert len(out) == 6
 
+    def test_load_audios_parallel(self):
+        out = load_audios(op.join("test_audios", "recursive"), True, "dict", True,
+                          False, verbosity=0)
+        out_parallel = load_audios(op.join("test_audios", "recursive"), True, "dict", True,
+                                   False, n_jobs=2, verbosity=0)
+        assert list(out_parallel.keys()) == list(out.keys())
+        for key in out:
+            assert out_parallel[key] == out[key]
+            assert out_parallel[key].name == out[key].name
+            assert out_parallel[key].get_frequency() == out[key].get_frequency()
+            assert np.array_equal(out_parallel[key].get_samples(), out[key].get_samples())
+
     def test_save_sequences(self):
         sequences = [Sequence(op.join("test_sequences", "test_sequence_1.tsv"), verbosity=0),
                      Sequence(op.join("test_sequences", "test_sequence_2.tsv"), verbosity=0),
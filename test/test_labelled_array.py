@@ -0,0 +1,48 @@
+"""Tests the LabelledArray class from the toolbox."""
+
+import unittest
+import numpy as np
+
+from krajjat.classes import LabelledArray
+
+
+class TestsLabelledArray(unittest.TestCase):
+
+    def test_set_value(self):
+        array = LabelledArray(["label", "lag"], [["Head", "HandRight", "Audio"], [0, 0.1]])
+        assert array.values is None
+        assert len(array) == 0
+
+        array.set_value(["Head", 0], np.array([1, 2, 3]))
+        array.set_value(["HandRight", 0.1], np.array([4, 5, 6]))
+        assert array.values.shape == (3, 2, 3)
+        assert array.values.dtype == float
+        assert np.allclose(array["Head"][0], [1, 2, 3])
+        assert np.allclose(array["HandRight"][0.1], [4, 5, 6])
+        assert np.all(np.isnan(array.values[0, 1]))
+        assert array.has_value(["Head", 0])
+        assert not array.has_value(["Head", 0.1])
+        assert not array.has_value(["Foot", 0])
+
+        self.assertRaises(ValueError, array.set_value, ["Head", 0.1], np.array([1, 2]))
+        self.assertRaises(KeyError, array.set_value, ["Foot", 0], np.array([1, 2, 3]))
+
+    def test_dictionary_access(self):
+        array = LabelledArray(["measure", "label"], [["velocity", "envelope"], ["Head", "Audio"]])
+        array.set_value(["velocity", "Head"], 0.5)
+        array.set_value(["envelope", "Audio"], 0.25)
+
+        assert list(array) == ["velocity", "envelope"]
+        assert list(array["velocity"]) == ["Head"]
+        assert list(array["envelope"].keys()) == ["Audio"]
+        assert "Audio" not in array["velocity"]
+        assert array["velocity"]["Head"] == 0.5
+        assert [key for key, _ in array.items()] == ["velocity", "envelope"]
+
+        self.assertRaises(KeyError, array["velocity"].__getitem__, "Audio")
+        self.assertRaises(KeyError, array.__getitem__, "pitch")
+
+        # The sub-arrays share the memory of the array
+        sub_array = array["velocity"]
+        sub_array.set_value(["Audio"], 0.75)
+        assert array["velocity"]["Audio"] == 0.75
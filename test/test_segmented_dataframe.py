@@ -0,0 +1,45 @@
+"""Tests the SegmentedDataframe class from the toolbox."""
+
+import unittest
+import numpy as np
+import pandas as pd
+
+from krajjat.classes import SegmentedDataframe
+
+
+class TestsSegmentedDataframe(unittest.TestCase):
+
+    def setUp(self):
+        segments = pd.DataFrame({"subject": ["Alice", "Alice", "Bob"], "trial": [1, 1, 2],
+                                 "label": ["Head", "Audio", "Head"], "offset": [0, 2, 5], "length": [2, 3, 1]})
+        timestamps = np.array([0, 0.1, 0, 0.1, 0.2, 0])
+        values = np.array([1, 2, 3, 4, 5, 6])
+        self.segmented = SegmentedDataframe(segments, timestamps, values)
+
+    def test_init(self):
+        assert self.segmented.columns == ["subject", "trial", "label", "timestamp", "value"]
+        assert len(self.segmented) == 6
+        self.assertRaises(ValueError, SegmentedDataframe, self.segmented.segments, np.array([0, 1]), np.array([0]))
+
+    def test_get_segment(self):
+        timestamps, values = self.segmented.get_segment(1)
+        assert np.allclose(timestamps, [0, 0.1, 0.2])
+        assert np.allclose(values, [3, 4, 5])
+
+    def test_get_subset(self):
+        subset = self.segmented.get_subset(self.segmented.segments.loc[self.segmented.segments["label"] == "Head"])
+        assert len(subset) == 3
+        assert subset.values is self.segmented.values
+        assert np.allclose(subset.get_segment(1)[1], [6])
+        assert list(subset.to_dataframe()["value"]) == [1, 2, 6]
+
+    def test_to_dataframe(self):
+        df = self.segmented.to_dataframe()
+        assert df.shape == (6, 5)
+        assert list(df["label"]) == ["Head", "Head", "Audio", "Audio", "Audio", "Head"]
+        assert df["subject"].dtype == "category"
+        assert list(df["value"]) == [1, 2, 3, 4, 5, 6]
+
+        df = self.segmented.to_dataframe(use_categoricals=False)
+        assert not isinstance(df["subject"].dtype, pd.CategoricalDtype)
+        assert list(df["trial"]) == [1, 1, 1, 1, 1, 2]
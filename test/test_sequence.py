@@ -3,7 +3,9 @@ import unittest
 
 import numpy as np
 from datetime import datetime as dt
+import json
 import os.path as op
+import pickle
 
 import pandas as pd
 
@@ -177,6 +179,21 @@ class TestsSequenceMethods(unittest.TestCase):
         assert sequence.get_system() == "kinect"
         assert len(sequence.metadata) == 11
 
+    def test_pickle(self):
+        # A Sequence pickled before 2.0 (with a poses attribute) can also be unpickled directly
+        with open("test_sequences/test_sequence_1.pkl", "rb") as f:
+            sequence = pickle.load(f)
+        assert len(sequence.poses) == 3
+        assert sequence.poses[1].joints["Head"].x == 1.769412418
+        assert sequence.get_number_of_poses() == 3
+
+        # A Sequence stored as arrays keeps its arrays when pickled
+        sequence = Sequence("test_sequences/test_sequence_1.tsv", verbosity=0)
+        unpickled = pickle.loads(pickle.dumps(sequence))
+        assert unpickled._is_stored_as_arrays()
+        assert np.array_equal(unpickled.get_timestamps(), sequence.get_timestamps())
+        assert unpickled.poses[1].joints["Head"].x == sequence.poses[1].joints["Head"].x
+
     def test_set_name(self):
         sequence = Sequence("test_sequences/test_sequence_1.tsv", verbosity=0)
         assert sequence.name == "test_sequence_1"
@@ -312,8 +329,50 @@ class TestsSequenceMethods(unittest.TestCase):
         pass
 
     def test_load_sequence_file(self):
-        # See test_init
-        pass
+        # See also test_init
+        # The poses are stored as arrays until the attribute poses is accessed
+        sequence = Sequence("test_sequences/test_sequence_11.tsv", time_unit="s", verbosity=0)
+        assert sequence._is_stored_as_arrays()
+        assert sequence._coordinates_array.shape == (16, 1, 3)
+        assert sequence.get_number_of_poses() == 16
+        assert len(sequence.get_timestamps()) == 16
+
+        sequence_t = sequence.trim(0, 10, verbosity=0)
+        assert sequence_t._is_stored_as_arrays()
+
+        table = sequence.to_table()
+        assert sequence._is_stored_as_arrays()
+        assert sequence.poses[1].get_timestamp() == table[2][0]
+        assert not sequence._is_stored_as_arrays()
+        assert sequence.to_table() == table
+        assert sequence.trim(0, 10, verbosity=0) == sequence_t
+
+        # Only the first poses
+        sequence_5 = Sequence("test_sequences/test_sequence_11.tsv", time_unit="s", max_poses=5, verbosity=0)
+        assert sequence_5.get_number_of_poses() == 5
+        assert sequence_5.to_table() == table[:6]
+
+        sequence = Sequence("test_sequences/test_sequence_11.tsv", time_unit="s", max_poses=100, verbosity=0)
+        assert sequence.get_number_of_poses() == 16
+
+        sequence = Sequence("test_sequences/test_sequence_individual/*.tsv", max_poses=2, verbosity=0)
+        assert sequence.get_number_of_poses() == 2
+
+        sequence.save_json("test_sequences/saved_sequences/test_sequence_individual.json", verbosity=0)
+        sequence = Sequence("test_sequences/saved_sequences/test_sequence_individual.json", max_poses=1,
+                            verbosity=0)
+        assert sequence.get_number_of_poses() == 1
+
+        # The metadata placed after the poses is still loaded
+        with open("test_sequences/saved_sequences/test_sequence_individual.json", "r", encoding="utf-8") as f:
+            data = json.load(f)
+        data = {"Poses": data.pop("Poses"), **data, "Recording room": "B-204"}
+        with open("test_sequences/saved_sequences/test_sequence_metadata_last.json", "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        sequence = Sequence("test_sequences/saved_sequences/test_sequence_metadata_last.json", max_poses=1,
+                            verbosity=0)
+        assert sequence.get_number_of_poses() == 1
+        assert sequence.metadata["Recording room"] == "B-204"
 
     def test_create_pose_from_table_row(self):
         # See test_init
@@ -862,6 +921,19 @@ class TestsSequenceMethods(unittest.TestCase):
         measure = sequence.get_measure("p", "Head", 0, 0.5, window_length=7, verbosity=0)
         assert np.allclose(measure, [9000000.0, 12000000.0, 33000000.0, 42000000.0, 15000000.0, 12000000.0])
 
+        # Integer measures
+        assert np.allclose(sequence.get_measure(1, "Head", 0, window_length=7, verbosity=0),
+                           sequence.get_measure("v", "Head", 0, window_length=7, verbosity=0))
+
+        # Same measures whether the poses are stored as arrays or as Pose objects
+        sequence = Sequence("test_sequences/test_sequence_qtm_2.tsv", verbosity=0)
+        measures_arrays = [sequence.get_measure(measure, verbosity=0) for measure in ["xyz", "d", "dz", "v", "a"]]
+        assert sequence.get_poses() is not None
+        measures_poses = [sequence.get_measure(measure, verbosity=0) for measure in ["xyz", "d", "dz", "v", "a"]]
+        for i in range(len(measures_arrays)):
+            for joint_label in sequence.get_joint_labels():
+                assert np.array_equal(measures_arrays[i][joint_label], measures_poses[i][joint_label], equal_nan=True)
+
     def test_get_extremum_measure(self):
         # Coordinates
         sequence = Sequence("test_sequences/test_sequence_1.tsv", verbosity=0)
@@ -1937,6 +2009,44 @@ class TestsSequenceMethods(unittest.TestCase):
         assert sequence_1 == sequence_1s
         assert sequence_1.metadata.keys() == sequence_1s.metadata.keys()
 
+    def test_save_npz(self):
+        sequence_1 = Sequence("test_sequences/test_sequence_1.tsv", verbosity=0)
+
+        sequence_1.save_npz("test_sequences/saved_sequences/", "test_sequence_1", verbosity=0)
+        sequence_1s = Sequence("test_sequences/saved_sequences/test_sequence_1.npz", verbosity=0)
+        assert sequence_1s._is_stored_as_arrays()
+        assert isinstance(sequence_1s._coordinates_array.base, np.memmap)
+        assert sequence_1 == sequence_1s
+        assert sequence_1.metadata.keys() == sequence_1s.metadata.keys()
+
+        sequence_1.save_npz("test_sequences/saved_sequences/test_sequence_1.npz", verbosity=0)
+        sequence_1s = Sequence("test_sequences/saved_sequences/test_sequence_1.npz", verbosity=0)
+        assert sequence_1 == sequence_1s
+        assert sequence_1.metadata.keys() == sequence_1s.metadata.keys()
+
+        sequence_1.save_npz("test_sequences/saved_sequences/", "test_sequence_1", include_metadata=False,
+                            verbosity=0)
+        sequence_1s = Sequence("test_sequences/saved_sequences/test_sequence_1.npz", verbosity=0)
+        assert sequence_1 == sequence_1s
+        assert len(sequence_1s.metadata.keys()) == 2
+        assert "system" in sequence_1s.metadata.keys()
+        assert "processing_steps" in sequence_1s.metadata.keys()
+
+        # None coordinates
+        sequence_2 = Sequence(verbosity=0)
+        pose = Pose(0)
+        pose.add_joint(Joint("Head", 1, 2, 3))
+        pose.add_joint(Joint("HandRight", None, None, None))
+        sequence_2.add_pose(pose, verbosity=0)
+        pose = Pose(0.1)
+        pose.add_joint(Joint("Head", 4, 5, 6))
+        pose.add_joint(Joint("HandRight", 7, 8, 9))
+        sequence_2.add_pose(pose, verbosity=0)
+        sequence_2.save_npz("test_sequences/saved_sequences/", "test_sequence_none", verbosity=0)
+        sequence_2s = Sequence("test_sequences/saved_sequences/test_sequence_none.npz", verbosity=0)
+        assert sequence_2.to_table() == sequence_2s.to_table()
+        assert sequence_2s.poses[0].joints["HandRight"].x is None
+
     def test_save_txt(self):
         sequence_1 = Sequence("test_sequences/test_sequence_1.tsv", verbosity=0)
 
@@ -148,6 +148,13 @@ class TestsToolFunctions(unittest.TestCase):
         assert read_json("test_files/test_json_utf8.json") == {"test": [1, 2, 3, "é&*ç"]}
         assert read_json("test_files/test_json_utf16.json") == {"test": [1, 2, 3, "é&*ç"]}
 
+    def test_read_json_stream(self):
+        assert list(read_json_stream("test_files/test_json_utf8.json", "test")) == \
+               [("test", 1), ("test", 2), ("test", 3), ("test", "é&*ç")]
+        assert list(read_json_stream("test_files/test_json_utf8.json", "other")) == [("test", [1, 2, 3, "é&*ç"])]
+        assert list(read_json_stream("test_files/test_json_utf8.json", "test", chunk_size=1)) == \
+               [("test", 1), ("test", 2), ("test", 3), ("test", "é&*ç")]
+
     def test_read_text_table(self):
         data, metadata = read_text_table("test_sequences/test_sequence_6.tsv", convert_strings=False, verbosity=0)
         assert data == [['Timestamp', 'Head_X', 'Head_Y', 'Head_Z', 'HandRight_X', 'HandRight_Y', 'HandRight_Z',
@@ -163,6 +170,34 @@ class TestsToolFunctions(unittest.TestCase):
                          2.049614771, 2.706231532, -0.22258201, -1.291594811]]
         assert metadata == {"Number of poses": 1, "Number of joints": 3}
 
+    def test_read_text_table_array(self):
+        header, values, metadata = read_text_table_array("test_sequences/test_sequence_6.tsv", verbosity=0)
+        assert header == ['Timestamp', 'Head_X', 'Head_Y', 'Head_Z', 'HandRight_X', 'HandRight_Y', 'HandRight_Z',
+                          'HandLeft_X', 'HandLeft_Y', 'HandLeft_Z']
+        assert values.shape == (1, 10)
+        assert values.tolist() == [[0, -2.819374393, -1.881188978, 0.412664491, 1.445902298, 1.033955007,
+                                    2.049614771, 2.706231532, -0.22258201, -1.291594811]]
+        assert metadata == {"Number of poses": 1, "Number of joints": 3}
+
+        # Same output as read_text_table
+        data, metadata = read_text_table("test_sequences/test_sequence_13.tsv", verbosity=0)
+        header, values, metadata_array = read_text_table_array("test_sequences/test_sequence_13.tsv", verbosity=0)
+        assert header == data[0]
+        assert values.tolist() == data[1:]
+        assert metadata_array == metadata
+
+        # Qualisys
+        with open("test_sequences/test_sequence_qtm_1.tsv", "r") as f:
+            data = f.read().split("\n")
+        data, metadata = convert_data_from_qtm(data, verbosity=0)
+        header, values, metadata_array = read_text_table_array("test_sequences/test_sequence_qtm_1.tsv", verbosity=0)
+        assert header == data[0]
+        assert values.tolist() == data[1:]
+        assert metadata_array == metadata
+
+        with self.assertRaises(ValueError):
+            read_text_table_array("test_sequences/test_sequence_6.tsv", keyword_data_start="Time", verbosity=0)
+
     def test_read_xlsx(self):
         data, metadata = read_xlsx("test_sequences/test_sequence_1.xlsx", metadata_sheet=1, verbosity=0)
         assert data == [['Timestamp', 'Head_X', 'Head_Y', 'Head_Z', 'HandRight_X', 'HandRight_Y', 'HandRight_Z',
@@ -208,6 +243,27 @@ class TestsToolFunctions(unittest.TestCase):
                          0.265601278, -0.027851166, 2.830655356]]
         assert metadata == {}
 
+    def test_read_npz(self):
+        timestamps = np.array([0, 0.1, 0.2])
+        coordinates = np.arange(18, dtype=float).reshape((2, 3, 3))
+        np.savez("test_files/test_npz.npz", timestamps=timestamps, coordinates=coordinates, name=np.array("test"))
+
+        arrays = read_npz("test_files/test_npz.npz")
+        assert isinstance(arrays["timestamps"], np.memmap)
+        assert isinstance(arrays["coordinates"], np.memmap)
+        assert np.array_equal(arrays["timestamps"], timestamps)
+        assert np.array_equal(arrays["coordinates"], coordinates)
+        assert arrays["name"].item() == "test"
+
+        arrays = read_npz("test_files/test_npz.npz", mmap_mode=None)
+        assert not isinstance(arrays["coordinates"], np.memmap)
+        assert np.array_equal(arrays["coordinates"], coordinates)
+
+        np.savez_compressed("test_files/test_npz.npz", timestamps=timestamps, coordinates=coordinates)
+        arrays = read_npz("test_files/test_npz.npz")
+        assert not isinstance(arrays["coordinates"], np.memmap)
+        assert np.array_equal(arrays["coordinates"], coordinates)
+
     def test_read_pandas_dataframe(self):
         data = read_pandas_dataframe("test_files/dataframe_1.csv", verbosity=0)
         assert data["Timestamp"][0] == 0.0
@@ -343,6 +399,19 @@ class TestsToolFunctions(unittest.TestCase):
                                                          0.14112001]))
         assert np.allclose(resampled_timestamps, np.linspace(0, 3, 16))
 
+        # Multiple channels
+        channels = np.column_stack([np.sin(original_timestamps), np.cos(original_timestamps)])
+        for method in ["linear", "cubic", "pchip", "akima", "interp1d_linear"]:
+            resampled_channels, resampled_timestamps_channels = resample_data(channels, original_timestamps,
+                                                                              resampling_frequency, window_size=300,
+                                                                              method=method, verbosity=0)
+            assert resampled_channels.shape == (16, 2)
+            assert np.array_equal(resampled_timestamps_channels, resampled_timestamps)
+            for channel in range(2):
+                resampled_array, _ = resample_data(channels[:, channel], original_timestamps, resampling_frequency,
+                                                   window_size=300, method=method, verbosity=0)
+                assert np.allclose(resampled_channels[:, channel], resampled_array)
+
     def test_resample_window(self):
 
         # Linear resampling
@@ -807,6 +876,45 @@ class TestsToolFunctions(unittest.TestCase):
         new_array = remove_average(array)
         assert np.array_equal(new_array, [-2, -1, 0, 1, 2])
 
+    def test_cache(self):
+        set_cache_folder(None)
+        assert get_cache_folder() is None
+
+        key = get_cache_key([1, 2, 3], "envelope", 1000000, 0.5)
+        assert len(key) == 64
+        assert key == get_cache_key(np.array([1, 2, 3]), "envelope", 1000000, 0.5)
+        assert key != get_cache_key([1, 2, 4], "envelope", 1000000, 0.5)
+        assert key != get_cache_key([1, 2, 3], "envelope", 1000000, 0.25)
+        assert key != get_cache_key([1., 2., 3.], "envelope", 1000000, 0.5)
+
+        # Disabled cache
+        save_to_cache(key, np.array([1, 2, 3]))
+        assert load_from_cache(key) is None
+
+        set_cache_folder("test_files/cache", max_size=1e6)
+        assert get_cache_folder() == op.abspath("test_files/cache")
+        assert load_from_cache(key) is None
+        save_to_cache(key, np.array([4., 5., 6.]))
+        assert np.array_equal(load_from_cache(key), [4., 5., 6.])
+
+        # Eviction of the least recently used files
+        for i in range(2):
+            save_to_cache(get_cache_key([i]), np.zeros(50000))
+            os.utime(op.join("test_files/cache", get_cache_key([i]) + ".npy"), (i, i))
+        assert load_from_cache(get_cache_key([0])) is not None
+        save_to_cache(get_cache_key([2]), np.zeros(50000))
+        assert load_from_cache(get_cache_key([1])) is None
+        assert load_from_cache(get_cache_key([0])) is not None
+        assert load_from_cache(get_cache_key([2])) is not None
+        assert len(os.listdir("test_files/cache")) == 3
+
+        clear_cache()
+        assert len(os.listdir("test_files/cache")) == 0
+        assert load_from_cache(key) is None
+
+        set_cache_folder(None)
+        os.rmdir("test_files/cache")
+
     def test_load_joint_labels(self):
         joint_labels = load_joint_labels("kinect", "all")
         assert "Head" in joint_labels